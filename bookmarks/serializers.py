@@ -1,9 +1,9 @@
 from rest_framework import serializers 
 from rooms.models import Room
+from rooms.utils.cards import format_amount, price_label
 from .models import Bookmark
 
 class RoomCardSerializer(serializers.ModelSerializer):
-  thumbnail_url=serializers.SerializerMethodField()
   price_label=serializers.SerializerMethodField()
   maintenance_label=serializers.SerializerMethodField()
 
@@ -12,27 +12,14 @@ class RoomCardSerializer(serializers.ModelSerializer):
     fields=["id", "title", "address",
             "deposit", "monthly_fee", "maintenance_cost", #백엔드용(숫자필드 그대로)
             "price_label", "maintenance_label",#UI용 라벨
-            "thumbnail_url",
+            "thumbnail_url", #Room.thumbnail_url (첫 이미지, 시그널로 동기화)
             ]
     
-  def get_thumbnail_url(self, obj):
-    first=obj.images.first()
-    return first.image_url if first else None
-  
   def get_price_label(self, obj):
-    dep, mon= obj.deposit, obj.monthly_fee
-    def fmt(n): return f"{n:,}" if n is not None else None 
-    if dep is not None and mon is not None:
-      return f"{fmt(dep)}/{fmt(mon)}"
-    if dep is not None:
-      return fmt(dep)
-    if mon is not None:
-      return fmt(mon)
-    return None
+    return price_label(obj.deposit, obj.monthly_fee)
   
   def get_maintenance_label(self, obj):
-    mnt=obj.maintenance_cost
-    return f"{mnt:,}" if mnt is not None else None
+    return format_amount(obj.maintenance_cost)
   
 
 class BookmarkSerializer(serializers.ModelSerializer):
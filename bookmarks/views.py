@@ -1,12 +1,13 @@
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse, OpenApiExample
-from rest_framework import generics, status
+from rest_framework import generics, serializers, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.pagination import PageNumberPagination
 
 from rooms.models import Room
+from rooms.utils.cards import CARD_COLUMNS, card_from_row
 from .models import Bookmark
 from .serializers import BookmarkSerializer
 
@@ -35,11 +36,25 @@ class BookmarkListView(generics.ListAPIView):
     return (
       Bookmark.objects
       .filter(user=self.request.user)
-      .select_related("room")
-      .prefetch_related("room__images")
       .order_by("-created_at", "-id")
     )
 
+  def list(self, request, *args, **kwargs):
+    # BookmarkSerializer와 같은 JSON을 values_list + rooms.utils.cards로 직접 만든다 (ModelSerializer 생략)
+    rows=self.paginate_queryset(
+      self.get_queryset().values_list("id", "created_at", *(f"room__{c}" for c in CARD_COLUMNS))
+    )
+    created_at=serializers.DateTimeField()
+    data=[
+      {
+        "id": row[0],
+        "room": card_from_row(row[2:]),
+        "created_at": created_at.to_representation(row[1]),
+      }
+      for row in rows
+    ]
+    return self.get_paginated_response(data)
+
 @extend_schema(
   tags=['bookmarks'],
   summary='북마크 토글',
@@ -183,6 +183,20 @@ STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
+# 업로드 파일
+MEDIA_URL = 'media/'
+MEDIA_ROOT = config('MEDIA_ROOT', default=str(BASE_DIR / 'media'))
+
+# 방 임포트 작업 업로드 원본 (RoomImportJob.source). 공개 경로(MEDIA_ROOT) 밖에 두며,
+# web과 process_import_jobs 워커가 같은 경로를 봐야 한다
+ROOM_IMPORT_UPLOAD_ROOT = config('ROOM_IMPORT_UPLOAD_ROOT', default=str(BASE_DIR / 'import_uploads'))
+
+# 방 이미지 썸네일 디스크 캐시 (rooms.utils.thumbnails). 공개 경로(MEDIA_ROOT) 밖에 두고, 상한을 넘으면 오래 안 쓴 것부터 지운다
+THUMBNAIL_CACHE_DIR = config('THUMBNAIL_CACHE_DIR', default=str(BASE_DIR / 'thumbnail_cache'))
+THUMBNAIL_CACHE_MAX_BYTES = config('THUMBNAIL_CACHE_MAX_BYTES', default=512 * 1024 * 1024, cast=int)
+# 서버 전체에서 동시에 원본 이미지를 받는 요청 수. 원본 받기는 요청 워커를 붙잡으므로 gunicorn 워커 수(Procfile 3)보다 작게 둔다
+THUMBNAIL_ORIGIN_FETCH_SLOTS = config('THUMBNAIL_ORIGIN_FETCH_SLOTS', default=2, cast=int)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
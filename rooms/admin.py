@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Room, RoomImage, Review
+from .models import Room, RoomImage, RoomImageProbe, RoomImportJob, Review
 
 
 @admin.register(Room)
@@ -15,8 +15,21 @@ class RoomImageAdmin(admin.ModelAdmin):
     list_select_related = ('room',)
 
 
+@admin.register(RoomImageProbe)
+class RoomImageProbeAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status_code', 'width', 'height', 'content_length', 'error', 'checked_at', 'url')
+    list_filter = ('status_code',)
+    search_fields = ('url',)
+
+
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
     list_display = ('id', 'room', 'user', 'rating_safety', 'rating_noise', 'rating_light', 'rating_traffic', 'rating_clean', 'created_at')
     list_select_related = ('room', 'user')
     search_fields = ('content',)
+
+
+@admin.register(RoomImportJob)
+class RoomImportJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'processed', 'created', 'updated', 'unchanged', 'failed', 'created_at', 'finished_at')
+    list_filter = ('status',)
@@ -0,0 +1,103 @@
+"""
+Room 데이터 버전 기반 캐시
+
+- RoomDataVersion(DB 단일 행)의 version을 캐시 키에 포함시켜, 데이터가 바뀌면 키 자체가 달라지게 한다
+- 그래서 워커별 LocMem 캐시여도 오래된 값을 돌려주지 않는다 (만료는 TTL에 맡김)
+- 버전은 Room 저장/삭제 시그널과 대량 임포트 경로에서 올린다
+"""
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Callable, Optional, Tuple
+
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+from django.utils.http import http_date, parse_http_date_safe
+
+from .models import RoomDataVersion
+
+CACHE_TIMEOUT = 60 * 10
+_VERSION_PK = 1
+
+
+def get_data_version() -> int:
+    version = RoomDataVersion.objects.filter(pk=_VERSION_PK).values_list('version', flat=True).first()
+    return version or 0
+
+
+def get_data_version_state() -> Tuple[int, Optional[datetime]]:
+    """(version, 마지막 변경 시각). 목록 응답의 ETag/Last-Modified용"""
+    row = RoomDataVersion.objects.filter(pk=_VERSION_PK).values_list('version', 'updated_at').first()
+    return row if row else (0, None)
+
+
+def bump_data_version() -> None:
+    updated = RoomDataVersion.objects.filter(pk=_VERSION_PK).update(
+        version=F('version') + 1, updated_at=timezone.now()
+    )
+    if not updated:
+        RoomDataVersion.objects.get_or_create(pk=_VERSION_PK, defaults={'version': 1})
+
+
+def get_text_version() -> int:
+    version = RoomDataVersion.objects.filter(pk=_VERSION_PK).values_list('text_version', flat=True).first()
+    return version or 0
+
+
+def bump_text_version() -> None:
+    """제목/주소 색인이 바뀌었을 때 (rooms.utils.search_index.index_rooms, 방 삭제)"""
+    updated = RoomDataVersion.objects.filter(pk=_VERSION_PK).update(text_version=F('text_version') + 1)
+    if not updated:
+        RoomDataVersion.objects.get_or_create(pk=_VERSION_PK, defaults={'text_version': 1})
+
+
+def versioned_key(namespace: str, *parts: Any, version: int = None) -> str:
+    if version is None:
+        version = get_data_version()
+    digest = hashlib.sha1(
+        json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str).encode('utf-8')
+    ).hexdigest()
+    return f"rooms:{namespace}:v{version}:{digest}"
+
+
+def get_or_compute(key: str, compute: Callable[[], Any], timeout: int = CACHE_TIMEOUT) -> Any:
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, timeout)
+    return value
+
+
+def etag_for(namespace: str, version: int, *parts: Any) -> str:
+    """데이터 버전(과 요청 파라미터)으로 만든 강한 ETag"""
+    if not parts:
+        return f'"{namespace}-v{version}"'
+    digest = versioned_key(namespace, *parts, version=version).rsplit(':', 1)[-1][:12]
+    return f'"{namespace}-v{version}-{digest}"'
+
+
+def etag_matches(request, etag: str) -> bool:
+    """If-None-Match 헤더에 etag가 있으면 True (약한 비교, '*' 지원)"""
+    header = request.META.get('HTTP_IF_NONE_MATCH', '')
+    if not header:
+        return False
+    candidates = {tag.strip() for tag in header.split(',')}
+    if '*' in candidates:
+        return True
+    return etag in {tag[2:] if tag.startswith('W/') else tag for tag in candidates}
+
+
+def is_not_modified(request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """조건부 GET 판정. If-None-Match가 있으면 그것만, 없으면 If-Modified-Since(초 단위)로 비교"""
+    if request.META.get('HTTP_IF_NONE_MATCH'):
+        return etag_matches(request, etag)
+    since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE'))
+    return since is not None and last_modified is not None and int(last_modified.timestamp()) <= since
+
+
+def conditional_headers(etag: str, last_modified: Optional[datetime] = None) -> dict:
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+    if last_modified is not None:
+        headers['Last-Modified'] = http_date(last_modified.timestamp())
+    return headers
@@ -0,0 +1,69 @@
+"""
+희소 필드셋 (?fields= / ?omit= / ?expand=)
+
+- fields: 응답에 넣을 필드만 콤마로 지정 (예: fields=id,title,monthly_fee)
+- omit: 기본 필드에서 뺄 필드 (예: omit=images)
+- expand: fields로 좁힌 상태에서 중첩 관계를 다시 포함 (예: fields=id,title&expand=images)
+- 조회(GET) 응답에만 적용하고, 필요 없는 관계는 prefetch 쿼리 자체를 생략한다
+"""
+from typing import FrozenSet, Optional
+
+from rest_framework.exceptions import ValidationError
+from drf_spectacular.utils import OpenApiParameter
+
+EXPANDABLE_FIELDS = ('images',)
+
+FIELDSET_PARAMETERS = [
+    OpenApiParameter(name='fields', description='응답에 포함할 필드 (콤마 구분, 예: id,title,monthly_fee)', required=False, type=str),
+    OpenApiParameter(name='omit', description='응답에서 뺄 필드 (콤마 구분, 예: images)', required=False, type=str),
+    OpenApiParameter(name='expand', description='fields와 함께 쓸 때 포함할 중첩 관계 (images)', required=False, type=str),
+]
+
+
+def _names(raw: Optional[str]) -> FrozenSet[str]:
+    return frozenset(name.strip() for name in (raw or '').split(',') if name.strip())
+
+
+def resolve_fieldset(query_params, serializer_class) -> Optional[FrozenSet[str]]:
+    """출력할 필드 이름 집합. 파라미터가 없으면 None(전체 필드)"""
+    fields, omit, expand = (_names(query_params.get(p)) for p in ('fields', 'omit', 'expand'))
+    if not (fields or omit or expand):
+        return None
+
+    available = frozenset(serializer_class.Meta.fields)
+    unknown = (fields | omit) - available
+    if unknown:
+        raise ValidationError({'fields': f"알 수 없는 필드: {', '.join(sorted(unknown))}"})
+    unknown = expand - frozenset(EXPANDABLE_FIELDS)
+    if unknown:
+        raise ValidationError({'expand': f"확장할 수 없는 필드: {', '.join(sorted(unknown))}"})
+
+    selected = (fields | expand) if fields else available
+    return selected - omit
+
+
+def with_images(queryset, fieldset: Optional[FrozenSet[str]]):
+    """images를 내보낼 때만 prefetch"""
+    if fieldset is not None and 'images' not in fieldset:
+        return queryset
+    return queryset.prefetch_related('images')
+
+
+class FieldsetViewMixin:
+    """GenericAPIView용: 조회 요청의 필드셋을 serializer context와 queryset prefetch에 반영"""
+
+    def get_fieldset(self) -> Optional[FrozenSet[str]]:
+        if not hasattr(self, '_fieldset'):
+            self._fieldset = (
+                resolve_fieldset(self.request.query_params, self.get_serializer_class())
+                if self.request.method == 'GET' else None
+            )
+        return self._fieldset
+
+    def get_queryset(self):
+        return with_images(super().get_queryset(), self.get_fieldset())
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fieldset'] = self.get_fieldset()
+        return context
@@ -0,0 +1,91 @@
+import django_filters
+from django.db.models import Case, CharField, Count, Value, When
+
+from .models import Room
+
+
+class CharInFilter(django_filters.BaseInFilter, django_filters.CharFilter):
+    pass
+
+
+class RoomRangeFilter(django_filters.FilterSet):
+    """방 검색 범위 필터 (가격/면적 범위, 계약형태). room_type은 검색 뷰에서 따로 처리"""
+    deposit_min = django_filters.NumberFilter(field_name='deposit', lookup_expr='gte')
+    deposit_max = django_filters.NumberFilter(field_name='deposit', lookup_expr='lte')
+    monthly_fee_min = django_filters.NumberFilter(field_name='monthly_fee', lookup_expr='gte')
+    monthly_fee_max = django_filters.NumberFilter(field_name='monthly_fee', lookup_expr='lte')
+    maintenance_cost_min = django_filters.NumberFilter(field_name='maintenance_cost', lookup_expr='gte')
+    maintenance_cost_max = django_filters.NumberFilter(field_name='maintenance_cost', lookup_expr='lte')
+    real_area_min = django_filters.NumberFilter(field_name='real_area', lookup_expr='gte')
+    real_area_max = django_filters.NumberFilter(field_name='real_area', lookup_expr='lte')
+    # 콤마 구분 복수 선택 (예: 월세,반전세)
+    contract_type = CharInFilter(field_name='contract_type', lookup_expr='in')
+
+    class Meta:
+        model = Room
+        fields = []
+
+    def active_filters(self) -> dict:
+        """is_valid() 이후 값이 지정된 필터만 (캐시 키/응답용)"""
+        return {
+            name: (list(value) if isinstance(value, (list, tuple)) else value)
+            for name, value in self.form.cleaned_data.items()
+            if value not in (None, '', [])
+        }
+
+
+# 월세 구간 (라벨, 이상, 미만). 마지막 구간은 상한 없음
+MONTHLY_FEE_BUCKETS = (
+    ('~30만', None, 300_000),
+    ('30만~50만', 300_000, 500_000),
+    ('50만~70만', 500_000, 700_000),
+    ('70만~100만', 700_000, 1_000_000),
+    ('100만~', 1_000_000, None),
+)
+
+
+def _fee_bucket_expression():
+    whens = []
+    for label, low, high in MONTHLY_FEE_BUCKETS:
+        condition = {}
+        if low is not None:
+            condition['monthly_fee__gte'] = low
+        if high is not None:
+            condition['monthly_fee__lt'] = high
+        whens.append(When(**condition, then=Value(label)))
+    return Case(*whens, default=Value(None), output_field=CharField())
+
+
+def compute_facets(queryset) -> dict:
+    """
+    현재 필터 조건에서의 방 타입/계약형태/월세 구간별 개수.
+    패싯 값마다 COUNT를 돌리지 않고 (room_type, contract_type, 월세 구간) GROUP BY 한 번으로 모두 계산한다.
+    """
+    rows = (
+        queryset.order_by()
+        .annotate(fee_bucket=_fee_bucket_expression())
+        .values('room_type', 'contract_type', 'fee_bucket')
+        .annotate(n=Count('id'))
+    )
+    room_types, contract_types, fee_buckets = {}, {}, {}
+    for row in rows:
+        room_types[row['room_type']] = room_types.get(row['room_type'], 0) + row['n']
+        contract_types[row['contract_type']] = contract_types.get(row['contract_type'], 0) + row['n']
+        if row['fee_bucket'] is not None:
+            fee_buckets[row['fee_bucket']] = fee_buckets.get(row['fee_bucket'], 0) + row['n']
+
+    def ranked(counts):
+        return [
+            {'value': value, 'count': count}
+            for value, count in sorted(counts.items(), key=lambda kv: -kv[1])
+            if value
+        ]
+
+    return {
+        'room_type': ranked(room_types),
+        'contract_type': ranked(contract_types),
+        'monthly_fee': [
+            {'bucket': label, 'min': low, 'max': high, 'count': fee_buckets.get(label, 0)}
+            for label, low, high in MONTHLY_FEE_BUCKETS
+        ],
+    }
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from rooms.cache import bump_data_version
+from rooms.models import Room
+from rooms.utils.cards import thumbnail_subquery
+from rooms.utils.clusters import rebuild_clusters
+
+
+class Command(BaseCommand):
+    help = "Recompute derived Room columns (geohash, region_gu, region_dong, thumbnail_url, ...) for existing rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        chunk_size: int = options["chunk_size"]
+        last_id, total = 0, 0
+        while True:
+            rooms = list(Room.objects.filter(id__gt=last_id).order_by("id")[:chunk_size])
+            if not rooms:
+                break
+            for room in rooms:
+                room.fill_derived_fields()
+            with transaction.atomic():
+                Room.objects.bulk_update(rooms, Room.DERIVED_FIELDS)
+                # 썸네일은 방 컬럼이 아니라 이미지에서 오므로 서브쿼리 UPDATE로 채운다
+                Room.objects.filter(id__gte=rooms[0].id, id__lte=rooms[-1].id).update(thumbnail_url=thumbnail_subquery())
+            last_id = rooms[-1].id
+            total += len(rooms)
+            self.stdout.write(f"  {total} room(s) updated")
+        # bulk_update/update()는 시그널을 거치지 않으므로 geohash가 바뀌었을 수 있는 클러스터와 버전 키 캐시를 직접 갱신한다
+        clusters = rebuild_clusters()
+        bump_data_version()
+        self.stdout.write(self.style.SUCCESS(f"Backfill completed. rooms={total}, clusters={clusters}"))
@@ -0,0 +1,222 @@
+import random
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from rooms.models import Room, RoomImage, RoomSearchToken
+from rooms.utils.cards import CARD_COLUMNS, card_from_row, thumbnail_subquery
+from rooms.utils.room_importer import import_rooms, normalize_item
+from rooms.utils.search_index import room_tokens, search_rooms
+
+
+GU_DONG = {
+    "중랑구": ["중화동", "상봉동", "면목동", "묵동", "망우동", "신내동"],
+    "동대문구": ["휘경동", "이문동", "회기동", "청량리동", "전농동"],
+    "노원구": ["공릉동", "월계동", "하계동", "상계동"],
+    "성북구": ["석관동", "장위동", "안암동", "정릉동"],
+    "광진구": ["화양동", "자양동", "구의동", "중곡동"],
+}
+STATIONS = ["중화역", "상봉역", "망우역", "중랑역", "회기역", "외대앞역", "석계역", "태릉입구역", "건대입구역", "신내역"]
+PHRASES = ["풀옵션", "역세권", "신축", "주차가능", "즉시입주", "최우선변제", "채광좋은", "가성비", "반려동물가능", "엘베있는"]
+BUILDINGS = [f"{a}{b}" for a in ["해오름", "미래", "푸른", "한빛", "동원", "삼익", "대림", "우성", "브르넨", "시네마"]
+             for b in ["빌", "하이츠", "캐슬", "타워", "맨션", "파크", "스테이", "하우스"]]
+ROOM_TYPES = ["원룸", "투룸", "쓰리룸", "오피스텔", "아파트"]
+CARD_ROWS = 1000
+LEGACY_IMPORT_SAMPLE = 2000
+# 이 타깃들은 --sizes 만큼 방을 미리 만들어 두고 측정, 나머지는 --sizes를 입력 크기로 쓴다
+SEEDED_TARGETS = ("search", "cards")
+SEARCH_QUERIES = ["중화역", "상봉동", "풀옵션 원룸", "역세권", "회기역 투룸", "면목", "브르넨캐슬", "한빛스테이 원룸"]
+
+
+class Command(BaseCommand):
+    help = "Benchmark room query paths on synthetic data. All synthetic rows are rolled back."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target", choices=["search", "cards", "import"], default="search")
+        parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per query (median is reported)")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.repeat = options["repeat"]
+        target = getattr(self, f"_bench_{options['target']}")
+
+        with transaction.atomic():
+            seeded = 0
+            for size in sorted(options["sizes"]):
+                if options["target"] in SEEDED_TARGETS:
+                    self._seed_rooms(size - seeded)
+                    seeded = size
+                self.size = size
+                self.stdout.write(self.style.MIGRATE_HEADING(f"[{options['target']}] rooms={size:,}"))
+                target()
+            transaction.set_rollback(True)
+
+    # ---- synthetic data ----
+    def _synthetic_room(self) -> Room:
+        rng = self.rng
+        gu = rng.choice(list(GU_DONG))
+        dong = rng.choice(GU_DONG[gu])
+        room_type = rng.choice(ROOM_TYPES)
+        title = (f"{rng.choice(STATIONS)}{rng.randint(1, 15)}분 {rng.choice(BUILDINGS)} "
+                 f"{rng.choice(PHRASES)} {rng.choice(PHRASES)} {room_type}")
+        return Room(
+            title=title,
+            room_type=room_type,
+            deposit=rng.randrange(0, 50_000_000, 1_000_000),
+            monthly_fee=rng.randrange(200_000, 1_500_000, 10_000),
+            maintenance_cost=rng.randrange(0, 200_000, 10_000),
+            real_area=round(rng.uniform(12, 85), 2),
+            contract_type=rng.choice(["월세", "전세", "반전세"]),
+            address=f"{gu} {dong}",
+            latitude=37.55 + rng.random() * 0.1,
+            longitude=127.0 + rng.random() * 0.1,
+        )
+
+    def _synthetic_item(self, external_id: int) -> Dict[str, object]:
+        """임포트 원본 형식(한글 키)의 합성 매물"""
+        room = self._synthetic_room()
+        return {
+            "매물ID": external_id,
+            "제목": room.title,
+            "방종류": room.room_type,
+            "월세": room.monthly_fee,
+            "보증금": room.deposit,
+            "관리비": room.maintenance_cost,
+            "전용면적": room.real_area,
+            "계약형태": room.contract_type,
+            "주소": room.address,
+            "위도": room.latitude,
+            "경도": room.longitude,
+            "이미지URL": [f"https://img.example.com/{external_id}/{i}.jpg" for i in range(3)],
+        }
+
+    def _seed_rooms(self, count: int, chunk_size: int = 5000):
+        started = time.perf_counter()
+        while count > 0:
+            rooms = Room.objects.bulk_create([self._synthetic_room() for _ in range(min(chunk_size, count))])
+            if rooms and rooms[0].pk is None:
+                # pk를 돌려주지 않는 DB(MySQL)는 방금 넣은 범위를 다시 조회
+                rooms = list(Room.objects.order_by("-id")[:len(rooms)])
+            RoomSearchToken.objects.bulk_create(
+                [
+                    RoomSearchToken(room_id=room.id, token=token, weight=weight)
+                    for room in rooms
+                    for token, weight in room_tokens(room.title, room.address).items()
+                ],
+                batch_size=5000,
+            )
+            count -= len(rooms)
+        self.stdout.write(f"  seeded in {time.perf_counter() - started:.1f}s")
+
+    # ---- helpers ----
+    def _median_ms(self, fn: Callable[[], object]) -> float:
+        timings: List[float] = []
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
+
+    def _report(self, rows: List[Dict[str, object]]):
+        for row in rows:
+            self.stdout.write("  " + "  ".join(f"{k}={v}" for k, v in row.items()))
+
+    # ---- targets ----
+    def _bench_search(self):
+        def legacy(q):
+            qs = Room.objects.filter(Q(title__icontains=q) | Q(address__icontains=q)).order_by("-id")
+            return list(qs[:20]), qs.count()
+
+        def indexed(q):
+            qs, ranked = search_rooms(Room.objects.all(), q)
+            qs = qs.order_by("-relevance", "-id") if ranked else qs.order_by("-id")
+            return list(qs[:20]), qs.count()
+
+        rows = []
+        for q in SEARCH_QUERIES:
+            old_ms, new_ms = self._median_ms(lambda: legacy(q)), self._median_ms(lambda: indexed(q))
+            rows.append({
+                "q": q,
+                "icontains_ms": f"{old_ms:.1f}",
+                "index_ms": f"{new_ms:.1f}",
+                "speedup": f"{old_ms / new_ms:.1f}x" if new_ms else "-",
+            })
+        self._report(rows)
+
+    def _bench_cards(self):
+        from rest_framework.renderers import JSONRenderer
+        from bookmarks.serializers import RoomCardSerializer
+
+        ids = list(Room.objects.order_by("-id").values_list("id", flat=True)[:CARD_ROWS])
+        if not RoomImage.objects.filter(room_id__in=ids).exists():
+            RoomImage.objects.bulk_create(
+                [RoomImage(room_id=room_id, image_url=f"https://img.example.com/{room_id}/{i}.jpg", ordering=i)
+                 for room_id in ids for i in range(3)],
+                batch_size=5000,
+            )
+            Room.objects.filter(id__in=ids).update(thumbnail_url=thumbnail_subquery())
+
+        def serializer():
+            rooms = Room.objects.filter(id__in=ids).order_by("-id")
+            return JSONRenderer().render(RoomCardSerializer(rooms, many=True).data)
+
+        def renderer():
+            rows = Room.objects.filter(id__in=ids).order_by("-id").values_list(*CARD_COLUMNS)
+            return JSONRenderer().render([card_from_row(row) for row in rows])
+
+        if serializer() != renderer():
+            self.stderr.write("  card output differs from RoomCardSerializer")
+        old_ms, new_ms = self._median_ms(serializer), self._median_ms(renderer)
+        per_k = 1000 / len(ids) if ids else 0
+        self._report([{
+            "rows": len(ids),
+            "serializer_ms_per_1k": f"{old_ms * per_k:.1f}",
+            "values_ms_per_1k": f"{new_ms * per_k:.1f}",
+            "speedup": f"{old_ms / new_ms:.1f}x" if new_ms else "-",
+        }])
+
+    def _bench_import(self):
+        base = 10 ** (len(str(self.size)) + 1)
+        payload = [self._synthetic_item(base + i) for i in range(self.size)]
+
+        def legacy(items):
+            # 기존 ImportRoomsView 방식: 항목마다 update_or_create + 이미지 삭제/생성
+            for item in map(normalize_item, items):
+                images = item.pop("images", [])
+                room, _ = Room.objects.update_or_create(external_id=item["external_id"], defaults=item)
+                RoomImage.objects.filter(room=room).delete()
+                for idx, url in enumerate(images):
+                    RoomImage.objects.create(room=room, image_url=url, ordering=idx)
+
+        def timed(fn) -> float:
+            started = time.perf_counter()
+            with transaction.atomic():
+                fn()
+            return time.perf_counter() - started
+
+        sample = [self._synthetic_item(base * 2 + i) for i in range(min(LEGACY_IMPORT_SAMPLE, self.size))]
+        legacy_s = timed(lambda: legacy(sample))
+        create_s = timed(lambda: import_rooms(payload))
+        for item in payload:
+            item["월세"] += 10_000
+        update_s = timed(lambda: import_rooms(payload))
+        unchanged_s = timed(lambda: import_rooms(payload))
+
+        per_k = 1000 / self.size
+        legacy_per_k = legacy_s * 1000 / len(sample)
+        self._report([
+            {"path": "legacy (per item)", "rows": len(sample), "s_per_1k": f"{legacy_per_k:.2f}",
+             "est_total_s": f"{legacy_per_k * self.size / 1000:.1f}"},
+            {"path": "engine create", "rows": self.size, "s_per_1k": f"{create_s * per_k:.2f}",
+             "total_s": f"{create_s:.1f}", "speedup": f"{legacy_per_k / (create_s * per_k):.1f}x"},
+            {"path": "engine update", "rows": self.size, "s_per_1k": f"{update_s * per_k:.2f}",
+             "total_s": f"{update_s:.1f}", "speedup": f"{legacy_per_k / (update_s * per_k):.1f}x"},
+            {"path": "engine unchanged", "rows": self.size, "s_per_1k": f"{unchanged_s * per_k:.2f}",
+             "total_s": f"{unchanged_s:.1f}", "speedup": f"{legacy_per_k / (unchanged_s * per_k):.1f}x"},
+        ])
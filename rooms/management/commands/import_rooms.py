@@ -1,93 +1,119 @@
-import json
-from typing import Any, Dict, List
+import logging
+import time
 
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
-from rooms.models import Room, RoomImage
+from rooms.utils.image_probe import probe_images, stale_image_urls
+from rooms.utils.json_stream import JSONStreamError, iter_json_items
+from rooms.utils.parallel_import import import_rooms_parallel
+from rooms.utils.room_importer import IMPORT_CHUNK_SIZE, import_rooms
+
+logger = logging.getLogger(__name__)
 
 
 class Command(BaseCommand):
-    help = "Import rooms from a JSON file with Korean keys (supports list or items/data/results keys)."
-
-    KOREAN_KEY_MAP = {
-        "매물ID": "external_id",
-        "제목": "title",
-        "방종류": "room_type",
-        "월세": "monthly_fee",
-        "보증금": "deposit",
-        "관리비": "maintenance_cost",
-        "공급면적": "supply_area",
-        "전용면적": "real_area",
-        "층수": "floor",
-        "계약형태": "contract_type",
-        "주소": "address",
-        "위도": "latitude",
-        "경도": "longitude",
-        "이미지URL": "images",
-    }
+    help = "Import rooms from a JSON file with Korean keys (supports list, items/data/results keys or NDJSON)."
 
     def add_arguments(self, parser):
         parser.add_argument("json_path", type=str, help="Path to JSON file to import")
+        parser.add_argument(
+            "--workers", type=int, default=1,
+            help="Worker processes. 1 imports the whole file in one transaction; "
+                 "more partitions listings by 매물ID and commits each chunk on its own",
+        )
+        parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="Listings per chunk")
+        parser.add_argument(
+            "--failed-dir", type=str, default=None,
+            help="Where failed chunks are written as NDJSON with --workers (default: <json_path>.failed)",
+        )
+        parser.add_argument(
+            "--skip-probe", action="store_true",
+            help="Do not probe new image URLs (probe_room_images) after rooms were created or updated",
+        )
 
-    def _normalize_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
-        norm: Dict[str, Any] = {}
-        for k, v in item.items():
-            if k not in self.KOREAN_KEY_MAP:
-                continue
-            target = self.KOREAN_KEY_MAP[k]
-            if target == "images":
-                norm["images"] = v or []
-            else:
-                norm[target] = v
-        return norm
-
-    def _load_payload(self, path: str) -> List[Dict[str, Any]]:
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except Exception as e:
-            raise CommandError(f"Failed to read JSON: {e}")
-
-        if isinstance(data, list):
-            return data
-        if isinstance(data, dict):
-            for key in ("items", "data", "results"):
-                if key in data and isinstance(data[key], list):
-                    return data[key]
-        raise CommandError("JSON must be a list or contain items/data/results list.")
-
-    @transaction.atomic
     def handle(self, *args, **options):
         path: str = options["json_path"]
-        raw_items = self._load_payload(path)
-
-        created, updated = 0, 0
-        for raw in raw_items:
-            item = self._normalize_item(raw)
-            images = item.pop("images", [])
-            external_id = item.get("external_id")
-
-            if external_id is not None:
-                room, is_created = Room.objects.update_or_create(
-                    external_id=external_id, defaults=item
-                )
-            else:
-                room = Room.objects.create(**item)
-                is_created = True
+        workers: int = options["workers"]
+        chunk_size: int = options["chunk_size"]
+        if workers < 1 or chunk_size < 1:
+            raise CommandError("--workers and --chunk-size must be at least 1.")
 
-            RoomImage.objects.filter(room=room).delete()
-            for idx, url in enumerate(images):
-                if url:
-                    RoomImage.objects.create(room=room, image_url=url, ordering=idx)
+        try:
+            with open(path, "rb") as f:
+                if workers == 1:
+                    changed = self._import_serial(iter_json_items(f), chunk_size)
+                else:
+                    changed = self._import_parallel(iter_json_items(f), workers, chunk_size, options["failed_dir"] or f"{path}.failed")
+        except OSError as e:
+            raise CommandError(f"Failed to read JSON: {e}")
+        except JSONStreamError as e:
+            raise CommandError(f"Failed to parse JSON: {e}")
+        except RuntimeError as e:
+            raise CommandError(str(e))
+        if changed and not options["skip_probe"]:
+            self._probe()
+
+    def _probe(self):
+        # 임포트는 이미 커밋됐으므로 점검이 실패해도 명령은 성공으로 끝낸다
+        try:
+            probed, ok = probe_images(stale_image_urls())
+        except Exception:
+            logger.exception("Image probe failed")
+            self.stderr.write(self.style.WARNING("Image probe failed; run probe_room_images later"))
+            return
+        self.stdout.write(f"Probed {probed} image URL(s), broken={probed - ok}")
+
+    def _chunk_line(self, seq, size, result, seconds, worker=None):
+        where = f"chunk {seq}" if worker is None else f"chunk {seq} [worker {worker}]"
+        return (
+            f"  {where}: {size} item(s) created={result.created}, updated={result.updated}, "
+            f"unchanged={result.unchanged} in {seconds:.2f}s"
+        )
+
+    def _import_serial(self, raw_items, chunk_size):
+        seq = 0
+        last = time.perf_counter()
+
+        def progress(chunk):
+            # 스트리밍으로 읽으므로 전체 건수는 끝까지 읽어야 알 수 있다. chunk별 건수/시간만 출력
+            nonlocal seq, last
+            now = time.perf_counter()
+            seq += 1
+            self.stdout.write(self._chunk_line(seq, len(chunk.room_ids), chunk, now - last))
+            last = now
+
+        with transaction.atomic():
+            result = import_rooms(raw_items, chunk_size=chunk_size, on_chunk=progress)
 
-            if is_created:
-                created += 1
+        self.stdout.write(self.style.SUCCESS(
+            f"Import completed. created={result.created}, updated={result.updated}, unchanged={result.unchanged}"
+        ))
+        return bool(result.created or result.updated)
+
+    def _import_parallel(self, raw_items, workers, chunk_size, failed_dir):
+        def progress(report):
+            if report.result is None:
+                self.stdout.write(self.style.ERROR(
+                    f"  chunk {report.seq} [worker {report.worker}]: {report.size} item(s) failed "
+                    f"in {report.seconds:.2f}s ({report.error}) -> {report.failed_path}"
+                ))
             else:
-                updated += 1
+                self.stdout.write(self._chunk_line(report.seq, report.size, report.result, report.seconds, report.worker))
 
+        started = time.perf_counter()
+        summary = import_rooms_parallel(raw_items, workers, failed_dir, chunk_size=chunk_size, on_chunk=progress)
+        total = summary.total
         self.stdout.write(self.style.SUCCESS(
-            f"Import completed. created={created}, updated={updated}"
+            f"Import completed with {workers} workers in {time.perf_counter() - started:.1f}s. "
+            f"chunks={summary.chunks}, created={total.created}, updated={total.updated}, unchanged={total.unchanged}"
         ))
-
-
+        if summary.failed_chunks:
+            retry = "\n".join(
+                f"  python manage.py import_rooms {report.failed_path}"
+                for report in sorted(summary.failed_chunks, key=lambda report: report.seq)
+            )
+            raise CommandError(
+                f"{len(summary.failed_chunks)} chunk(s) failed; the others are committed. Retry them with:\n{retry}"
+            )
+        return bool(total.created or total.updated)
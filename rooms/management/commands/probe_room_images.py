@@ -0,0 +1,47 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from rooms.utils.image_probe import (
+    PROBE_CONCURRENCY,
+    PROBE_PER_HOST,
+    PROBE_STALE_AFTER,
+    PROBE_TIMEOUT_SECONDS,
+    probe_images,
+    stale_image_urls,
+)
+
+
+class Command(BaseCommand):
+    help = "Probe room image URLs (status, size, dimensions) that were never checked or whose result is stale."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=PROBE_CONCURRENCY, help="Requests in flight")
+        parser.add_argument("--per-host", type=int, default=PROBE_PER_HOST, help="Connections per host")
+        parser.add_argument("--timeout", type=float, default=PROBE_TIMEOUT_SECONDS, help="Seconds per request")
+        parser.add_argument(
+            "--stale-days", type=float, default=PROBE_STALE_AFTER.days,
+            help="Re-probe results older than this many days",
+        )
+        parser.add_argument("--limit", type=int, default=None, help="Probe at most this many URLs")
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 1 or options["per_host"] < 1 or options["timeout"] <= 0:
+            raise CommandError("--concurrency and --per-host must be at least 1 and --timeout positive.")
+
+        urls = stale_image_urls(timedelta(days=options["stale_days"]))
+        if options["limit"] is not None:
+            urls = urls[:options["limit"]]
+        self.stdout.write(f"{len(urls)} URL(s) to probe")
+
+        def progress(results):
+            broken = [r for r in results if not r.ok]
+            self.stdout.write(f"  {len(results)} probed, {len(broken)} broken")
+            for r in broken[:5]:
+                self.stdout.write(self.style.WARNING(f"    {r.status_code or '-'} {r.error} {r.url}"))
+
+        probed, ok = probe_images(
+            urls, concurrency=options["concurrency"], per_host=options["per_host"],
+            timeout=options["timeout"], on_batch=progress,
+        )
+        self.stdout.write(self.style.SUCCESS(f"Probe completed. probed={probed}, ok={ok}, broken={probed - ok}"))
@@ -0,0 +1,70 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from rooms.cache import get_data_version
+from rooms.utils.image_probe import probe_images, stale_image_urls
+from rooms.utils.import_jobs import claim_next_job, run_import_job
+
+logger = logging.getLogger(__name__)
+
+# 쉬는 동안 이미지 점검을 시도하는 최소 간격 (방이 자주 수정돼도 전체 URL 목록을 매번 훑지 않게)
+PROBE_MIN_INTERVAL_SECONDS = 60
+
+
+class Command(BaseCommand):
+    help = "Process uploaded room import jobs (RoomImportJob) in committed chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Process pending jobs and exit instead of polling")
+        parser.add_argument("--poll-interval", type=float, default=5.0, help="Seconds to wait when no job is pending")
+        parser.add_argument(
+            "--skip-probe", action="store_true",
+            help="Do not probe new or stale image URLs (probe_room_images) when idle after room data changed",
+        )
+
+    def handle(self, *args, **options):
+        self.probed_version = None
+        self.last_probe = None
+        while True:
+            job = claim_next_job()
+            if job is None:
+                if not options["skip_probe"]:
+                    self.probe_if_changed()
+                if options["once"]:
+                    return
+                time.sleep(options["poll_interval"])
+                continue
+
+            self.stdout.write(f"Job {job.id}: started")
+            run_import_job(job)
+            job.refresh_from_db()
+            style = self.style.SUCCESS if job.status == job.Status.SUCCEEDED else self.style.ERROR
+            self.stdout.write(style(
+                f"Job {job.id}: {job.status} processed={job.processed}, created={job.created}, "
+                f"updated={job.updated}, unchanged={job.unchanged}, failed={job.failed}" + (f" ({job.error})" if job.error else "")
+            ))
+
+    def probe_if_changed(self):
+        """
+        데이터 버전이 지난 점검 뒤로 바뀌었으면 새로 들어온(또는 점검한 지 오래된) 이미지 URL을 점검한다.
+        버전은 업로드 작업, 요청 본문 임포트, import_rooms 명령, API 수정이 모두 올리므로 어느 경로로 들어온 이미지든 잡힌다
+        """
+        now = time.monotonic()
+        if self.last_probe is not None and now - self.last_probe < PROBE_MIN_INTERVAL_SECONDS:
+            return
+        version = get_data_version()
+        if version == self.probed_version:
+            return
+        self.last_probe = now
+        try:
+            probed, ok = probe_images(stale_image_urls())
+        except Exception:
+            # 점검은 부가 작업이라 실패해도 작업 처리 루프는 계속 돈다 (다음 간격에 다시 시도)
+            logger.exception("Image probe failed")
+            self.stderr.write(self.style.ERROR("Image probe failed; see the log for details"))
+            return
+        self.probed_version = version
+        if probed:
+            self.stdout.write(f"Probed {probed} image URL(s), broken={probed - ok}")
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from rooms.utils.clusters import rebuild_clusters
+
+
+class Command(BaseCommand):
+    help = "Recompute all precomputed map clusters (RoomCluster) from Room coordinates."
+
+    def handle(self, *args, **options):
+        count = rebuild_clusters()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} cluster(s)."))
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.23 on 2026-10-18 03:39
+
+import re
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+# 이 시점의 search_index 토큰화 사본 (앱 코드가 바뀌어도 마이그레이션 결과는 그대로여야 한다)
+_NON_WORD_RE = re.compile(r"[^0-9a-z가-힣]+")
+
+
+def text_bigrams(text):
+    grams = set()
+    for word in _NON_WORD_RE.sub(" ", (text or "").lower()).split():
+        grams.update(word[i:i + 2] for i in range(len(word) - 1))
+    return grams
+
+
+def room_tokens(title, address):
+    tokens = {}
+    for gram in text_bigrams(title):
+        tokens[gram] = tokens.get(gram, 0) + 2
+    for gram in text_bigrams(address):
+        tokens[gram] = tokens.get(gram, 0) + 1
+    return tokens
+
+
+def build_search_index(apps, schema_editor):
+    Room = apps.get_model('rooms', 'Room')
+    RoomSearchToken = apps.get_model('rooms', 'RoomSearchToken')
+    postings = []
+    for room_id, title, address in Room.objects.values_list('id', 'title', 'address').iterator():
+        for token, weight in room_tokens(title, address).items():
+            postings.append(RoomSearchToken(room_id=room_id, token=token, weight=weight))
+        if len(postings) >= 5000:
+            RoomSearchToken.objects.bulk_create(postings)
+            postings = []
+    RoomSearchToken.objects.bulk_create(postings)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=2)),
+                ('weight', models.PositiveSmallIntegerField(default=1)),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='rooms.room')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['token', 'room'], name='idx_room_search_token')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='roomsearchtoken',
+            constraint=models.UniqueConstraint(fields=('room', 'token'), name='uniq_room_search_token'),
+        ),
+        migrations.RunPython(build_search_index, migrations.RunPython.noop),
+    ]
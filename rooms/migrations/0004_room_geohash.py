@@ -0,0 +1,53 @@
+# Generated by Django 4.2.23 on 2026-10-18 03:47
+
+from django.db import migrations, models
+
+# 이 시점의 geo.encode_geohash 사본 (앱 코드가 바뀌어도 마이그레이션 결과는 그대로여야 한다)
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode_geohash(latitude, longitude, precision=9):
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits, bit_count, even = 0, 0, True
+    while len(chars) < precision:
+        rng, value = (lng_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def fill_geohash(apps, schema_editor):
+    Room = apps.get_model('rooms', 'Room')
+    rooms = list(Room.objects.exclude(latitude=None).exclude(longitude=None).only('id', 'latitude', 'longitude'))
+    for room in rooms:
+        room.geohash = encode_geohash(room.latitude, room.longitude)
+    Room.objects.bulk_update(rooms, ['geohash'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0003_room_data_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='room',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, max_length=12, null=True),
+        ),
+        migrations.RunPython(fill_geohash, migrations.RunPython.noop),
+    ]
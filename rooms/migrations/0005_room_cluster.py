@@ -0,0 +1,70 @@
+# Generated by Django 4.2.23 on 2026-10-18 03:48
+
+import statistics
+from collections import defaultdict
+
+from django.db import migrations, models
+
+# 이 시점의 clusters.build_cluster_rows 사본 (앱 코드가 바뀌어도 마이그레이션 결과는 그대로여야 한다)
+CLUSTER_PRECISIONS = (3, 4, 5, 6)
+
+
+def build_cluster_rows(rows):
+    buckets = defaultdict(lambda: [0, 0.0, 0.0, []])
+    for geohash, lat, lng, fee in rows:
+        if not geohash:
+            continue
+        for precision in CLUSTER_PRECISIONS:
+            bucket = buckets[(precision, geohash[:precision])]
+            bucket[0] += 1
+            bucket[1] += lat
+            bucket[2] += lng
+            if fee is not None:
+                bucket[3].append(fee)
+    return [
+        {
+            'precision': precision,
+            'cell': cell,
+            'count': count,
+            'latitude': lat_sum / count,
+            'longitude': lng_sum / count,
+            'min_monthly_fee': min(fees) if fees else None,
+            'median_monthly_fee': int(round(statistics.median(fees))) if fees else None,
+        }
+        for (precision, cell), (count, lat_sum, lng_sum, fees) in buckets.items()
+    ]
+
+
+def build_clusters(apps, schema_editor):
+    Room = apps.get_model('rooms', 'Room')
+    RoomCluster = apps.get_model('rooms', 'RoomCluster')
+    rows = Room.objects.exclude(geohash=None).values_list('geohash', 'latitude', 'longitude', 'monthly_fee')
+    RoomCluster.objects.bulk_create([RoomCluster(**c) for c in build_cluster_rows(rows)], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0004_room_geohash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomCluster',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('precision', models.PositiveSmallIntegerField()),
+                ('cell', models.CharField(max_length=12)),
+                ('count', models.PositiveIntegerField()),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('min_monthly_fee', models.IntegerField(blank=True, null=True)),
+                ('median_monthly_fee', models.IntegerField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='roomcluster',
+            constraint=models.UniqueConstraint(fields=('precision', 'cell'), name='uniq_room_cluster_cell'),
+        ),
+        migrations.RunPython(build_clusters, migrations.RunPython.noop),
+    ]
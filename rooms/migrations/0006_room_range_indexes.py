@@ -0,0 +1,33 @@
+# Generated by Django 4.2.23 on 2026-10-18 03:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0005_room_cluster'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['room_type', 'monthly_fee'], name='idx_room_type_fee'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['room_type', 'deposit'], name='idx_room_type_deposit'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['contract_type', 'monthly_fee'], name='idx_room_contract_fee'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['contract_type', 'deposit'], name='idx_room_contract_deposit'),
+        ),
+        migrations.AddIndex(
+            model_name='room',
+            index=models.Index(fields=['monthly_fee', 'deposit'], name='idx_room_fee_deposit'),
+        ),
+    ]
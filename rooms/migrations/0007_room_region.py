@@ -0,0 +1,47 @@
+# Generated by Django 4.2.23 on 2026-10-18 03:53
+
+from django.db import migrations, models
+
+# 이 시점의 region.parse_region 사본 (앱 코드가 바뀌어도 마이그레이션 결과는 그대로여야 한다)
+_DONG_SUFFIXES = ("동", "가", "읍", "면")
+
+
+def parse_region(address):
+    gu = dong = None
+    for token in (address or "").split():
+        if len(token) < 2:
+            continue
+        if gu is None and dong is None and token.endswith("구"):
+            gu = token
+        elif dong is None and token.endswith(_DONG_SUFFIXES):
+            dong = token
+    return gu, dong
+
+
+def fill_region(apps, schema_editor):
+    Room = apps.get_model('rooms', 'Room')
+    rooms = list(Room.objects.exclude(address=None).only('id', 'address'))
+    for room in rooms:
+        room.region_gu, room.region_dong = parse_region(room.address)
+    Room.objects.bulk_update(rooms, ['region_gu', 'region_dong'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0006_room_range_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='room',
+            name='region_dong',
+            field=models.CharField(blank=True, db_index=True, max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='room',
+            name='region_gu',
+            field=models.CharField(blank=True, db_index=True, max_length=20, null=True),
+        ),
+        migrations.RunPython(fill_region, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.23 on 2026-10-18 04:00
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_thumbnail_url(apps, schema_editor):
+    Room = apps.get_model('rooms', 'Room')
+    RoomImage = apps.get_model('rooms', 'RoomImage')
+    first_image = RoomImage.objects.filter(room_id=OuterRef('pk')).order_by('ordering', 'id').values('image_url')[:1]
+    Room.objects.update(thumbnail_url=Subquery(first_image))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0008_room_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='room',
+            name='thumbnail_url',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.RunPython(fill_thumbnail_url, migrations.RunPython.noop),
+    ]
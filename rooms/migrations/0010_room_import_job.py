@@ -0,0 +1,34 @@
+# Generated by Django 4.2.23 on 2026-10-18 04:28
+
+from django.db import migrations, models
+import rooms.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0009_room_thumbnail_url'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', '대기'), ('running', '처리 중'), ('succeeded', '완료'), ('failed', '실패')], db_index=True, default='pending', max_length=10)),
+                ('source', models.FileField(storage=rooms.models.import_job_storage, upload_to=rooms.models.import_job_upload_to)),
+                ('processed', models.PositiveIntegerField(default=0)),
+                ('created', models.PositiveIntegerField(default=0)),
+                ('updated', models.PositiveIntegerField(default=0)),
+                ('failed', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+            },
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 4.2.23 on 2026-10-18 04:31
+
+import hashlib
+import json
+from collections import defaultdict
+
+from django.db import migrations, models
+
+# room_importer.SOURCE_FIELDS / content_hash 사본 (앱 코드가 바뀌어도 마이그레이션 결과는 그대로여야 한다)
+SOURCE_FIELDS = (
+    'title', 'room_type', 'monthly_fee', 'deposit', 'maintenance_cost', 'supply_area',
+    'real_area', 'floor', 'contract_type', 'address', 'latitude', 'longitude',
+)
+
+
+def content_hash(values, image_urls):
+    payload = json.dumps(
+        [[[values[name]] for name in SOURCE_FIELDS], image_urls],
+        ensure_ascii=False, separators=(',', ':'), default=str,
+    )
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def fill_content_hash(apps, schema_editor):
+    # 지금 저장된 값을 모든 키가 있는 원본 항목으로 보고 채워 두면 배포 후 첫 재임포트부터 바뀌지 않은 방을 건너뛴다
+    Room = apps.get_model('rooms', 'Room')
+    RoomImage = apps.get_model('rooms', 'RoomImage')
+    ids = list(Room.objects.exclude(external_id=None).order_by('id').values_list('id', flat=True))
+    for start in range(0, len(ids), 1000):
+        chunk = ids[start:start + 1000]
+        urls = defaultdict(list)
+        images = RoomImage.objects.filter(room_id__in=chunk).order_by('room_id', 'ordering', 'id')
+        for room_id, url in images.values_list('room_id', 'image_url'):
+            if url:
+                urls[room_id].append(url)
+        rooms = list(Room.objects.filter(id__in=chunk).only('id', *SOURCE_FIELDS))
+        for room in rooms:
+            room.content_hash = content_hash({name: getattr(room, name) for name in SOURCE_FIELDS}, urls[room.id])
+        Room.objects.bulk_update(rooms, ['content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rooms', '0010_room_import_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='room',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=40, null=True),
+        ),
+        migrations.AddField(
+            model_name='roomimportjob',
+            name='unchanged',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_content_hash, migrations.RunPython.noop),
+    ]
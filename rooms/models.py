@@ -1,5 +1,13 @@
+import os
+import uuid
+
 from django.db import models
 from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.functional import cached_property
+
+from .utils.geo import encode_geohash
+from .utils.region import parse_region
 
 # Create your models here.
 
@@ -20,9 +28,50 @@ class Room(models.Model):
     # 외부 원본의 "매물ID"를 보관하여 import 중복 방지
     external_id = models.BigIntegerField(unique=True, null=True, blank=True)
 
+    # ---- 원본 필드에서 계산되는 컬럼 (fill_derived_fields) ----
+    # 지도 뷰포트 조회용 위경도 geohash (rooms.utils.geo)
+    geohash = models.CharField(max_length=12, null=True, blank=True, db_index=True)
+    # 주소에서 뽑은 구/동 (통계·필터용, rooms.utils.region)
+    region_gu = models.CharField(max_length=20, null=True, blank=True, db_index=True)
+    region_dong = models.CharField(max_length=20, null=True, blank=True, db_index=True)
+
+    # 첫 번째 이미지(ordering, id 순) URL. 카드/지도 응답용 비정규화 컬럼으로 RoomImage 시그널이 갱신한다
+    thumbnail_url = models.TextField(null=True, blank=True)
+
+    # 마지막 임포트 원본(원본 필드 + 이미지 URL 목록)의 해시 (rooms.utils.room_importer.content_hash).
+    # 같으면 임포트가 이 방을 건너뛴다. 임포트가 아닌 경로로 바뀌면(save(), 이미지 시그널) 비워서 다음 임포트가 다시 쓰게 한다
+    content_hash = models.CharField(max_length=40, null=True, blank=True)
+
+    # 마지막 수정 시각 (이미지 추가/삭제 시에도 signals에서 갱신). 조건부 GET의 ETag/Last-Modified에 사용
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        # 검색 범위 필터용 복합 인덱스 (방 타입/계약형태 + 가격 범위)
+        indexes = [
+            models.Index(fields=['room_type', 'monthly_fee'], name='idx_room_type_fee'),
+            models.Index(fields=['room_type', 'deposit'], name='idx_room_type_deposit'),
+            models.Index(fields=['contract_type', 'monthly_fee'], name='idx_room_contract_fee'),
+            models.Index(fields=['contract_type', 'deposit'], name='idx_room_contract_deposit'),
+            models.Index(fields=['monthly_fee', 'deposit'], name='idx_room_fee_deposit'),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.room_type or '-'})"
 
+    DERIVED_FIELDS = ('geohash', 'region_gu', 'region_dong')
+
+    def fill_derived_fields(self):
+        """원본 필드로부터 계산 컬럼을 채운다. save()를 거치지 않는 bulk 경로에서는 직접 호출할 것."""
+        self.geohash = encode_geohash(self.latitude, self.longitude)
+        self.region_gu, self.region_dong = parse_region(self.address)
+
+    def save(self, *args, **kwargs):
+        self.fill_derived_fields()
+        self.content_hash = None
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = set(kwargs['update_fields']) | set(self.DERIVED_FIELDS) | {'content_hash', 'updated_at'}
+        super().save(*args, **kwargs)
+
 
 class RoomImage(models.Model):
     room = models.ForeignKey(Room, related_name='images', on_delete=models.CASCADE)
@@ -36,6 +85,135 @@ class RoomImage(models.Model):
         return f"{self.room_id} - {self.ordering or 0}"
 
 
+class RoomImageProbe(models.Model):
+    """
+    이미지 URL 점검 결과 캐시 (rooms.utils.image_probe). URL 기준이라 임포트가 RoomImage 행을 바꿔 써도 결과가 남는다.
+    checked_at이 오래된 것만 다시 점검한다
+    """
+    url_hash = models.CharField(max_length=40, unique=True)  # sha1(url). URL(TextField)에는 unique 인덱스를 걸 수 없음
+    url = models.TextField()
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)  # 연결 실패/타임아웃이면 None
+    content_type = models.CharField(max_length=100, blank=True)
+    content_length = models.BigIntegerField(null=True, blank=True)
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    error = models.CharField(max_length=255, blank=True)
+    checked_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.status_code or self.error} {self.url}"
+
+
+class RoomSearchToken(models.Model):
+    """검색용 bigram 역색인 (rooms.utils.search_index 참고)"""
+    room = models.ForeignKey(Room, related_name='search_tokens', on_delete=models.CASCADE)
+    token = models.CharField(max_length=2)
+    # 제목 토큰 2, 주소 토큰 1 (양쪽에 모두 있으면 합산)
+    weight = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['room', 'token'], name='uniq_room_search_token'),
+        ]
+        indexes = [
+            models.Index(fields=['token', 'room'], name='idx_room_search_token'),
+        ]
+
+    def __str__(self):
+        return f"{self.room_id}:{self.token}"
+
+
+class RoomCluster(models.Model):
+    """줌 단계(geohash 자릿수)별 지도 클러스터 사전 집계 (rooms.utils.clusters 참고)"""
+    precision = models.PositiveSmallIntegerField()
+    cell = models.CharField(max_length=12)
+    count = models.PositiveIntegerField()
+    # 셀에 속한 방들의 위경도 평균
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    min_monthly_fee = models.IntegerField(null=True, blank=True)
+    median_monthly_fee = models.IntegerField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['precision', 'cell'], name='uniq_room_cluster_cell'),
+        ]
+
+    def __str__(self):
+        return f"{self.cell}({self.count})"
+
+
+class RoomDataVersion(models.Model):
+    """
+    Room 데이터가 바뀔 때마다 증가하는 전역 버전 (단일 행, pk=1)
+    워커별 캐시가 이 값을 키에 넣어 쓰므로, 버전만 올리면 모든 워커의 캐시가 무효화된다.
+    """
+    version = models.PositiveBigIntegerField(default=0)
+    # 제목/주소(검색 색인)가 바뀔 때만 증가. 텍스트만 보는 스냅샷(자동완성)은 이미지/가격 변경에 다시 만들지 않는다
+    text_version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"v{self.version}"
+
+
+class ImportUploadStorage(FileSystemStorage):
+    """위치를 ROOM_IMPORT_UPLOAD_ROOT에서 읽는 FileSystemStorage. MEDIA_ROOT처럼 설정이 바뀌면(override_settings) 다시 읽는다"""
+
+    @cached_property
+    def base_location(self):
+        return settings.ROOM_IMPORT_UPLOAD_ROOT
+
+    def _clear_cached_properties(self, setting, **kwargs):
+        super()._clear_cached_properties(setting, **kwargs)
+        if setting == 'ROOM_IMPORT_UPLOAD_ROOT':
+            self.__dict__.pop('base_location', None)
+            self.__dict__.pop('location', None)
+
+
+def import_job_storage():
+    # 업로드 원본은 공개 서빙되는 MEDIA_ROOT가 아니라 ROOM_IMPORT_UPLOAD_ROOT에 둔다 (워커만 경로로 읽는다)
+    return ImportUploadStorage()
+
+
+def import_job_upload_to(instance, filename):
+    return f"room_imports/{uuid.uuid4().hex}{os.path.splitext(filename)[1].lower()}"
+
+
+class RoomImportJob(models.Model):
+    """
+    파일 업로드 임포트 작업. 업로드 요청은 파일만 저장하고 202로 끝나며,
+    process_import_jobs 워커가 chunk 단위로 커밋하면서 진행 건수를 갱신한다 (rooms.utils.import_jobs 참고)
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', '대기'
+        RUNNING = 'running', '처리 중'
+        SUCCEEDED = 'succeeded', '완료'
+        FAILED = 'failed', '실패'
+
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING, db_index=True)
+    # 작업이 끝나면(성공/실패) 워커가 지운다
+    source = models.FileField(upload_to=import_job_upload_to, storage=import_job_storage)
+    processed = models.PositiveIntegerField(default=0)
+    created = models.PositiveIntegerField(default=0)
+    updated = models.PositiveIntegerField(default=0)
+    unchanged = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # 워커가 chunk마다 갱신한다. 처리 중인데 오래 멈춰 있으면 다른 워커가 다시 가져간다
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+
+    def __str__(self):
+        return f"RoomImportJob({self.id}) {self.status}"
+
+
 class Review(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="reviews")
     room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name="reviews")
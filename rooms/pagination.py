@@ -0,0 +1,168 @@
+import base64
+import binascii
+import json
+from typing import Any, List, Optional, Sequence
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+
+class RoomCursorPagination(BasePagination):
+    """
+    정렬 키 기반(keyset) 커서 페이지네이션
+    - OFFSET 없이 마지막 행의 정렬 키 다음부터 읽으므로 깊은 페이지도 첫 페이지와 비용이 같다
+    - 커서는 정렬 키 값을 base64로 감싼 불투명 토큰이며, next/prev 두 방향을 지원
+    - ordering은 유일해야 하므로 항상 id로 끝나야 한다 (예: ('-relevance', '-id'))
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = 20
+    max_page_size = 100
+    ordering: Sequence[str] = ('-id',)
+
+    def __init__(self, ordering: Optional[Sequence[str]] = None):
+        if ordering is not None:
+            self.ordering = tuple(ordering)
+        self.next_cursor = None
+        self.prev_cursor = None
+
+    # ---- cursor encoding ----
+    def encode_cursor(self, values: List[Any], reverse: bool) -> str:
+        raw = json.dumps({'v': values, 'r': reverse}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, token: str):
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            values, reverse = data['v'], bool(data['r'])
+        except (binascii.Error, ValueError, KeyError, TypeError):
+            raise ValidationError({self.cursor_query_param: '잘못된 커서입니다.'})
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise ValidationError({self.cursor_query_param: '현재 정렬과 맞지 않는 커서입니다.'})
+        return values, reverse
+
+    # ---- helpers ----
+    def get_page_size(self, request) -> int:
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def _fields(self, reverse: bool):
+        # (필드명, 내림차순 여부). prev 방향은 정렬을 뒤집어 읽는다
+        return [(o.lstrip('-'), o.startswith('-') != reverse) for o in self.ordering]
+
+    def _coerce(self, model, values) -> List[Any]:
+        """
+        커서 값을 정렬 필드 타입으로 바꾼다. 토큰은 클라이언트가 만들 수 있으므로
+        타입이 맞지 않는 값이 쿼리까지 가서 500이 나지 않게 여기서 400으로 끊는다
+        """
+        invalid = ValidationError({self.cursor_query_param: '잘못된 커서입니다.'})
+        coerced = []
+        for order, value in zip(self.ordering, values):
+            if value is None or isinstance(value, (bool, dict, list)):
+                raise invalid
+            try:
+                field = model._meta.get_field(order.lstrip('-'))
+            except FieldDoesNotExist:
+                # 어노테이션(relevance 등)은 정수 합계
+                field = None
+            if field is None:
+                if not isinstance(value, int):
+                    raise invalid
+            else:
+                try:
+                    value = field.to_python(value)
+                    field.run_validators(value)
+                except DjangoValidationError:
+                    raise invalid
+            # sqlite는 백엔드가 정수 범위 검증기를 주지 않는다
+            if isinstance(value, int) and not -2 ** 63 <= value < 2 ** 63:
+                raise invalid
+            coerced.append(value)
+        return coerced
+
+    def _after(self, fields, values) -> Q:
+        """(f1, f2, ...) 튜플 비교를 OR/AND 조합으로 풀어쓴 keyset 조건"""
+        condition = Q()
+        for i, (name, desc) in enumerate(fields):
+            step = Q(**{f'{name}__{"lt" if desc else "gt"}': values[i]})
+            for j in range(i):
+                step &= Q(**{fields[j][0]: values[j]})
+            condition |= step
+        return condition
+
+    def _position(self, obj) -> List[Any]:
+        return [getattr(obj, o.lstrip('-')) for o in self.ordering]
+
+    # ---- DRF pagination API ----
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size_value = self.get_page_size(request)
+        token = request.query_params.get(self.cursor_query_param)
+        values, reverse = self.decode_cursor(token) if token else (None, False)
+        if values is not None:
+            values = self._coerce(queryset.model, values)
+
+        fields = self._fields(reverse)
+        queryset = queryset.order_by(*[('-' if desc else '') + name for name, desc in fields])
+        if values is not None:
+            queryset = queryset.filter(self._after(fields, values))
+
+        rows = list(queryset[:self.page_size_value + 1])
+        has_more = len(rows) > self.page_size_value
+        rows = rows[:self.page_size_value]
+        if reverse:
+            rows.reverse()
+
+        self.next_cursor = self.prev_cursor = None
+        if rows:
+            # 정방향: 더 있으면 next, 커서로 들어왔으면 prev / 역방향: 항상 next, 더 있으면 prev
+            has_next = True if reverse else has_more
+            has_prev = has_more if reverse else values is not None
+            if has_next:
+                self.next_cursor = self.encode_cursor(self._position(rows[-1]), False)
+            if has_prev:
+                self.prev_cursor = self.encode_cursor(self._position(rows[0]), True)
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.next_cursor,
+            'prev': self.prev_cursor,
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'description': '다음 페이지 커서'},
+                'prev': {'type': 'string', 'nullable': True, 'description': '이전 페이지 커서'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': '이전 응답의 next/prev 커서 값',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': f'페이지 크기 (최대 {self.max_page_size})',
+                'schema': {'type': 'integer'},
+            },
+        ]
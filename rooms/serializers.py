@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Room, RoomImage, Review
+from .models import Room, RoomImage, RoomImportJob, Review
 
 
 class RoomImageSerializer(serializers.ModelSerializer):
@@ -9,7 +9,18 @@ class RoomImageSerializer(serializers.ModelSerializer):
         read_only_fields = ("id",)
 
 
-class RoomSerializer(serializers.ModelSerializer):
+class SparseFieldsetMixin:
+    """context['fieldset']이 있으면 그 밖의 필드를 제거해, 해당 속성/관계를 아예 읽지 않는다"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fieldset = self.context.get('fieldset')
+        if fieldset is not None:
+            for name in set(self.fields) - fieldset:
+                self.fields.pop(name)
+
+
+class RoomSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     images = RoomImageSerializer(many=True, read_only=True)
 
     class Meta:
@@ -84,22 +95,173 @@ class RoomStatsResponseSerializer(serializers.Serializer):
 class _FiltersAppliedSerializer(serializers.Serializer):
     search_query = serializers.BooleanField()
     room_type = serializers.BooleanField()
+    # 적용된 범위 필터 {파라미터명: 값}
+    ranges = serializers.DictField()
+
+
+class _FacetValueSerializer(serializers.Serializer):
+    value = serializers.CharField()
+    count = serializers.IntegerField()
+
+
+class _FeeBucketSerializer(serializers.Serializer):
+    bucket = serializers.CharField()
+    min = serializers.IntegerField(allow_null=True)
+    max = serializers.IntegerField(allow_null=True)
+    count = serializers.IntegerField()
+
+
+class _SearchFacetsSerializer(serializers.Serializer):
+    room_type = _FacetValueSerializer(many=True)
+    contract_type = _FacetValueSerializer(many=True)
+    monthly_fee = _FeeBucketSerializer(many=True)
 
 
 class RoomSearchResponseSerializer(serializers.Serializer):
     rooms = RoomSerializer(many=True)
     total_count = serializers.IntegerField()
-    page = serializers.IntegerField()
+    # count=estimate 응답에서 total_count가 상한 추정치면 false
+    exact = serializers.BooleanField()
+    page = serializers.IntegerField(required=False)
     page_size = serializers.IntegerField()
+    # cursor 모드에서만 포함
+    next = serializers.CharField(allow_null=True, required=False)
+    prev = serializers.CharField(allow_null=True, required=False)
     search_query = serializers.CharField(allow_blank=True)
     room_type = serializers.CharField(allow_blank=True)
     filters_applied = _FiltersAppliedSerializer()
+    # facets=true일 때만 포함
+    facets = _SearchFacetsSerializer(required=False)
+
+
+class _RoomMapPinSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    lat = serializers.FloatField()
+    lng = serializers.FloatField()
+    monthly_fee = serializers.IntegerField(allow_null=True)
+    thumbnail = serializers.CharField(allow_null=True)
+
+
+class RoomMapResponseSerializer(serializers.Serializer):
+    zoom = serializers.IntegerField()
+    count = serializers.IntegerField()
+    truncated = serializers.BooleanField()
+    rooms = _RoomMapPinSerializer(many=True)
+
+
+class _RoomClusterSerializer(serializers.Serializer):
+    cell = serializers.CharField()
+    count = serializers.IntegerField()
+    lat = serializers.FloatField()
+    lng = serializers.FloatField()
+    min_monthly_fee = serializers.IntegerField(allow_null=True)
+    median_monthly_fee = serializers.IntegerField(allow_null=True)
+
+
+class RoomClusterResponseSerializer(serializers.Serializer):
+    zoom = serializers.IntegerField()
+    precision = serializers.IntegerField()
+    clusters = _RoomClusterSerializer(many=True)
+
+
+class _NearbyRoomSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    title = serializers.CharField()
+    room_type = serializers.CharField(allow_null=True)
+    deposit = serializers.IntegerField(allow_null=True)
+    monthly_fee = serializers.IntegerField(allow_null=True)
+    lat = serializers.FloatField()
+    lng = serializers.FloatField()
+    thumbnail = serializers.CharField(allow_null=True)
+    distance_m = serializers.FloatField()
+
+
+class RoomNearbyResponseSerializer(serializers.Serializer):
+    count = serializers.IntegerField()
+    rooms = _NearbyRoomSerializer(many=True)
+
+
+class _HistogramBinSerializer(serializers.Serializer):
+    min = serializers.FloatField()
+    max = serializers.FloatField()
+    count = serializers.IntegerField()
+
+
+class _PriceMetricSerializer(serializers.Serializer):
+    count = serializers.IntegerField()
+    min = serializers.FloatField(allow_null=True)
+    max = serializers.FloatField(allow_null=True)
+    p10 = serializers.FloatField(allow_null=True)
+    p50 = serializers.FloatField(allow_null=True)
+    p90 = serializers.FloatField(allow_null=True)
+    histogram = _HistogramBinSerializer(many=True)
+    percentile_rank = serializers.FloatField(required=False, allow_null=True, help_text='요청한 가격의 시장 내 퍼센타일')
+
+
+class _PriceMetricsSerializer(serializers.Serializer):
+    deposit = _PriceMetricSerializer()
+    monthly_fee = _PriceMetricSerializer()
+    fee_per_m2 = _PriceMetricSerializer()
+
+
+class _PriceQuantilesSerializer(serializers.Serializer):
+    p10 = serializers.FloatField(allow_null=True)
+    p50 = serializers.FloatField(allow_null=True)
+    p90 = serializers.FloatField(allow_null=True)
+
+
+class _PriceMarketSerializer(serializers.Serializer):
+    region = serializers.CharField()
+    room_type = serializers.CharField()
+    count = serializers.IntegerField()
+    deposit = _PriceQuantilesSerializer()
+    monthly_fee = _PriceQuantilesSerializer()
+    fee_per_m2 = _PriceQuantilesSerializer()
+
+
+class RoomPriceStatsResponseSerializer(serializers.Serializer):
+    region = serializers.CharField(allow_null=True)
+    room_type = serializers.CharField(allow_null=True)
+    count = serializers.IntegerField()
+    metrics = _PriceMetricsSerializer()
+    markets = _PriceMarketSerializer(many=True)
+
+
+class _SuggestionSerializer(serializers.Serializer):
+    text = serializers.CharField()
+    kind = serializers.ChoiceField(choices=['gu', 'dong', 'complex', 'station'])
+    count = serializers.IntegerField()
+
+
+class RoomAutocompleteResponseSerializer(serializers.Serializer):
+    prefix = serializers.CharField(allow_blank=True)
+    suggestions = _SuggestionSerializer(many=True)
+
+
+class RoomBatchRequestSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+
+
+class RoomBatchResponseSerializer(serializers.Serializer):
+    rooms = RoomSerializer(many=True)
+    missing = serializers.ListField(child=serializers.IntegerField(), help_text='존재하지 않는 방 ID (요청 순서)')
 
 
 class ImportRoomsResponseSerializer(serializers.Serializer):
     created = serializers.IntegerField()
     updated = serializers.IntegerField()
-    rooms = RoomSerializer(many=True)
+    unchanged = serializers.IntegerField()
+    # response=ids: 매물ID -> 방 id
+    ids = serializers.DictField(child=serializers.IntegerField(), required=False)
+    # response=full
+    rooms = RoomSerializer(many=True, required=False)
+
+
+class RoomImportJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RoomImportJob
+        fields = ['id', 'status', 'processed', 'created', 'updated', 'unchanged', 'failed', 'error', 'created_at', 'started_at', 'finished_at']
+        read_only_fields = fields
 
 
 # ----- 리뷰 평점 통계 응답 -----
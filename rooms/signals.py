@@ -0,0 +1,70 @@
+import threading
+from contextlib import contextmanager
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import bump_data_version, bump_text_version
+from .models import Room, RoomImage
+from .utils.cards import thumbnail_subquery
+from .utils.search_index import index_rooms
+
+_state = threading.local()
+
+
+@contextmanager
+def bulk_import():
+    """
+    이 블록 안의 Room/RoomImage 저장·삭제는 아래 후처리(색인, 썸네일/content_hash, 데이터 버전)를 건너뛴다.
+    대량 임포트(room_importer)처럼 호출한 쪽이 끝에서 한 번에 직접 갱신할 때만 쓴다
+    """
+    previous = getattr(_state, 'bulk_import', False)
+    _state.bulk_import = True
+    try:
+        yield
+    finally:
+        _state.bulk_import = previous
+
+
+def _in_bulk_import() -> bool:
+    return getattr(_state, 'bulk_import', False)
+
+
+@receiver(post_save, sender=Room)
+def reindex_room_on_save(sender, instance, update_fields=None, **kwargs):
+    if _in_bulk_import():
+        return
+    # 제목/주소가 바뀌지 않은 부분 저장은 색인을 건드리지 않음
+    if update_fields is not None and not {'title', 'address'} & set(update_fields):
+        return
+    index_rooms([instance])
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+def bump_version_on_room_change(sender, **kwargs):
+    if _in_bulk_import():
+        return
+    bump_data_version()
+
+
+@receiver(post_delete, sender=Room)
+def bump_text_version_on_room_delete(sender, **kwargs):
+    if _in_bulk_import():
+        return
+    # 색인 토큰은 CASCADE로 지워지므로 index_rooms를 거치지 않는다
+    bump_text_version()
+
+
+@receiver(post_save, sender=RoomImage)
+@receiver(post_delete, sender=RoomImage)
+def touch_room_on_image_change(sender, instance, **kwargs):
+    if _in_bulk_import():
+        return
+    # 이미지는 방 응답에 포함되므로 방의 썸네일, updated_at, 데이터 버전을 함께 갱신.
+    # 임포트 원본과 달라졌으므로 content_hash도 비워 다음 임포트가 이 방을 다시 쓰게 한다
+    Room.objects.filter(pk=instance.room_id).update(
+        thumbnail_url=thumbnail_subquery(), content_hash=None, updated_at=timezone.now()
+    )
+    bump_data_version()
@@ -1,3 +1,1113 @@
-from django.test import TestCase
+import base64
+import csv
+import importlib
+import io
+import json
+import os
+import queue
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .cache import get_data_version, get_text_version
+from .models import Room, RoomCluster, RoomImage, RoomImageProbe, RoomImportJob
+from .utils import image_probe, json_stream, safe_http, thumbnails
+from .utils.autocomplete import autocomplete_index
+from .utils.import_jobs import claim_next_job, run_import_job
+from .utils.json_stream import JSONStreamError, iter_json_items
+from .utils.room_importer import _conflict_target, import_rooms
+from .utils.safe_http import BlockedAddressError, check_url, is_public_address
+from .utils.search_index import search_rooms
+
+
+class SearchIndexTests(TestCase):
+    def setUp(self):
+        self.exact = Room.objects.create(title='강남역 도보 5분 원룸', address='서울 강남구 역삼동')
+        # "강남역"의 bigram(강남, 남역)을 모두 갖지만 붙어 있지는 않음
+        self.split = Room.objects.create(title='강남 테헤란로 남역 방향', address='서울 강남구 역삼동')
+        self.other = Room.objects.create(title='신촌 투룸', address='서울 서대문구 창천동')
+
+    def search(self, query):
+        queryset, ranked = search_rooms(Room.objects.all(), query)
+        return set(queryset.values_list('id', flat=True)), ranked
+
+    def test_matches_whole_query_only(self):
+        ids, ranked = self.search('강남역')
+        self.assertTrue(ranked)
+        self.assertEqual(ids, {self.exact.id})
+
+    def test_same_results_as_icontains(self):
+        for query in ('강남역', '역삼동', '강남구 역삼', '원룸', '신촌 투룸', '없는동네'):
+            expected = set(
+                Room.objects.filter(title__icontains=query).values_list('id', flat=True)
+            ) | set(Room.objects.filter(address__icontains=query).values_list('id', flat=True))
+            self.assertEqual(self.search(query)[0], expected, query)
+
+    def test_title_match_ranks_higher(self):
+        in_title = Room.objects.create(title='역삼 원룸', address='서울 서초구 서초동')
+        queryset, _ = search_rooms(Room.objects.all(), '역삼')
+        ranked = list(queryset.order_by('-relevance', '-id').values_list('id', flat=True))
+        self.assertEqual(ranked, [in_title.id, self.split.id, self.exact.id])
+
+    def test_index_follows_title_change(self):
+        self.other.title = '강남역 오피스텔'
+        self.other.save()
+        self.assertEqual(self.search('강남역')[0], {self.exact.id, self.other.id})
+
+    def test_count_and_facets_are_keyed_on_raw_query(self):
+        cache.clear()
+        room = Room.objects.create(title='풀옵션 원룸', address='서울 중랑구 면목동', room_type='원룸')
+        # 둘 다 "풀옵션 원룸"으로 정규화되지만 부분 일치 결과는 다르다
+        for query, ids in (('풀옵션 원룸', [room.id]), ('풀옵션,  원룸', [])):
+            response = self.client.get('/api/rooms/search/', {'q': query, 'facets': 'true'})
+            self.assertEqual([r['id'] for r in response.data['rooms']], ids, query)
+            self.assertEqual(response.data['total_count'], len(ids), query)
+            self.assertEqual(sum(f['count'] for f in response.data['facets']['room_type']), len(ids), query)
+
+    def test_single_character_query_falls_back_to_icontains(self):
+        ids, ranked = self.search('룸')
+        self.assertFalse(ranked)
+        self.assertEqual(ids, {self.exact.id, self.other.id})
+
+
+class SearchFilterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.cheap = Room.objects.create(title='원룸 a', room_type='원룸', contract_type='월세', deposit=5_000_000,
+                                         monthly_fee=250_000, real_area=16.5)
+        self.middle = Room.objects.create(title='원룸 b', room_type='원룸', contract_type='반전세', deposit=30_000_000,
+                                          monthly_fee=450_000, real_area=23.1)
+        self.large = Room.objects.create(title='투룸 c', room_type='투룸', contract_type='월세', deposit=10_000_000,
+                                         monthly_fee=800_000, real_area=39.6)
+
+    def search(self, **params):
+        return self.client.get('/api/rooms/search/', params)
+
+    def ids(self, response):
+        return {room['id'] for room in response.data['rooms']}
+
+    def test_range_filters(self):
+        cases = (
+            ({'monthly_fee_min': 400_000}, {self.middle.id, self.large.id}),
+            ({'monthly_fee_max': 450_000}, {self.cheap.id, self.middle.id}),
+            ({'deposit_min': 6_000_000, 'deposit_max': 20_000_000}, {self.large.id}),
+            ({'real_area_min': 20, 'real_area_max': 30}, {self.middle.id}),
+            ({'contract_type': '월세'}, {self.cheap.id, self.large.id}),
+            ({'contract_type': '월세,반전세', 'room_type': '원룸'}, {self.cheap.id, self.middle.id}),
+        )
+        for params, expected in cases:
+            response = self.search(**params)
+            self.assertEqual(self.ids(response), expected, params)
+            self.assertEqual(response.data['total_count'], len(expected), params)
+
+    def test_invalid_range_is_rejected(self):
+        self.assertEqual(self.search(monthly_fee_min='많이').status_code, 400)
+
+    def test_facets_follow_filters(self):
+        facets = self.search(facets='true', monthly_fee_min=300_000).data['facets']
+        self.assertEqual(sorted((f['value'], f['count']) for f in facets['room_type']), [('원룸', 1), ('투룸', 1)])
+        self.assertEqual(sorted((f['value'], f['count']) for f in facets['contract_type']), [('반전세', 1), ('월세', 1)])
+        self.assertEqual([f['count'] for f in facets['monthly_fee']], [0, 1, 0, 1, 0])
+        facets = self.search(facets='true').data['facets']
+        self.assertEqual(facets['room_type'][0], {'value': '원룸', 'count': 2})
+        self.assertEqual([f['count'] for f in facets['monthly_fee']], [1, 1, 0, 1, 0])
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        self.rooms = [Room.objects.create(title=f'강남 원룸 {i}', address='서울 강남구 역삼동') for i in range(5)]
+
+    def cursor(self, payload):
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+    def test_walks_pages_without_overlap(self):
+        seen = []
+        response = self.client.get('/api/rooms/', {'page_size': 2})
+        while True:
+            seen += [room['id'] for room in response.data['results']]
+            if not response.data['next']:
+                break
+            response = self.client.get('/api/rooms/', {'page_size': 2, 'cursor': response.data['next']})
+        self.assertEqual(seen, sorted((room.id for room in self.rooms), reverse=True))
+
+    def test_prev_cursor_returns_previous_page(self):
+        first = self.client.get('/api/rooms/', {'page_size': 2}).data
+        second = self.client.get('/api/rooms/', {'page_size': 2, 'cursor': first['next']}).data
+        back = self.client.get('/api/rooms/', {'page_size': 2, 'cursor': second['prev']}).data
+        self.assertEqual([room['id'] for room in back['results']], [room['id'] for room in first['results']])
+
+    def test_tampered_cursor_is_rejected(self):
+        for payload in ({'v': ['a'], 'r': False}, {'v': [None], 'r': False}, {'v': [[1]], 'r': False},
+                        {'v': [2 ** 70], 'r': False}, {'v': [1, 2], 'r': False}):
+            response = self.client.get('/api/rooms/', {'cursor': self.cursor(payload)})
+            self.assertEqual(response.status_code, 400, payload)
+        self.assertEqual(self.client.get('/api/rooms/', {'cursor': '!!!'}).status_code, 400)
+
+    def test_numeric_string_cursor_is_coerced(self):
+        response = self.client.get('/api/rooms/', {'page_size': 2, 'cursor': self.cursor({'v': [str(self.rooms[2].id)], 'r': False})})
+        self.assertEqual([room['id'] for room in response.data['results']], [self.rooms[1].id, self.rooms[0].id])
+
+    def test_search_cursor_is_validated(self):
+        first = self.client.get('/api/rooms/search/', {'q': '강남', 'cursor': '', 'page_size': 2}).data
+        self.assertEqual(len(first['rooms']), 2)
+        response = self.client.get('/api/rooms/search/', {'q': '강남', 'cursor': first['next'], 'page_size': 2})
+        self.assertEqual(response.status_code, 200)
+        tampered = self.cursor({'v': ['x', 'y'], 'r': False})
+        response = self.client.get('/api/rooms/search/', {'q': '강남', 'cursor': tampered})
+        self.assertEqual(response.status_code, 400)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.room = Room.objects.create(title='강남 원룸', address='서울 강남구 역삼동')
+
+    def test_detail_etag_and_last_modified(self):
+        path = f'/api/rooms/{self.room.id}/'
+        response = self.client.get(path)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        self.assertEqual(self.client.get(path, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get(path, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        # If-None-Match가 있으면 If-Modified-Since는 보지 않는다
+        response = self.client.get(path, HTTP_IF_NONE_MATCH='"other"', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 200)
+        # 쿼리 파라미터가 다르면 다른 표현
+        self.assertNotEqual(self.client.get(path, {'fields': 'id'})['ETag'], etag)
+
+        self.room.title = '강남 투룸'
+        self.room.save()
+        response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((response.status_code, response.data['title']), (200, '강남 투룸'))
+        self.assertEqual(self.client.get('/api/rooms/999999/', HTTP_IF_NONE_MATCH='*').status_code, 404)
+
+    def test_list_follows_data_version(self):
+        response = self.client.get('/api/rooms/')
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+        self.assertEqual(self.client.get('/api/rooms/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertNotEqual(self.client.get('/api/rooms/', {'page_size': 1})['ETag'], etag)
+
+        Room.objects.create(title='신촌 투룸')
+        response = self.client.get('/api/rooms/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 2)
+
+
+class AutocompleteVersionTests(TestCase):
+    def setUp(self):
+        self.room = Room.objects.create(title='중화역3분 원룸', address='서울 중랑구 중화동')
+
+    def lookup(self, prefix):
+        return [s.text for s in autocomplete_index.get(version=get_text_version()).lookup(prefix)]
+
+    def test_image_and_price_changes_keep_text_version(self):
+        version = get_text_version()
+        RoomImage.objects.create(room=self.room, image_url='https://example.com/a.jpg', ordering=0)
+        Room.objects.filter(pk=self.room.pk).update(monthly_fee=500000)
+        self.room.monthly_fee = 400000
+        self.room.save(update_fields=['monthly_fee'])
+        self.assertEqual(get_text_version(), version)
+
+    def test_title_change_and_delete_rebuild_suggestions(self):
+        self.assertEqual(self.lookup('중화'), ['중화동', '중화역'])
+        self.room.title = '상봉역 5분 투룸'
+        self.room.save()
+        self.assertEqual(self.lookup('상봉'), ['상봉역'])
+        self.assertEqual(self.lookup('중화역'), [])
+        self.room.delete()
+        self.assertEqual(self.lookup('중화'), [])
+
+
+class RoomCardTests(TestCase):
+    def test_card_rows_match_serializer(self):
+        from bookmarks.serializers import RoomCardSerializer
+        from .utils.cards import CARD_COLUMNS, card_from_row
+
+        Room.objects.create(title='a', deposit=5000000, monthly_fee=400000, maintenance_cost=50000)
+        Room.objects.create(title='b', deposit=1000, monthly_fee=None, maintenance_cost=None)
+        Room.objects.create(title='c', deposit=None, monthly_fee=300000)
+        Room.objects.create(title='d')
+        rooms = Room.objects.order_by('id')
+        self.assertEqual(
+            [card_from_row(row) for row in rooms.values_list(*CARD_COLUMNS)],
+            RoomCardSerializer(rooms, many=True).data,
+        )
+        self.assertEqual([card['price_label'] for card in RoomCardSerializer(rooms, many=True).data],
+                         ['5,000,000/400,000', '1,000', '300,000', None])
+
+    def test_thumbnail_url_follows_images(self):
+        room = Room.objects.create(title='a')
+
+        def thumbnail():
+            return Room.objects.values_list('thumbnail_url', flat=True).get(pk=room.pk)
+
+        second = RoomImage.objects.create(room=room, image_url='https://img.example.com/b.jpg', ordering=1)
+        self.assertEqual(thumbnail(), 'https://img.example.com/b.jpg')
+        first = RoomImage.objects.create(room=room, image_url='https://img.example.com/a.jpg', ordering=0)
+        self.assertEqual(thumbnail(), 'https://img.example.com/a.jpg')
+        first.ordering = 2
+        first.save()
+        self.assertEqual(thumbnail(), 'https://img.example.com/b.jpg')
+        second.delete()
+        self.assertEqual(thumbnail(), 'https://img.example.com/a.jpg')
+        first.delete()
+        self.assertIsNone(thumbnail())
+
+    def test_imported_and_backfilled_rooms_have_thumbnail(self):
+        import_rooms([listing(701)])
+        room = Room.objects.get(external_id=701)
+        self.assertEqual(room.thumbnail_url, 'https://img.example.com/701/0.jpg')
+        Room.objects.update(thumbnail_url=None)
+        call_command('backfill_room_fields', stdout=io.StringIO())
+        room.refresh_from_db()
+        self.assertEqual(room.thumbnail_url, 'https://img.example.com/701/0.jpg')
+
+
+class RoomMapTests(TestCase):
+    def setUp(self):
+        self.jungrang = Room.objects.create(title='중화동 원룸', latitude=37.6036, longitude=127.0766)
+        self.sangbong = Room.objects.create(title='상봉동 원룸', latitude=37.5967, longitude=127.0857)
+        self.gangnam = Room.objects.create(title='역삼동 원룸', latitude=37.5006, longitude=127.0364)
+
+    def get(self, bbox, **params):
+        return self.client.get('/api/rooms/map/', {'bbox': bbox, **params})
+
+    def test_returns_only_rooms_inside_bbox(self):
+        for zoom in (10, 14, 17):
+            response = self.get('127.07,37.59,127.09,37.61', zoom=zoom)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([room['id'] for room in response.data['rooms']], [self.sangbong.id, self.jungrang.id], zoom)
+            self.assertFalse(response.data['truncated'])
+
+    def test_limit_marks_truncated(self):
+        response = self.get('127.0,37.4,127.1,37.7', limit=2)
+        self.assertEqual(response.data['count'], 2)
+        self.assertTrue(response.data['truncated'])
+        self.assertEqual(self.get('127.0,37.4,127.1,37.7', limit=3).data['truncated'], False)
+
+    def test_bad_bbox_is_rejected(self):
+        for bbox in ('', '127.0,37.4,127.1', 'a,b,c,d', '127.1,37.4,127.0,37.7'):
+            self.assertEqual(self.get(bbox).status_code, 400, bbox)
+
+
+class NearbyTests(TestCase):
+    def setUp(self):
+        from .utils.nearby import coordinates
+
+        # 테스트마다 데이터 버전 번호가 되풀이되므로 프로세스 스냅샷을 비운다
+        coordinates._version = None
+        self.jungrang = Room.objects.create(title='중화동 원룸', latitude=37.6036, longitude=127.0766)
+        self.sangbong = Room.objects.create(title='상봉동 원룸', latitude=37.5967, longitude=127.0857)
+        self.gangnam = Room.objects.create(title='역삼동 원룸', latitude=37.5006, longitude=127.0364)
+        Room.objects.create(title='좌표 없는 방')
+
+    def nearby(self, **params):
+        return self.client.get('/api/rooms/nearby/', params)
+
+    def test_orders_by_distance(self):
+        response = self.nearby(lat=37.6036, lng=127.0766, k=2)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([room['id'] for room in response.data['rooms']], [self.jungrang.id, self.sangbong.id])
+        self.assertEqual(response.data['rooms'][0]['distance_m'], 0)
+        # 중화동-상봉동 약 1.1km
+        self.assertAlmostEqual(response.data['rooms'][1]['distance_m'], 1100, delta=100)
+
+    def test_room_id_excludes_itself(self):
+        response = self.nearby(room_id=self.jungrang.id)
+        self.assertEqual([room['id'] for room in response.data['rooms']], [self.sangbong.id, self.gangnam.id])
+        self.assertEqual(self.nearby(room_id=999999).status_code, 404)
+
+    def test_snapshot_follows_create_and_delete(self):
+        self.assertEqual(self.nearby(lat=37.6, lng=127.08).data['count'], 3)
+        added = Room.objects.create(title='면목동 원룸', latitude=37.5886, longitude=127.0872)
+        self.sangbong.delete()
+        ids = [room['id'] for room in self.nearby(lat=37.6, lng=127.08).data['rooms']]
+        self.assertEqual(ids, [self.jungrang.id, added.id, self.gangnam.id])
+
+    def test_bad_params_are_rejected(self):
+        for params in ({}, {'lat': 37.6}, {'lat': 'x', 'lng': 127.0}, {'lat': 91, 'lng': 127.0}):
+            self.assertEqual(self.nearby(**params).status_code, 400, params)
+
+
+class ClusterTests(TestCase):
+    JUNGRANG = (37.6036, 127.0766)
+    GANGNAM = (37.5006, 127.0364)
+    BUSAN = (35.1587, 129.1604)
+
+    def setUp(self):
+        from .utils.clusters import rebuild_clusters
+        from .utils.geo import encode_geohash
+
+        self.encode = encode_geohash
+        self.room = Room.objects.create(title='중화동 원룸', latitude=self.JUNGRANG[0], longitude=self.JUNGRANG[1], monthly_fee=400000)
+        Room.objects.create(title='역삼동 원룸', latitude=self.GANGNAM[0], longitude=self.GANGNAM[1], monthly_fee=600000)
+        rebuild_clusters()
+        # 같은 3자리 셀, 다른 6자리 셀. 다시 계산되면 덮어써지는 표시값을 넣어 둔다
+        self.gangnam_cell = encode_geohash(*self.GANGNAM)[:6]
+        self.assertEqual(self.gangnam_cell[:3], encode_geohash(*self.JUNGRANG)[:3])
+        RoomCluster.objects.filter(precision=6, cell=self.gangnam_cell).update(count=999)
+
+    def cluster(self, position, precision):
+        return RoomCluster.objects.filter(precision=precision, cell=self.encode(*position)[:precision]).first()
+
+    def assertUntouched(self):
+        self.assertEqual(RoomCluster.objects.get(precision=6, cell=self.gangnam_cell).count, 999)
+
+    def test_each_precision_reads_only_its_touched_cells(self):
+        from .utils import clusters
+
+        reads = []
+        build = clusters.build_cluster_rows
+
+        def spy(rows, cells=None):
+            rows = list(rows)
+            reads.append((cells, [row[0] for row in rows]))
+            return build(rows, cells)
+
+        jungrang = self.encode(*self.JUNGRANG)
+        with mock.patch.object(clusters, 'build_cluster_rows', spy):
+            clusters.refresh_clusters([jungrang])
+        for cells, geohashes in reads:
+            (precision, touched), = cells.items()
+            self.assertEqual(touched, {jungrang[:precision]})
+            # 6자리 단계는 강남 방을 읽지 않는다 (3자리 셀은 둘 다 포함)
+            self.assertTrue(all(geohash[:precision] in touched for geohash in geohashes), precision)
+        counts = {next(iter(cells)): len(geohashes) for cells, geohashes in reads}
+        self.assertEqual((counts[6], counts[3]), (1, 2))
+
+    def test_create_move_delete_refresh_only_touched_cells(self):
+        response = self.client.post('/api/rooms/', {
+            'title': '중화역 투룸', 'latitude': self.JUNGRANG[0], 'longitude': self.JUNGRANG[1], 'monthly_fee': 500000,
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        room_id = response.data['id']
+        self.assertEqual((self.cluster(self.JUNGRANG, 6).count, self.cluster(self.JUNGRANG, 6).median_monthly_fee), (2, 450000))
+        self.assertEqual(self.cluster(self.JUNGRANG, 3).count, 3)
+        self.assertUntouched()
+
+        response = self.client.patch(f'/api/rooms/{room_id}/', {'latitude': self.BUSAN[0], 'longitude': self.BUSAN[1]},
+                                     content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.cluster(self.JUNGRANG, 6).count, 1)
+        self.assertEqual(self.cluster(self.JUNGRANG, 3).count, 2)
+        for precision in (3, 4, 5, 6):
+            self.assertEqual(self.cluster(self.BUSAN, precision).count, 1)
+        self.assertUntouched()
+
+        self.assertEqual(self.client.delete(f'/api/rooms/{room_id}/').status_code, 204)
+        self.assertFalse(RoomCluster.objects.filter(cell__startswith=self.encode(*self.BUSAN)[:3]).exists())
+        self.assertEqual(self.cluster(self.JUNGRANG, 6).count, 1)
+        self.assertUntouched()
+
+
+class RoomStatsTests(TestCase):
+    addresses = ('중랑구 중화동', '상봉동 브르넨상봉', '서울특별시 중랑구 중화동 123-4', '서울 강남구 역삼동', '구 동', '', None)
+
+    def test_parse_region(self):
+        from .utils.region import parse_region
+
+        self.assertEqual([parse_region(address) for address in self.addresses], [
+            ('중랑구', '중화동'), (None, '상봉동'), ('중랑구', '중화동'), ('강남구', '역삼동'), (None, None), (None, None), (None, None),
+        ])
+        # 마이그레이션의 사본도 같은 결과
+        migration = importlib.import_module('rooms.migrations.0007_room_region')
+        self.assertEqual([migration.parse_region(a) for a in self.addresses], [parse_region(a) for a in self.addresses])
+
+    def test_region_stats_are_aggregated_in_sql(self):
+        cache.clear()
+        for address in ('중랑구 중화동', '서울 중랑구 면목동', '서울 강남구 역삼동', '상봉동 브르넨상봉'):
+            Room.objects.create(title='방', address=address, room_type='원룸')
+        data = self.client.get('/api/rooms/stats/').data
+        self.assertEqual(data['total_rooms'], 4)
+        self.assertEqual(data['region_stats'], [{'region': '중랑구', 'count': 2}, {'region': '강남구', 'count': 1}])
+        self.assertEqual(data['search_options']['regions'], ['중랑구', '강남구'])
+
+    def test_etag_follows_data_version(self):
+        cache.clear()
+        room = Room.objects.create(title='방', address='중랑구 중화동', room_type='원룸')
+        response = self.client.get('/api/rooms/stats/')
+        etag = response['ETag']
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        for header in (etag, f'W/{etag}', f'"other", {etag}', '*'):
+            response = self.client.get('/api/rooms/stats/', HTTP_IF_NONE_MATCH=header)
+            self.assertEqual(response.status_code, 304, header)
+            self.assertEqual(response['ETag'], etag)
+
+        room.room_type = '투룸'
+        room.save()
+        response = self.client.get('/api/rooms/stats/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['search_options']['room_types'], ['투룸'])
+
+    def test_price_percentiles(self):
+        from .utils.price_stats import price_snapshot
+
+        price_snapshot._version = None  # NearbyTests와 같은 이유
+        for fee in (300_000, 400_000, 500_000, 600_000, 700_000):
+            Room.objects.create(title='방', address='중랑구 중화동', room_type='원룸', monthly_fee=fee, real_area=20)
+        Room.objects.create(title='방', address='강남구 역삼동', room_type='투룸', monthly_fee=1_500_000)
+
+        response = self.client.get('/api/rooms/stats/prices/', {'region': '중랑구', 'monthly_fee': 500_000})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 5)
+        fee = response.data['metrics']['monthly_fee']
+        self.assertEqual((fee['p10'], fee['p50'], fee['p90'], fee['percentile_rank']), (340_000, 500_000, 660_000, 50.0))
+        self.assertEqual(response.data['metrics']['fee_per_m2']['p50'], 25_000)
+        self.assertEqual([(m['region'], m['room_type'], m['count']) for m in response.data['markets']], [('중랑구', '원룸', 5)])
+
+        # region이 없으면 전체 시장. 면적이 없는 방은 ㎡당 월세에서 빠진다
+        data = self.client.get('/api/rooms/stats/prices/').data
+        self.assertEqual((data['count'], data['metrics']['fee_per_m2']['count']), (6, 5))
+        self.assertEqual(len(data['markets']), 2)
+        self.assertEqual(self.client.get('/api/rooms/stats/prices/', {'monthly_fee': 'x'}).status_code, 400)
+
+        etag = response['ETag']
+        params = {'region': '중랑구', 'monthly_fee': 500_000}
+        self.assertEqual(self.client.get('/api/rooms/stats/prices/', params, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        Room.objects.create(title='방', address='중랑구 면목동', room_type='원룸', monthly_fee=800_000)
+        response = self.client.get('/api/rooms/stats/prices/', params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((response.status_code, response.data['count']), (200, 6))
+
+    def test_backfill_fills_regions_and_bumps_version(self):
+        room = Room.objects.create(title='방', address='중랑구 중화동', latitude=37.6036, longitude=127.0766)
+        Room.objects.update(region_gu=None, region_dong=None)
+        RoomCluster.objects.all().delete()
+        version = get_data_version()
+        call_command('backfill_room_fields', stdout=io.StringIO())
+        room.refresh_from_db()
+        self.assertEqual((room.region_gu, room.region_dong), ('중랑구', '중화동'))
+        self.assertGreater(get_data_version(), version)
+        self.assertTrue(RoomCluster.objects.exists())
+
+
+class RoomBatchTests(TestCase):
+    def setUp(self):
+        self.rooms = [Room.objects.create(title=f'방 {i}') for i in range(3)]
+
+    def test_keeps_request_order_and_reports_missing(self):
+        ids = [self.rooms[2].id, self.rooms[0].id, 999999, self.rooms[2].id]
+        response = self.client.get('/api/rooms/batch/', {'ids': ','.join(map(str, ids))})
+        self.assertEqual([room['id'] for room in response.data['rooms']], [self.rooms[2].id, self.rooms[0].id])
+        self.assertEqual(response.data['missing'], [999999])
+
+    def test_post_allows_longer_lists_than_get(self):
+        ids = [room.id for room in self.rooms] + list(range(10 ** 6, 10 ** 6 + 500))
+        response = self.client.get('/api/rooms/batch/', {'ids': ','.join(map(str, ids))})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/rooms/batch/', {'ids': ids}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['rooms']), 3)
+        self.assertEqual(len(response.data['missing']), 500)
+        response = self.client.post('/api/rooms/batch/', {'ids': list(range(1, 1002))}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+class FieldsetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.room = Room.objects.create(title='강남 원룸', address='서울 강남구 역삼동', monthly_fee=400000)
+        RoomImage.objects.create(room=self.room, image_url='https://img.example.com/a.jpg', ordering=0)
+
+    def get(self, path, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path, params)
+        image_queries = [q['sql'] for q in queries.captured_queries if 'rooms_roomimage' in q['sql']]
+        return response, image_queries
+
+    def test_fields_and_omit(self):
+        for path in ('/api/rooms/', f'/api/rooms/{self.room.id}/'):
+            response, image_queries = self.get(path, fields='id,title')
+            room = response.data['results'][0] if 'results' in response.data else response.data
+            self.assertEqual(set(room), {'id', 'title'}, path)
+            self.assertEqual(image_queries, [], path)
+
+            response, image_queries = self.get(path, omit='images,address')
+            room = response.data['results'][0] if 'results' in response.data else response.data
+            self.assertNotIn('images', room, path)
+            self.assertNotIn('address', room, path)
+            self.assertIn('monthly_fee', room, path)
+            self.assertEqual(image_queries, [], path)
+
+            response, image_queries = self.get(path, fields='id', expand='images')
+            room = response.data['results'][0] if 'results' in response.data else response.data
+            self.assertEqual(set(room), {'id', 'images'}, path)
+            self.assertEqual(len(image_queries), 1, path)
+
+    def test_search_honours_fields(self):
+        response, image_queries = self.get('/api/rooms/search/', q='강남', fields='id,monthly_fee')
+        self.assertEqual(response.data['rooms'], [{'id': self.room.id, 'monthly_fee': 400000}])
+        self.assertEqual(image_queries, [])
+
+    def test_unknown_fields_are_rejected(self):
+        for params in ({'fields': 'id,password'}, {'omit': 'nope'}, {'expand': 'reviews'}):
+            self.assertEqual(self.client.get('/api/rooms/', params).status_code, 400, params)
+            self.assertEqual(self.client.get(f'/api/rooms/{self.room.id}/', params).status_code, 400, params)
+
+
+class RoomExportTests(TestCase):
+    def setUp(self):
+        self.rooms = [Room.objects.create(title=f'방 {i}', monthly_fee=400000 + i) for i in range(3)]
+        RoomImage.objects.create(room=self.rooms[0], image_url='https://img.example.com/b.jpg', ordering=1)
+        RoomImage.objects.create(room=self.rooms[0], image_url='https://img.example.com/a.jpg', ordering=0)
+
+    def export(self, fmt):
+        response = self.client.get('/api/rooms/export/', {'format': fmt})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_ndjson(self):
+        response, body = self.export('ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        self.assertIn('rooms.ndjson', response['Content-Disposition'])
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([row['id'] for row in rows], [room.id for room in self.rooms])
+        self.assertEqual([image['image_url'] for image in rows[0]['images']],
+                         ['https://img.example.com/a.jpg', 'https://img.example.com/b.jpg'])
+
+    def test_csv(self):
+        response, body = self.export('csv')
+        self.assertIn('rooms.csv', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual([int(row['id']) for row in rows], [room.id for room in self.rooms])
+        self.assertEqual(rows[0]['image_urls'], 'https://img.example.com/a.jpg|https://img.example.com/b.jpg')
+        self.assertEqual((rows[1]['image_urls'], rows[1]['monthly_fee']), ('', '400001'))
+
+    def test_chunks_cover_every_room_once(self):
+        from .utils.export import iter_room_chunks
+
+        chunks = list(iter_room_chunks(chunk_size=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        ids = [self.rooms[2].id, self.rooms[0].id, self.rooms[2].id, 999999]
+        self.assertEqual([[row['id'] for row in chunk] for chunk in iter_room_chunks(chunk_size=2, ids=ids)],
+                         [[self.rooms[0].id, self.rooms[2].id]])
+
+
+def listing(external_id, **overrides):
+    item = {
+        '매물ID': external_id, '제목': f'중화역3분 원룸 {external_id}', '방종류': '원룸', '월세': 400000, '보증금': 5000000,
+        '관리비': 50000, '주소': '중랑구 중화동', '위도': 37.6036, '경도': 127.0766,
+        '이미지URL': [f'https://img.example.com/{external_id}/0.jpg', f'https://img.example.com/{external_id}/1.jpg'],
+    }
+    item.update(overrides)
+    return item
+
+
+class RoomImportTests(TestCase):
+    def test_upserts_by_external_id(self):
+        first = import_rooms([listing(1), listing(2)])
+        self.assertEqual((first.created, first.updated), (2, 0))
+        room = Room.objects.get(external_id=1)
+        second = import_rooms([listing(1, 월세=450000), listing(3)])
+        self.assertEqual((second.created, second.updated, second.unchanged), (1, 1, 0))
+        self.assertEqual(Room.objects.count(), 3)
+        updated = Room.objects.get(external_id=1)
+        self.assertEqual(updated.pk, room.pk)
+        self.assertEqual(updated.monthly_fee, 450000)
+        self.assertEqual(updated.region_gu, '중랑구')
+        self.assertEqual(second.id_map, {1: room.pk, 3: Room.objects.get(external_id=3).pk})
+
+    def test_last_duplicate_in_input_wins(self):
+        result = import_rooms([listing(1, 월세=1), listing(1, 월세=2)])
+        self.assertEqual(result.created, 1)
+        self.assertEqual(Room.objects.get(external_id=1).monthly_fee, 2)
+        self.assertEqual(len(set(result.room_ids)), 1)
+
+    def test_image_replacement_keeps_content_hash(self):
+        import_rooms([listing(1)])
+        new_urls = ['https://img.example.com/1/new.jpg']
+        result = import_rooms([listing(1, 이미지URL=new_urls)])
+        self.assertEqual(result.updated, 1)
+        room = Room.objects.get(external_id=1)
+        self.assertEqual(list(room.images.values_list('image_url', flat=True)), new_urls)
+        self.assertEqual(room.thumbnail_url, new_urls[0])
+        # 이미지 삭제가 RoomImage 시그널 후처리를 거치면(bulk_import() 밖) content_hash가 비워져 다음 임포트가 unchanged가 되지 않는다
+        self.assertIsNotNone(room.content_hash)
+        self.assertEqual(import_rooms([listing(1, 이미지URL=new_urls)]).unchanged, 1)
+
+    def test_same_snapshot_is_unchanged(self):
+        import_rooms([listing(1), listing(2)])
+        result = import_rooms([listing(1), listing(2, 월세=1)])
+        self.assertEqual((result.created, result.updated, result.unchanged), (0, 1, 1))
+        self.assertEqual(result.id_map[1], Room.objects.get(external_id=1).pk)
+
+    def test_feed_without_optional_keys_is_unchanged(self):
+        import_rooms([listing(1, 층수='3층')])
+        partial = listing(1)
+        del partial['관리비']
+        self.assertEqual(import_rooms([partial]).updated, 1)
+        # 빠진 키는 기존 값을 유지하므로 같은 부분 항목이 다시 오면 바뀐 게 없다
+        self.assertEqual(import_rooms([partial]).unchanged, 1)
+        room = Room.objects.get(external_id=1)
+        self.assertEqual((room.maintenance_cost, room.floor), (50000, '3층'))
+        # 빠진 키와 null은 다르다 (null은 값을 지운다)
+        self.assertEqual(import_rooms([dict(partial, 관리비=None)]).updated, 1)
+        self.assertIsNone(Room.objects.get(external_id=1).maintenance_cost)
+
+    def test_edited_room_is_rewritten(self):
+        import_rooms([listing(1)])
+        room = Room.objects.get(external_id=1)
+        room.monthly_fee = 1
+        room.save()
+        self.assertEqual(import_rooms([listing(1)]).updated, 1)
+        self.assertEqual(Room.objects.get(external_id=1).monthly_fee, 400000)
+
+    def test_rooms_without_external_id_are_indexed_once(self):
+        from .utils import search_index
+
+        items = [{'제목': '익명 매물 원룸', '주소': '중랑구 중화동'}, {'제목': '익명 매물 투룸', '주소': '중랑구 상봉동'}]
+        index_rooms = mock.Mock(wraps=search_index.index_rooms)
+        # MySQL처럼 bulk_create가 pk를 돌려주지 않으면 한 건씩 save()한다
+        with mock.patch.object(type(connection.features), 'can_return_rows_from_bulk_insert', mock.PropertyMock(return_value=False)), \
+                mock.patch.object(search_index, 'index_rooms', index_rooms), \
+                mock.patch('rooms.signals.index_rooms') as signal_index, \
+                mock.patch('rooms.signals.bump_data_version') as signal_bump:
+            result = import_rooms(items)
+        self.assertEqual(result.created, 2)
+        index_rooms.assert_called_once()
+        signal_index.assert_not_called()
+        signal_bump.assert_not_called()
+        self.assertEqual(set(search_rooms(Room.objects.all(), '익명 매물')[0].values_list('id', flat=True)), set(result.room_ids))
+
+    def test_wrong_wrapper_key_is_rejected(self):
+        response = self.client.post('/api/rooms/import/', {'rooms': [listing(5)]}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Room.objects.exists())
+
+    def post_import(self, items, mode=None):
+        path = '/api/rooms/import/' + (f'?response={mode}' if mode else '')
+        return self.client.post(path, items, content_type='application/json')
+
+    def test_response_modes(self):
+        import_rooms([listing(1)])
+        response = self.post_import([listing(1), listing(2)], 'summary')
+        self.assertEqual((response.status_code, response.data), (201, {'created': 1, 'updated': 0, 'unchanged': 1}))
+
+        response = self.post_import([listing(2, 월세=1), listing(3)], 'ids')
+        ids = dict(Room.objects.values_list('external_id', 'id'))
+        self.assertEqual(response.data, {'created': 1, 'updated': 1, 'unchanged': 0, 'ids': {2: ids[2], 3: ids[3]}})
+
+        response = self.post_import([listing(3), listing(4)], 'full')
+        self.assertTrue(response.streaming)
+        body = json.loads(b''.join(response.streaming_content))
+        self.assertEqual((body['created'], body['unchanged']), (1, 1))
+        self.assertEqual([room['id'] for room in body['rooms']], [ids[3], Room.objects.get(external_id=4).id])
+        self.assertEqual(len(body['rooms'][0]['images']), 2)
+
+        self.assertEqual(self.post_import([listing(5)], 'everything').status_code, 400)
+        self.assertFalse(Room.objects.filter(external_id=5).exists())
+
+    def test_default_response_falls_back_to_ids(self):
+        from .views import ImportRoomsView
+
+        self.assertTrue(self.post_import([listing(1)]).streaming)
+        with mock.patch.object(ImportRoomsView, 'full_response_limit', 1):
+            response = self.post_import([listing(2), listing(3)])
+        self.assertEqual(set(response.data['ids']), {2, 3})
+
+    def test_conflict_target_depends_on_backend(self):
+        features = connection.features
+        with mock.patch.object(features, 'supports_update_conflicts_with_target', True):
+            self.assertEqual(_conflict_target(), {'unique_fields': ['external_id']})
+        # MySQL: ON DUPLICATE KEY UPDATE는 대상을 받지 않는다
+        with mock.patch.object(features, 'supports_update_conflicts_with_target', False):
+            self.assertEqual(_conflict_target(), {})
+
+
+class _ThreadQueue(queue.Queue):
+    def cancel_join_thread(self):
+        pass
+
+
+class _ThreadProcess(threading.Thread):
+    @property
+    def exitcode(self):
+        return None if self.is_alive() else 0
+
+
+class ParallelImportTests(TransactionTestCase):
+    """
+    import_rooms --workers. 테스트 DB(sqlite 메모리)는 프로세스 사이에 공유되지 않으므로 워커를 스레드로 띄우고,
+    sqlite는 동시 쓰기를 막으므로 chunk 적용만 한 번에 하나씩 한다
+    """
+
+    def setUp(self):
+        from .utils import parallel_import
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'rooms.json')
+        lock = threading.Lock()
+        import_chunk = parallel_import.import_chunk
+        self.failing_ids = set()
+
+        def serialized_import_chunk(items):
+            with lock:
+                if self.failing_ids & {item.get('external_id') for item in items}:
+                    raise OperationalError('database is locked')
+                return import_chunk(items)
+
+        context = SimpleNamespace(Queue=_ThreadQueue, Process=_ThreadProcess)
+        for patcher in (
+            mock.patch.object(parallel_import.multiprocessing, 'get_context', return_value=context),
+            mock.patch.object(parallel_import, 'import_chunk', serialized_import_chunk),
+            mock.patch.object(parallel_import, 'RETRY_DELAY_SECONDS', 0),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def run_command(self, items, *args):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(items, f, ensure_ascii=False)
+        out = io.StringIO()
+        call_command('import_rooms', self.path, '--skip-probe', *args, stdout=out)
+        return out.getvalue()
+
+    def test_partitions_by_external_id(self):
+        items = [listing(i) for i in range(1, 8)] + [listing(3, 월세=1)]
+        out = self.run_command(items, '--workers', '2', '--chunk-size', '2')
+        # 홀수 5건(3 중복) -> 3 chunk, 짝수 3건 -> 2 chunk
+        self.assertIn('chunks=5, created=7, updated=1, unchanged=0', out)
+        self.assertEqual(Room.objects.count(), 7)
+        self.assertEqual(Room.objects.get(external_id=3).monthly_fee, 1)
+        self.assertTrue(RoomCluster.objects.exists())
+
+    def test_failed_chunks_are_written_for_retry(self):
+        self.failing_ids = {2}
+        items = [listing(i) for i in range(1, 7)]
+        with self.assertRaisesMessage(CommandError, '1 chunk(s) failed; the others are committed'):
+            self.run_command(items, '--workers', '2', '--chunk-size', '2')
+        self.assertEqual(sorted(Room.objects.values_list('external_id', flat=True)), [1, 3, 5, 6])
+        failed_dir = f'{self.path}.failed'
+        (name,) = os.listdir(failed_dir)
+        with open(os.path.join(failed_dir, name), encoding='utf-8') as f:
+            self.assertEqual([json.loads(line)['매물ID'] for line in f], [2, 4])
+
+        self.failing_ids = set()
+        with open(os.path.join(failed_dir, name), encoding='utf-8') as f:
+            retry = [json.loads(line) for line in f]
+        self.assertIn('created=2, updated=0, unchanged=0', self.run_command(retry))
+        self.assertEqual(Room.objects.count(), 6)
+
+    def test_workers_must_be_positive(self):
+        with self.assertRaises(CommandError):
+            self.run_command([listing(1)], '--workers', '0')
+
+
+class JSONStreamTests(SimpleTestCase):
+    items = [{'매물ID': i, '제목': f'방 {i}', '공급면적': 19.84, '이미지URL': ['https://img.example.com/a.jpg']} for i in range(50)]
+
+    def parse(self, text, read_size=7):
+        return list(iter_json_items(io.BytesIO(text.encode('utf-8')), read_size=read_size))
+
+    def test_formats_across_buffer_edges(self):
+        array = json.dumps(self.items, ensure_ascii=False)
+        for text in (
+            array,
+            json.dumps({'total': 50, 'items': self.items}, ensure_ascii=False),
+            '\n'.join(json.dumps(item, ensure_ascii=False) for item in self.items) + '\n',
+        ):
+            for read_size in (1, 7, 64):
+                self.assertEqual(self.parse(text, read_size), self.items)
+
+    def test_single_record_ndjson(self):
+        self.assertEqual(self.parse('{"매물ID": 1, "제목": "방"}\n'), [{'매물ID': 1, '제목': '방'}])
+
+    def test_object_without_listing_keys_is_rejected(self):
+        for text in ('{"rooms": [{"매물ID": 5}]}', '{"foo": 1}', '{}'):
+            with self.assertRaises(JSONStreamError, msg=text):
+                self.parse(text)
+
+    def test_rejects_non_list_wrapper(self):
+        with self.assertRaises(JSONStreamError):
+            self.parse('{"items": 1}')
+        with self.assertRaises(JSONStreamError):
+            self.parse('"items"')
+
+    def test_malformed_value_stops_at_size_cap(self):
+        reads = []
+
+        class Stream(io.BytesIO):
+            def read(self, size=-1):
+                reads.append(size)
+                return super().read(size)
+
+        # 앞쪽 매물이 닫히지 않아 나머지 파일 전체가 한 값처럼 이어지는 경우
+        broken = '[{"매물ID": 1, "제목": "' + 'x' * 100_000 + '"'
+        with mock.patch.object(json_stream, 'MAX_VALUE_CHARS', 10_000):
+            with self.assertRaisesMessage(JSONStreamError, '너무 크거나'):
+                list(iter_json_items(Stream(broken.encode('utf-8')), read_size=1024))
+        self.assertLess(sum(reads), 50_000)
+        # 읽는 양을 늘려 가므로 재시도는 로그 수준
+        self.assertLess(len(reads), 10)
+
+
+class RoomImportJobTests(TestCase):
+    def setUp(self):
+        upload_root = tempfile.TemporaryDirectory()
+        self.addCleanup(upload_root.cleanup)
+        settings_override = override_settings(ROOM_IMPORT_UPLOAD_ROOT=upload_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def upload(self, items):
+        body = json.dumps(items, ensure_ascii=False).encode('utf-8')
+        response = self.client.post('/api/rooms/import/', {'file': SimpleUploadedFile('rooms.json', body)})
+        self.assertEqual(response.status_code, 202)
+        return RoomImportJob.objects.get(pk=response.data['id'])
+
+    def run_next(self):
+        job = claim_next_job()
+        run_import_job(job)
+        job.refresh_from_db()
+        return job
+
+    def test_upload_is_stored_outside_media_root_and_removed(self):
+        job = self.upload([listing(1)])
+        path = job.source.path
+        self.assertTrue(path.startswith(settings.ROOM_IMPORT_UPLOAD_ROOT + os.sep))
+        self.assertFalse(path.startswith(os.path.abspath(settings.MEDIA_ROOT) + os.sep))
+        job = self.run_next()
+        self.assertEqual(job.status, RoomImportJob.Status.SUCCEEDED)
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(job.source.name, '')
+
+    def test_bad_items_are_skipped(self):
+        self.upload([listing(1), listing(2, 제목=None), listing(3, 월세='abc')])
+        job = self.run_next()
+        self.assertEqual(job.status, RoomImportJob.Status.SUCCEEDED)
+        self.assertEqual((job.created, job.failed), (1, 2))
+
+    def test_database_errors_fail_the_job(self):
+        job = self.upload([listing(1), listing(2)])
+        path = job.source.path
+        with mock.patch('rooms.utils.room_importer.import_chunk', side_effect=OperationalError('database is locked')):
+            job = self.run_next()
+        self.assertEqual(job.status, RoomImportJob.Status.FAILED)
+        self.assertIn('database is locked', job.error)
+        self.assertEqual(job.failed, 0)
+        self.assertFalse(os.path.exists(path))
+
+
+def png_bytes(width, height):
+    from PIL import Image
+
+    out = io.BytesIO()
+    Image.new('RGB', (width, height), (200, 40, 40)).save(out, 'PNG')
+    return out.getvalue()
+
+
+class StubImageHandler(BaseHTTPRequestHandler):
+    """이미지 원본 서버 흉내. 경로별로 정해진 응답을 돌려준다"""
+    image = png_bytes(640, 480)
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        if self.path == '/image.png':
+            self.send_response(200)
+            self.send_header('Content-Type', 'image/png')
+            self.send_header('Content-Length', str(len(self.image)))
+            self.end_headers()
+            self.wfile.write(self.image)
+        elif self.path == '/moved.png':
+            self.redirect('/image.png')
+        elif self.path == '/loop.png':
+            self.redirect('/loop.png')
+        elif self.path == '/to-metadata.png':
+            self.redirect('http://169.254.169.254/latest/meta-data/')
+        else:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+    def redirect(self, location):
+        self.send_response(302)
+        self.send_header('Location', location)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def allow_loopback(address):
+    """테스트 서버(127.0.0.1)만 공인 주소처럼 허용한다"""
+    return address == '127.0.0.1' or is_public_address(address)
+
+
+class StubServerMixin:
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubImageHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_port}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        super().setUp()
+        StubImageHandler.requests = []
+
+
+class SafeHTTPTests(SimpleTestCase):
+    def test_public_addresses(self):
+        for address in ('127.0.0.1', '10.0.0.5', '172.16.0.1', '192.168.1.1', '169.254.169.254', '100.64.0.1',
+                        '0.0.0.0', '::1', 'fe80::1%eth0', 'fd00::1', '::ffff:127.0.0.1', '224.0.0.1', 'not-an-ip'):
+            self.assertFalse(is_public_address(address), address)
+        for address in ('8.8.8.8', '211.249.220.24', '2001:4860:4860::8888'):
+            self.assertTrue(is_public_address(address), address)
+
+    def test_check_url(self):
+        check_url('https://img.example.com/a.jpg')
+        for url in ('ftp://img.example.com/a.jpg', 'http:///a.jpg', 'http://127.0.0.1/a.jpg', 'http://[::1]:8000/'):
+            with self.assertRaises(BlockedAddressError, msg=url):
+                check_url(url)
+
+
+class ImageProbeTests(StubServerMixin, TestCase):
+    def probe(self, *paths):
+        with mock.patch.object(safe_http, 'is_public_address', allow_loopback):
+            counts = image_probe.probe_images([self.base_url + path for path in paths], concurrency=2)
+        return counts, {probe.url[len(self.base_url):]: probe for probe in RoomImageProbe.objects.all()}
+
+    def test_records_status_and_dimensions(self):
+        counts, probes = self.probe('/image.png', '/missing.png', '/moved.png')
+        self.assertEqual(counts, (3, 2))
+        self.assertEqual((probes['/image.png'].width, probes['/image.png'].height), (640, 480))
+        self.assertEqual(probes['/image.png'].content_type, 'image/png')
+        self.assertEqual(probes['/missing.png'].status_code, 404)
+        self.assertEqual(probes['/moved.png'].width, 640)
+
+    def test_results_are_upserted(self):
+        self.probe('/image.png')
+        first = RoomImageProbe.objects.get()
+        self.probe('/image.png')
+        probe = RoomImageProbe.objects.get()
+        self.assertEqual(probe.pk, first.pk)
+        self.assertGreater(probe.checked_at, first.checked_at)
+
+    def test_redirects_are_checked_and_capped(self):
+        _, probes = self.probe('/to-metadata.png', '/loop.png')
+        self.assertIn('169.254.169.254', probes['/to-metadata.png'].error)
+        self.assertEqual(probes['/loop.png'].status_code, 302)
+        self.assertEqual(StubImageHandler.requests.count('/loop.png'), image_probe.PROBE_MAX_REDIRECTS + 1)
+
+    def test_private_addresses_are_not_requested(self):
+        # 패치 없이: IP 리터럴은 check_url이, 이름은 resolver가 막는다
+        port = self.server.server_port
+        counts = image_probe.probe_images([f'http://127.0.0.1:{port}/image.png', f'http://localhost:{port}/image.png'])
+        self.assertEqual(counts, (2, 0))
+        self.assertEqual(StubImageHandler.requests, [])
+        for probe in RoomImageProbe.objects.all():
+            self.assertIn('공인 주소가 아닙니다', probe.error)
+
+    def test_conflict_target_depends_on_backend(self):
+        features = connection.features
+        with mock.patch.object(features, 'supports_update_conflicts_with_target', False):
+            self.assertEqual(image_probe._conflict_target(), {})
+        with mock.patch.object(features, 'supports_update_conflicts_with_target', True):
+            self.assertEqual(image_probe._conflict_target(), {'unique_fields': ['url_hash']})
+
+    def test_worker_probes_after_data_changes_and_survives_errors(self):
+        import_rooms([listing(1, 이미지URL=[self.base_url + '/image.png'])])
+        with mock.patch.object(safe_http, 'is_public_address', allow_loopback):
+            call_command('process_import_jobs', '--once', stdout=io.StringIO())
+        self.assertEqual(RoomImageProbe.objects.get().width, 640)
+        Room.objects.get(external_id=1).save()
+        with mock.patch('rooms.management.commands.process_import_jobs.probe_images', side_effect=RuntimeError('boom')), \
+                self.assertLogs('rooms.management.commands.process_import_jobs', 'ERROR'):
+            call_command('process_import_jobs', '--once', stdout=io.StringIO(), stderr=io.StringIO())
+
+
+class ThumbnailTests(StubServerMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        settings_override = override_settings(THUMBNAIL_CACHE_DIR=cache_dir.name, THUMBNAIL_ORIGIN_FETCH_SLOTS=1)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.room = Room.objects.create(title='썸네일 방')
+
+    def thumb(self, url, allow=True, etag=None, **params):
+        image = RoomImage.objects.create(room=self.room, image_url=url, ordering=0)
+        headers = {'If-None-Match': etag} if etag else None
+        with mock.patch.object(safe_http, 'is_public_address', allow_loopback if allow else is_public_address):
+            return self.client.get(f'/api/rooms/images/{image.pk}/thumb/', {'w': 160, **params}, headers=headers)
+
+    def assertGenericBadGateway(self, response):
+        self.assertEqual(response.status_code, 502)
+        self.assertEqual(response.data, {'detail': '원본 이미지를 가져오지 못했습니다.'})
+
+    def test_renders_and_caches(self):
+        response = self.thumb(self.base_url + '/image.png')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/webp')
+        from PIL import Image
+        self.assertEqual(Image.open(io.BytesIO(response.content)).size, (160, 120))
+        # 다른 형식도 캐시된 원본으로 만든다
+        self.assertEqual(self.thumb(self.base_url + '/image.png', fmt='jpeg').status_code, 200)
+        self.assertEqual(StubImageHandler.requests, ['/image.png'])
+        self.assertEqual(response['Cache-Control'], f'public, max-age={thumbnails.ORIGIN_REVALIDATE_SECONDS}')
+
+    def test_changed_origin_gets_new_etag(self):
+        url = self.base_url + '/image.png'
+        etag = self.thumb(url)['ETag']
+        self.assertEqual(self.thumb(url, etag=etag).status_code, 304)
+        self.assertEqual(StubImageHandler.requests, ['/image.png'])
+
+        with mock.patch.object(thumbnails, 'ORIGIN_REVALIDATE_SECONDS', 0):
+            # 다시 받은 원본이 같으면 ETag도 같다
+            self.assertEqual(self.thumb(url, etag=etag).status_code, 304)
+            with mock.patch.object(StubImageHandler, 'image', png_bytes(320, 320)):
+                response = self.thumb(url, etag=etag)
+        self.assertEqual(StubImageHandler.requests, ['/image.png'] * 3)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        from PIL import Image
+        self.assertEqual(Image.open(io.BytesIO(response.content)).size, (160, 160))
+        # 바뀐 원본의 해시가 기억되어 다시 받지 않는다
+        self.assertEqual(self.thumb(url, etag=response['ETag']).status_code, 304)
+        self.assertEqual(len(StubImageHandler.requests), 3)
+
+    def test_upstream_errors_are_not_leaked(self):
+        with self.assertLogs('rooms.views', 'WARNING') as logs:
+            self.assertGenericBadGateway(self.thumb(self.base_url + '/missing.png'))
+        self.assertIn('404', logs.output[0])
+
+    def test_redirects_to_private_addresses_are_refused(self):
+        with self.assertLogs('rooms.views', 'WARNING') as logs:
+            self.assertGenericBadGateway(self.thumb(self.base_url + '/to-metadata.png'))
+        self.assertIn('169.254.169.254', logs.output[0])
+        self.assertEqual(self.thumb(self.base_url + '/moved.png').status_code, 200)
+
+    def test_private_addresses_are_not_requested(self):
+        port = self.server.server_port
+        with self.assertLogs('rooms.views', 'WARNING'):
+            self.assertGenericBadGateway(self.thumb(f'http://127.0.0.1:{port}/image.png', allow=False))
+            self.assertGenericBadGateway(self.thumb(f'http://localhost:{port}/image.png', allow=False))
+        self.assertEqual(StubImageHandler.requests, [])
+
+    def test_origin_fetches_are_capped(self):
+        with thumbnails._origin_fetch_slot():
+            response = self.thumb(self.base_url + '/image.png')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(StubImageHandler.requests, [])
+        self.assertEqual(self.thumb(self.base_url + '/image.png').status_code, 200)
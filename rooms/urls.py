@@ -2,10 +2,19 @@ from django.urls import path
 from .views import (
     RoomListCreateView,
     RoomDetailView,
+    RoomImageThumbnailView,
     ImportRoomsView,
+    RoomImportJobDetailView,
     ReviewListCreateView,
     RoomSearchView,
     RoomStatsView,
+    RoomPriceStatsView,
+    RoomMapView,
+    RoomClusterView,
+    RoomNearbyView,
+    RoomAutocompleteView,
+    RoomExportView,
+    RoomBatchView,
     RoomRatingStatsView,
 )
 
@@ -13,8 +22,17 @@ urlpatterns = [
     path('', RoomListCreateView.as_view(), name='room-list'),
     path('search/', RoomSearchView.as_view(), name='room-search'),
     path('stats/', RoomStatsView.as_view(), name='room-stats'),
+    path('stats/prices/', RoomPriceStatsView.as_view(), name='room-price-stats'),
+    path('map/', RoomMapView.as_view(), name='room-map'),
+    path('map/clusters/', RoomClusterView.as_view(), name='room-map-clusters'),
+    path('nearby/', RoomNearbyView.as_view(), name='room-nearby'),
+    path('autocomplete/', RoomAutocompleteView.as_view(), name='room-autocomplete'),
+    path('batch/', RoomBatchView.as_view(), name='room-batch'),
+    path('export/', RoomExportView.as_view(), name='room-export'),
     path('<int:pk>/', RoomDetailView.as_view(), name='room-detail'),
+    path('images/<int:pk>/thumb/', RoomImageThumbnailView.as_view(), name='room-image-thumbnail'),
     path('import/', ImportRoomsView.as_view(), name='room-import'),
+    path('import/jobs/<int:pk>/', RoomImportJobDetailView.as_view(), name='room-import-job'),
     path('<int:room_id>/reviews/', ReviewListCreateView.as_view(), name='review-list-create'),
     path('<int:room_id>/reviews/stats/', RoomRatingStatsView.as_view(), name='review-stats'),
 ]
\ No newline at end of file
@@ -0,0 +1,123 @@
+"""
+검색창 자동완성 색인
+
+- 주소의 구/동/단지명, 제목의 지하철역명("중화역3분" -> "중화역")을 뽑아 방 개수와 함께 정렬 배열로 보관
+- prefix 조회는 bisect로 범위를 찾아 방 개수순으로 자르므로 DB를 타지 않는다
+- 색인은 VersionedSnapshot으로 관리되며, 제목/주소가 바뀌어 텍스트 버전(RoomDataVersion.text_version)이 오른 뒤에만 다시 만든다
+  (이미지/가격만 바뀐 임포트나 수정에는 다시 만들지 않는다)
+"""
+import re
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, NamedTuple, Tuple
+
+from rooms.cache import get_text_version
+
+from .snapshot import VersionedSnapshot
+
+_KOREAN_RUN_RE = re.compile(r"[가-힣]+")
+_STATION_PIECE_RE = re.compile(r"[가-힣]*?역")
+MIN_STATION_LENGTH = 3  # "지역", "초역(세권)" 같은 2글자 조각 제외
+
+
+class Suggestion(NamedTuple):
+    text: str
+    kind: str  # gu | dong | complex | station
+    count: int
+
+
+def address_terms(address: str) -> List[Tuple[str, str]]:
+    terms = []
+    for token in (address or "").split():
+        if len(token) < 2:
+            continue
+        if token.endswith("구"):
+            terms.append((token, "gu"))
+        elif token.endswith(("동", "가")):
+            terms.append((token, "dong"))
+        else:
+            terms.append((token, "complex"))
+    return terms
+
+
+def station_candidates(title: str) -> List[Tuple[str, bool]]:
+    """
+    제목의 한글 덩어리를 '역'으로 끝나는 조각으로 나눈다 ("중화역먹골역" -> 중화역, 먹골역).
+    "더블역세권"처럼 '세권'이 바로 이어지는 조각은 수식어일 수 있어 약한 후보(True)로 표시.
+    """
+    pieces = []
+    for run in _KOREAN_RUN_RE.findall(title or ""):
+        for match in _STATION_PIECE_RE.finditer(run):
+            piece = match.group()
+            if len(piece) >= MIN_STATION_LENGTH:
+                pieces.append((piece, run.startswith("세권", match.end())))
+    return pieces
+
+
+def canonical_stations(strong: Counter, weak: Counter) -> Dict[str, str]:
+    """
+    "급상봉역"처럼 앞에 수식어가 붙은 조각을 2회 이상 나온 역명("상봉역")으로 정규화.
+    대응되는 역명이 없으면 짧은 조각(5글자 이하)만 그대로 인정하고, 약한 후보는 버린다.
+    """
+    known = {name for name, count in strong.items() if count >= 2}
+    mapping = {}
+    for piece in set(strong) | set(weak):
+        for start in range(len(piece) - MIN_STATION_LENGTH + 1):
+            if piece[start:] in known:
+                mapping[piece] = piece[start:]
+                break
+        else:
+            if piece in strong and len(piece) <= 5:
+                mapping[piece] = piece
+    return mapping
+
+
+class AutocompleteIndex:
+    def __init__(self, suggestions: List[Suggestion]):
+        self.suggestions = sorted(suggestions, key=lambda s: s.text)
+        self.keys = [s.text for s in self.suggestions]
+
+    def lookup(self, prefix: str, limit: int = 10) -> List[Suggestion]:
+        prefix = prefix.strip()
+        if not prefix:
+            return []
+        matches = []
+        for i in range(bisect_left(self.keys, prefix), len(self.keys)):
+            if not self.keys[i].startswith(prefix):
+                break
+            matches.append(self.suggestions[i])
+        matches.sort(key=lambda s: (-s.count, s.text))
+        return matches[:limit]
+
+
+def build_index(rows) -> AutocompleteIndex:
+    """rows: (title, address) 반복자. 방마다 같은 용어는 한 번만 센다."""
+    term_counts: Counter = Counter()
+    strong_counts: Counter = Counter()
+    weak_counts: Counter = Counter()
+    station_rooms: List[set] = []
+    for title, address in rows:
+        term_counts.update(set(address_terms(address)))
+        pieces = set(station_candidates(title))
+        for piece, weak in pieces:
+            (weak_counts if weak else strong_counts)[piece] += 1
+        station_rooms.append({piece for piece, _ in pieces})
+
+    mapping = canonical_stations(strong_counts, weak_counts)
+    station_counts: Counter = Counter()
+    for pieces in station_rooms:
+        station_counts.update({mapping[p] for p in pieces if p in mapping})
+
+    suggestions = [Suggestion(text, kind, count) for (text, kind), count in term_counts.items()]
+    suggestions += [Suggestion(text, "station", count) for text, count in station_counts.items()]
+    return AutocompleteIndex(suggestions)
+
+
+def _build_from_db() -> AutocompleteIndex:
+    from rooms.models import Room
+
+    return build_index(Room.objects.values_list("title", "address").iterator())
+
+
+# 키 입력마다 호출되므로 버전 확인도 5초에 한 번만
+autocomplete_index = VersionedSnapshot(_build_from_db, check_interval=5, version_getter=get_text_version)
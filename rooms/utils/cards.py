@@ -0,0 +1,51 @@
+"""
+방 카드(목록 화면용 요약) 읽기 전용 렌더러
+
+- bookmarks.RoomCardSerializer와 같은 키 순서/값을 values_list()와 일반 함수로 만든다
+- ModelSerializer 필드 순회/모델 인스턴스 생성 없이 행 튜플을 dict로 바로 바꾸므로 목록이 길수록 차이가 크다
+- 가격 라벨 함수는 RoomCardSerializer도 함께 써서 두 경로의 출력이 항상 같게 유지된다
+- 썸네일은 Room.thumbnail_url(첫 이미지 URL 비정규화 컬럼)에서 읽으므로 이미지 테이블을 조회하지 않는다
+- 카드를 쓰는 목록은 북마크뿐이다. /api/rooms/search/는 카드가 아니라 RoomSerializer 전체(이미지, fields/omit 포함)를
+  돌려주므로 여기로 바꾸면 응답이 달라진다
+"""
+from typing import Optional
+
+# values_list 순서 (가격/관리비 라벨은 card_from_row에서 계산)
+CARD_COLUMNS = ('id', 'title', 'address', 'deposit', 'monthly_fee', 'maintenance_cost', 'thumbnail_url')
+
+
+def format_amount(amount: Optional[int]) -> Optional[str]:
+    return f"{amount:,}" if amount is not None else None
+
+
+def price_label(deposit: Optional[int], monthly_fee: Optional[int]) -> Optional[str]:
+    """'보증금/월세', 한쪽만 있으면 그 값만"""
+    amounts = [format_amount(amount) for amount in (deposit, monthly_fee) if amount is not None]
+    return "/".join(amounts) or None
+
+
+def thumbnail_subquery(outer_ref: str = 'pk'):
+    """방별 첫 이미지 URL 서브쿼리. Room.thumbnail_url 갱신용"""
+    from django.db.models import OuterRef, Subquery
+    from rooms.models import RoomImage
+
+    return Subquery(
+        RoomImage.objects.filter(room_id=OuterRef(outer_ref)).order_by('ordering', 'id').values('image_url')[:1]
+    )
+
+
+def card_from_row(row: tuple) -> dict:
+    """CARD_COLUMNS 순서의 행 튜플 -> 카드 dict"""
+    room_id, title, address, deposit, monthly_fee, maintenance_cost, thumbnail_url = row
+    return {
+        'id': room_id,
+        'title': title,
+        'address': address,
+        'deposit': deposit,
+        'monthly_fee': monthly_fee,
+        'maintenance_cost': maintenance_cost,
+        'price_label': price_label(deposit, monthly_fee),
+        'maintenance_label': format_amount(maintenance_cost),
+        'thumbnail_url': thumbnail_url,
+    }
+
@@ -0,0 +1,105 @@
+"""
+지도 클러스터 사전 집계
+
+- 줌 단계(geohash 자릿수)별로 셀마다 방 개수, 중심점, 월세 최소/중앙값을 RoomCluster에 저장
+- 임포트/수정으로 바뀐 방의 (이전, 이후) geohash가 속한 셀만 다시 계산한다
+- 중앙값은 합칠 수 없는 값이라 바뀐 셀마다 그 셀에 속한 방을 다시 읽어 계산한다 (단계마다 자기 자릿수의 셀 범위만 읽음)
+"""
+import statistics
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.db import transaction
+from django.db.models import Q
+
+from .geo import cell_range, precision_for_zoom
+
+CLUSTER_PRECISIONS = (3, 4, 5, 6)
+
+Row = Tuple[str, float, float, Optional[int]]  # (geohash, latitude, longitude, monthly_fee)
+
+
+def cluster_precision_for_zoom(zoom: int) -> int:
+    return max(CLUSTER_PRECISIONS[0], min(precision_for_zoom(zoom), CLUSTER_PRECISIONS[-1]))
+
+
+def build_cluster_rows(rows: Iterable[Row], cells: Optional[Dict[int, Set[str]]] = None) -> List[dict]:
+    """
+    방 행들을 셀별로 집계한다. cells가 주어지면 해당 셀만 계산.
+    반환값은 RoomCluster 생성용 dict 목록.
+    """
+    buckets: Dict[Tuple[int, str], list] = defaultdict(lambda: [0, 0.0, 0.0, []])
+    for geohash, lat, lng, fee in rows:
+        if not geohash:
+            continue
+        for precision in CLUSTER_PRECISIONS:
+            cell = geohash[:precision]
+            if cells is not None and cell not in cells.get(precision, ()):
+                continue
+            bucket = buckets[(precision, cell)]
+            bucket[0] += 1
+            bucket[1] += lat
+            bucket[2] += lng
+            if fee is not None:
+                bucket[3].append(fee)
+
+    clusters = []
+    for (precision, cell), (count, lat_sum, lng_sum, fees) in buckets.items():
+        clusters.append({
+            'precision': precision,
+            'cell': cell,
+            'count': count,
+            'latitude': lat_sum / count,
+            'longitude': lng_sum / count,
+            'min_monthly_fee': min(fees) if fees else None,
+            'median_monthly_fee': int(round(statistics.median(fees))) if fees else None,
+        })
+    return clusters
+
+
+def affected_cells(geohashes: Iterable[Optional[str]]) -> Dict[int, Set[str]]:
+    cells: Dict[int, Set[str]] = defaultdict(set)
+    for geohash in geohashes:
+        if geohash:
+            for precision in CLUSTER_PRECISIONS:
+                cells[precision].add(geohash[:precision])
+    return cells
+
+
+def refresh_clusters(geohashes: Iterable[Optional[str]]) -> int:
+    """바뀐 방들의 geohash(이전/이후 모두)를 받아 해당 셀의 집계만 다시 쓴다. 갱신된 셀 수를 반환."""
+    from rooms.models import Room, RoomCluster
+
+    cells = affected_cells(geohashes)
+    if not cells:
+        return 0
+
+    # 단계마다 그 단계의 바뀐 셀에 속한 방만 읽는다 (가장 큰 셀 하나로 모든 단계를 계산하면 방 하나가 바뀔 때도
+    # 3자리 셀(약 156km) 전체를 읽게 된다). 3자리 셀의 월세 중앙값은 합칠 수 없는 값이라 그 셀의 방은 여전히 읽어야 한다
+    clusters = []
+    for precision, precision_cells in cells.items():
+        in_cells = Q()
+        for cell in precision_cells:
+            in_cells |= Q(geohash__range=cell_range(cell))
+        rows = Room.objects.filter(in_cells).values_list('geohash', 'latitude', 'longitude', 'monthly_fee').iterator()
+        clusters.extend(build_cluster_rows(rows, {precision: precision_cells}))
+
+    stale = Q()
+    for precision, precision_cells in cells.items():
+        stale |= Q(precision=precision, cell__in=precision_cells)
+    with transaction.atomic():
+        RoomCluster.objects.filter(stale).delete()
+        RoomCluster.objects.bulk_create([RoomCluster(**c) for c in clusters], batch_size=1000)
+    return sum(len(c) for c in cells.values())
+
+
+def rebuild_clusters() -> int:
+    """전체 재계산. 생성된 클러스터 수를 반환."""
+    from rooms.models import Room, RoomCluster
+
+    rows = Room.objects.exclude(geohash=None).values_list('geohash', 'latitude', 'longitude', 'monthly_fee').iterator()
+    clusters = build_cluster_rows(rows)
+    with transaction.atomic():
+        RoomCluster.objects.all().delete()
+        RoomCluster.objects.bulk_create([RoomCluster(**c) for c in clusters], batch_size=1000)
+    return len(clusters)
@@ -0,0 +1,84 @@
+"""
+방 데이터 스트리밍 내보내기 (NDJSON/CSV, 임포트 결과 JSON)
+
+- 전체를 메모리에 올리지 않도록 id keyset으로 chunk_size개씩 읽고, 이미지는 chunk 단위로 prefetch 한다
+- MySQL 드라이버는 .iterator()여도 결과 전체를 클라이언트에 버퍼링하므로, 쿼리 자체를 chunk로 나눈다
+- 행 직렬화는 RoomSerializer를 그대로 써서 목록/상세 API와 필드가 같다
+"""
+import csv
+import json
+from typing import Iterable, Iterator, List, Optional
+
+from django.db.models import Prefetch
+
+EXPORT_CHUNK_SIZE = 1000
+IMAGE_URL_SEPARATOR = '|'
+
+
+def iter_room_chunks(chunk_size: int = EXPORT_CHUNK_SIZE, ids: Optional[Iterable[int]] = None) -> Iterator[List[dict]]:
+    """RoomSerializer로 직렬화한 방 dict를 chunk 단위로 id 순서대로 내보낸다. ids를 주면 그 방들만 (중복 제거)"""
+    from rooms.models import Room, RoomImage
+    from rooms.serializers import RoomSerializer
+
+    images = Prefetch('images', queryset=RoomImage.objects.order_by('ordering', 'id'))
+    if ids is not None:
+        ordered = sorted(set(ids))
+        for start in range(0, len(ordered), chunk_size):
+            rooms = list(
+                Room.objects.filter(id__in=ordered[start:start + chunk_size]).order_by('id').prefetch_related(images)
+            )
+            if rooms:
+                yield RoomSerializer(rooms, many=True).data
+        return
+
+    last_id = 0
+    while True:
+        rooms = list(
+            Room.objects.filter(id__gt=last_id).order_by('id').prefetch_related(images)[:chunk_size]
+        )
+        if not rooms:
+            return
+        yield RoomSerializer(rooms, many=True).data
+        last_id = rooms[-1].id
+
+
+def ndjson_stream(chunks: Iterator[List[dict]]) -> Iterator[str]:
+    for rows in chunks:
+        yield ''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in rows)
+
+
+def json_list_stream(head: dict, key: str, chunks: Iterator[List[dict]]) -> Iterator[str]:
+    """{**head, key: [행...]} 모양의 JSON 객체 하나를 chunk 단위로 흘려보낸다 (DRF JSONRenderer와 같은 compact 형식)"""
+    def dumps(value):
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+    yield dumps(head)[:-1] + (',' if head else '') + dumps(key) + ':['
+    first = True
+    for rows in chunks:
+        if not rows:
+            continue
+        yield ('' if first else ',') + ','.join(dumps(row) for row in rows)
+        first = False
+    yield ']}'
+
+
+class _Echo:
+    """csv.writer가 쓴 한 줄을 그대로 돌려주는 버퍼"""
+    def write(self, value):
+        return value
+
+
+def csv_stream(chunks: Iterator[List[dict]]) -> Iterator[str]:
+    """images는 image_urls 한 열에 ordering 순으로 '|'로 이어 붙인다"""
+    from rooms.serializers import RoomSerializer
+
+    columns = [f for f in RoomSerializer.Meta.fields if f != 'images'] + ['image_urls']
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for rows in chunks:
+        lines = []
+        for row in rows:
+            row = dict(row)
+            row['image_urls'] = IMAGE_URL_SEPARATOR.join(image['image_url'] for image in row.pop('images'))
+            lines.append(writer.writerow(['' if row[c] is None else row[c] for c in columns]))
+        yield ''.join(lines)
@@ -0,0 +1,104 @@
+"""
+지도 조회용 geohash 유틸
+
+- Room.geohash에 9자리(약 5m 격자) geohash를 저장하고 인덱스를 건다
+- 뷰포트(bbox)는 줌에 맞는 자릿수의 셀 몇 개로 덮고, 셀마다 geohash 인덱스 범위 스캔(BETWEEN)으로 조회
+"""
+from typing import List, Optional, Set, Tuple
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+STORED_PRECISION = 9
+MAX_VIEWPORT_CELLS = 16
+
+# 지도 줌 레벨 -> 셀 자릿수 (5자리 ≈ 4.9km, 6자리 ≈ 1.2km, 7자리 ≈ 150m)
+_ZOOM_PRECISION = ((8, 3), (10, 4), (12, 5), (14, 6))
+_MAX_ZOOM_PRECISION = 7
+
+
+def encode_geohash(latitude: Optional[float], longitude: Optional[float], precision: int = STORED_PRECISION) -> Optional[str]:
+    if latitude is None or longitude is None:
+        return None
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars: List[str] = []
+    bits, bit_count, even = 0, 0, True
+    while len(chars) < precision:
+        rng, value = (lng_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """(위도 높이, 경도 너비) 도 단위"""
+    lng_bits = (precision * 5 + 1) // 2
+    lat_bits = precision * 5 // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def precision_for_zoom(zoom: int) -> int:
+    for max_zoom, precision in _ZOOM_PRECISION:
+        if zoom <= max_zoom:
+            return precision
+    return _MAX_ZOOM_PRECISION
+
+
+def covering_cells(min_lat: float, min_lng: float, max_lat: float, max_lng: float, precision: int) -> Set[str]:
+    """bbox를 빠짐없이 덮는 precision 자리 geohash 셀 집합"""
+    height, width = cell_size(precision)
+    cells: Set[str] = set()
+    lat = min_lat
+    while True:
+        lng = min_lng
+        while True:
+            cells.add(encode_geohash(min(lat, max_lat), min(lng, max_lng), precision))
+            if lng >= max_lng:
+                break
+            lng += width
+        if lat >= max_lat:
+            break
+        lat += height
+    return cells
+
+
+def viewport_cells(min_lat: float, min_lng: float, max_lat: float, max_lng: float, zoom: int) -> Tuple[Set[str], int]:
+    """줌에 맞는 자릿수로 덮되, 셀이 너무 많으면 한 자리씩 줄인다. (셀 집합, 자릿수)"""
+    precision = precision_for_zoom(zoom)
+    while True:
+        height, width = cell_size(precision)
+        estimated = ((max_lat - min_lat) / height + 2) * ((max_lng - min_lng) / width + 2)
+        if precision == 1 or estimated <= MAX_VIEWPORT_CELLS * 4:
+            cells = covering_cells(min_lat, min_lng, max_lat, max_lng, precision)
+            if precision == 1 or len(cells) <= MAX_VIEWPORT_CELLS:
+                return cells, precision
+        precision -= 1
+
+
+def cell_range(cell: str) -> Tuple[str, str]:
+    """prefix 셀에 속하는 geohash의 (최소, 최대) 문자열. LIKE 대신 범위 조건으로 인덱스를 타게 한다"""
+    return cell, cell + _BASE32[-1] * (STORED_PRECISION - len(cell))
+
+
+def parse_bbox(raw: str) -> Tuple[float, float, float, float]:
+    """'min_lng,min_lat,max_lng,max_lat' -> (min_lat, min_lng, max_lat, max_lng)"""
+    if not raw:
+        raise ValueError("bbox 파라미터가 필요합니다.")
+    parts = [float(p) for p in raw.split(",")]
+    if len(parts) != 4:
+        raise ValueError("bbox는 min_lng,min_lat,max_lng,max_lat 4개 값이어야 합니다.")
+    min_lng, min_lat, max_lng, max_lat = parts
+    if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lng <= max_lng <= 180):
+        raise ValueError("bbox 범위가 올바르지 않습니다.")
+    return min_lat, min_lng, max_lat, max_lng
@@ -0,0 +1,197 @@
+"""
+방 이미지 URL 점검 (상태 코드, 전체 크기, 가로/세로)
+
+- aiohttp로 URL마다 앞부분만 GET(Range: bytes=0-)해서 Pillow ImageFile.Parser에 흘려 넣고, 헤더가 풀리는 즉시 가로/세로를 읽는다.
+  전체 크기는 Content-Range(206) 또는 Content-Length(Range를 무시한 200)에서 얻는다
+- 동시 요청 수는 작업 코루틴 개수(concurrency)로, 호스트별 연결 수는 TCPConnector(limit_per_host)로 제한한다
+- ORM은 비동기 문맥에서 쓸 수 없으므로 PROBE_BATCH_SIZE개씩 asyncio.run()으로 점검한 뒤 동기 코드에서 한 번에 upsert 한다
+- 결과는 RoomImageProbe(URL 해시 기준)에 남기고, checked_at이 PROBE_STALE_AFTER보다 오래된 URL만 다시 점검한다
+- URL은 인증 없는 임포트 API로 들어오므로 공인 주소가 아닌 곳에는 연결하지 않는다 (safe_http).
+  리다이렉트는 직접 따라가며 hop마다 같은 검사를 한다
+"""
+import asyncio
+import hashlib
+import re
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from django.utils import timezone
+
+from .room_importer import chunked
+from .safe_http import BlockedAddressError, PublicResolver, check_url
+
+PROBE_CONCURRENCY = 32
+PROBE_PER_HOST = 8
+PROBE_TIMEOUT_SECONDS = 10
+PROBE_STALE_AFTER = timedelta(days=7)
+PROBE_BATCH_SIZE = 500
+PROBE_MAX_REDIRECTS = 3
+_REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+# 가로/세로를 찾을 때까지 읽는 최대 바이트 (JPEG는 EXIF 뒤에 크기가 오므로 넉넉히)
+HEADER_BYTES = 64 * 1024
+_READ_CHUNK = 8 * 1024
+_CONTENT_RANGE_TOTAL = re.compile(r"/(\d+)\s*$")
+
+
+def url_hash(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ProbeResult:
+    url: str
+    status_code: Optional[int] = None
+    content_type: str = ""
+    content_length: Optional[int] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code is not None and 200 <= self.status_code < 300 and self.width is not None
+
+
+def _total_length(response) -> Optional[int]:
+    if response.status == 206:
+        match = _CONTENT_RANGE_TOTAL.search(response.headers.get("Content-Range", ""))
+        return int(match.group(1)) if match else None
+    return response.content_length
+
+
+async def _read_header(response, result: ProbeResult) -> None:
+    from PIL import ImageFile
+
+    result.status_code = response.status
+    result.content_type = response.headers.get("Content-Type", "")[:100]
+    result.content_length = _total_length(response)
+    if response.status >= 300:
+        return
+    parser = ImageFile.Parser()
+    read = 0
+    async for data in response.content.iter_chunked(_READ_CHUNK):
+        parser.feed(data)
+        read += len(data)
+        if parser.image is not None or read >= HEADER_BYTES:
+            break
+    # 헤더만 읽었으면 나머지 본문은 받지 않는다 (206이면 연결을 재사용하고, 200이면 연결을 닫는다)
+    if parser.image is not None:
+        result.width, result.height = parser.image.size
+    else:
+        result.error = "이미지 형식을 알 수 없습니다"
+
+
+async def _probe(session, url: str) -> ProbeResult:
+    import aiohttp
+    from yarl import URL
+
+    result = ProbeResult(url=url)
+    target = url
+    try:
+        for _ in range(PROBE_MAX_REDIRECTS + 1):
+            check_url(target)
+            async with session.get(target, headers={"Range": f"bytes=0-{HEADER_BYTES - 1}"}, allow_redirects=False) as response:
+                location = response.headers.get("Location")
+                if response.status not in _REDIRECT_STATUSES or not location:
+                    await _read_header(response, result)
+                    return result
+            target = str(response.url.join(URL(location)))
+        result.status_code = response.status
+        result.error = "리다이렉트가 너무 많습니다"
+    except BlockedAddressError as e:
+        result.error = str(e)[:255]
+    except asyncio.TimeoutError:
+        result.error = "timeout"
+    except aiohttp.ClientError as e:
+        result.error = f"{type(e).__name__}: {e}"[:255]
+    except (OSError, SyntaxError, ValueError) as e:
+        # Pillow 헤더 해석 실패, 잘못된 Location
+        result.error = f"{type(e).__name__}: {e}"[:255]
+    return result
+
+
+async def _probe_batch(urls: List[str], concurrency: int, per_host: int, timeout: float) -> List[ProbeResult]:
+    import aiohttp
+
+    results: List[ProbeResult] = []
+    pending = iter(urls)
+    resolver = PublicResolver()
+    connector = aiohttp.TCPConnector(limit=concurrency, limit_per_host=per_host, resolver=resolver)
+    try:
+        async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+            async def worker():
+                # 작업 코루틴들이 같은 이터레이터에서 다음 URL을 가져가므로 동시에 도는 요청은 concurrency개 이하
+                for url in pending:
+                    results.append(await _probe(session, url))
+
+            await asyncio.gather(*(worker() for _ in range(min(concurrency, len(urls)))))
+    finally:
+        # 커넥터는 밖에서 준 resolver를 닫지 않는다
+        await resolver.close()
+    return results
+
+
+def stale_image_urls(stale_after: timedelta = PROBE_STALE_AFTER) -> List[str]:
+    """점검 기록이 없거나 오래된 RoomImage URL (중복 제거)"""
+    from rooms.models import RoomImage, RoomImageProbe
+
+    fresh_since = timezone.now() - stale_after
+    urls = RoomImage.objects.exclude(image_url='').order_by().values_list('image_url', flat=True).distinct()
+    stale = []
+    for chunk in chunked(urls.iterator(chunk_size=PROBE_BATCH_SIZE), PROBE_BATCH_SIZE):
+        hashes = {url_hash(url): url for url in chunk}
+        fresh = set(
+            RoomImageProbe.objects.filter(url_hash__in=list(hashes), checked_at__gte=fresh_since)
+            .values_list('url_hash', flat=True)
+        )
+        stale.extend(url for digest, url in hashes.items() if digest not in fresh)
+    return stale
+
+
+def _conflict_target() -> dict:
+    """upsert 충돌 대상 인자. MySQL은 대상을 지정할 수 없어(ON DUPLICATE KEY UPDATE) 생략하며, id는 보내지 않으므로 url_hash에서만 충돌한다"""
+    from django.db import connections
+    from rooms.models import RoomImageProbe
+
+    if connections[RoomImageProbe.objects.db].features.supports_update_conflicts_with_target:
+        return {'unique_fields': ['url_hash']}
+    return {}
+
+
+def save_probe_results(results: List[ProbeResult]) -> None:
+    from rooms.models import RoomImageProbe
+
+    now = timezone.now()
+    RoomImageProbe.objects.bulk_create(
+        [
+            RoomImageProbe(
+                url_hash=url_hash(r.url), url=r.url, status_code=r.status_code, content_type=r.content_type,
+                content_length=r.content_length, width=r.width, height=r.height, error=r.error, checked_at=now,
+            )
+            for r in results
+        ],
+        batch_size=PROBE_BATCH_SIZE,
+        update_conflicts=True,
+        update_fields=['status_code', 'content_type', 'content_length', 'width', 'height', 'error', 'checked_at'],
+        **_conflict_target(),
+    )
+
+
+def probe_images(
+    urls: Iterable[str],
+    concurrency: int = PROBE_CONCURRENCY,
+    per_host: int = PROBE_PER_HOST,
+    timeout: float = PROBE_TIMEOUT_SECONDS,
+    on_batch: Optional[Callable[[List[ProbeResult]], None]] = None,
+) -> Tuple[int, int]:
+    """URL들을 배치 단위로 점검하고 저장한다. (점검 수, 정상 수)"""
+    probed = ok = 0
+    for batch in chunked(urls, PROBE_BATCH_SIZE):
+        results = asyncio.run(_probe_batch(batch, concurrency, per_host, timeout))
+        save_probe_results(results)
+        probed += len(results)
+        ok += sum(result.ok for result in results)
+        if on_batch is not None:
+            on_batch(results)
+    return probed, ok
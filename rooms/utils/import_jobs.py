@@ -0,0 +1,90 @@
+"""
+파일 업로드 임포트 작업(RoomImportJob) 처리
+
+- 업로드 요청은 파일만 저장하고 끝나며, process_import_jobs 워커가 여기 함수로 작업을 하나씩 가져가 처리한다
+- 작업 가져가기는 (상태, updated_at) 비교 후 갱신(compare-and-set)이라 워커가 여러 개여도 같은 작업을 두 번 잡지 않는다
+- 바깥 트랜잭션 없이 import_rooms를 돌리므로 chunk마다 커밋되고, chunk가 끝날 때마다 진행 건수를 기록한다
+  (요청 스레드/타임아웃과 무관하게 큰 파일도 처리되고, 중간에 실패해도 앞 chunk는 반영된 상태로 남는다)
+- 값이 잘못되어 저장에 실패한 항목은 건너뛰고 failed로 센다. 파일 형식 오류나 DB 오류(연결/락 등)는 작업 전체를 failed로 끝낸다
+- 원본 파일은 ROOM_IMPORT_UPLOAD_ROOT(공개 경로 밖)에 있고, 작업이 끝나면(성공/실패) 지운다
+- 처리 중 상태로 JOB_STALE_AFTER 넘게 진행이 없으면 워커가 죽은 것으로 보고 다른 워커가 처음부터 다시 처리한다
+  (external_id 기준 upsert라 다시 넣어도 결과는 같다)
+"""
+from datetime import timedelta
+from typing import Optional, Set
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .json_stream import JSONStreamError, iter_json_items
+from .room_importer import ImportResult, finalize_import, import_rooms
+
+JOB_STALE_AFTER = timedelta(minutes=10)
+
+
+def claim_next_job():
+    """대기 중(또는 멈춘) 작업 하나를 처리 중으로 바꾸고 돌려준다. 없으면 None"""
+    from rooms.models import RoomImportJob
+
+    Status = RoomImportJob.Status
+    candidates = RoomImportJob.objects.filter(
+        Q(status=Status.PENDING) | Q(status=Status.RUNNING, updated_at__lt=timezone.now() - JOB_STALE_AFTER)
+    ).order_by('created_at', 'id')
+    for job in candidates[:10]:
+        now = timezone.now()
+        claimed = RoomImportJob.objects.filter(pk=job.pk, status=job.status, updated_at=job.updated_at).update(
+            status=Status.RUNNING, started_at=now, updated_at=now, finished_at=None,
+            processed=0, created=0, updated=0, unchanged=0, failed=0, error='',
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+    return None
+
+
+def run_import_job(job) -> None:
+    """작업 파일을 chunk 단위로 임포트하며 진행 건수를 기록한다. 예외는 작업 상태로 남기고 올리지 않는다"""
+    from rooms.models import RoomImportJob
+
+    Status = RoomImportJob.Status
+    progress = ImportResult()
+    processed = 0
+    geohashes: Set[Optional[str]] = set()
+
+    def record(chunk: ImportResult) -> None:
+        # processed는 읽은 항목 수 (같은 매물ID가 여러 번 오면 created/updated에는 한 번만 센다)
+        nonlocal processed
+        processed += len(chunk.room_ids) + chunk.failed
+        progress.created += chunk.created
+        progress.updated += chunk.updated
+        progress.unchanged += chunk.unchanged
+        progress.failed += chunk.failed
+        geohashes.update(chunk.geohashes)
+        RoomImportJob.objects.filter(pk=job.pk).update(
+            processed=processed,
+            created=progress.created,
+            updated=progress.updated,
+            unchanged=progress.unchanged,
+            failed=progress.failed,
+            updated_at=timezone.now(),
+        )
+
+    status, error = Status.SUCCEEDED, ''
+    try:
+        with job.source.open('rb') as f:
+            import_rooms(iter_json_items(f), on_chunk=record, finalize=False, isolate_failures=True)
+    except JSONStreamError as e:
+        status, error = Status.FAILED, f"입력 파싱 오류: {e}"
+    except Exception as e:
+        status, error = Status.FAILED, f"{type(e).__name__}: {e}"
+    finally:
+        # 실패했어도 이미 커밋된 chunk가 있으면 클러스터/데이터 버전은 맞춰 둔다
+        if geohashes or progress.created or progress.updated:
+            finalize_import(geohashes)
+
+    # 끝난 작업의 원본은 남기지 않는다 (실패했으면 고친 파일을 다시 올려 새 작업으로 넣는다)
+    job.source.delete(save=False)
+    now = timezone.now()
+    RoomImportJob.objects.filter(pk=job.pk).update(
+        status=status, error=error, finished_at=now, updated_at=now, source='',
+    )
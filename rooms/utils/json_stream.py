@@ -0,0 +1,180 @@
+"""
+임포트용 스트리밍 JSON 파서
+
+- 파일 전체를 읽지 않고 고정 크기 버퍼로 조금씩 읽으며 매물(객체)을 하나씩 돌려준다
+- 지원 형식
+  - 최상위 배열: [{...}, {...}]
+  - 래퍼 객체: {"items": [...]} / {"data": [...]} / {"results": [...]} (다른 키는 값을 읽고 버림)
+  - NDJSON: 한 줄에 객체 하나
+- 바이트는 증분 UTF-8 디코더로 풀고(BOM 허용), 값 하나는 json.JSONDecoder.raw_decode로 파싱한다
+  버퍼 끝에서 값이 잘렸으면 더 읽어서 다시 시도한다. 다시 읽을 때마다 읽는 양을 남은 버퍼만큼 늘려 재파싱 비용은 선형이고,
+  값 하나가 MAX_VALUE_CHARS를 넘으면(잘못된/잘린 값이 파일 끝까지 이어지는 경우 등) 오류로 끝내 메모리가 제한된다
+"""
+import codecs
+import json
+from typing import Any, Iterator, Optional
+
+from .room_importer import KOREAN_KEY_MAP
+
+READ_SIZE = 64 * 1024
+# 매물 하나(JSON 값 하나)의 최대 크기 (문자 수). 실제 매물은 수 KB
+MAX_VALUE_CHARS = 4 * 1024 * 1024
+WRAPPER_KEYS = ("items", "data", "results")
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789.eE+-"
+
+
+class JSONStreamError(ValueError):
+    pass
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class _Reader:
+    def __init__(self, stream, read_size: int):
+        self._stream = stream
+        self._read_size = read_size
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._json = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, size: int = 0) -> bool:
+        """버퍼에 (size와 read_size 중 큰 만큼) 더 읽어 붙인다. 더 읽을 게 없으면 False"""
+        if self.eof:
+            return False
+        data = self._stream.read(max(size, self._read_size))
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        try:
+            if not data:
+                self.eof = True
+                self.buf = self.buf[self.pos:] + self._decoder.decode(b"", final=True)
+            else:
+                self.buf = self.buf[self.pos:] + self._decoder.decode(data)
+        except UnicodeDecodeError:
+            raise JSONStreamError("UTF-8로 인코딩된 JSON이어야 합니다.") from None
+        self.pos = 0
+        return True
+
+    def peek(self) -> Optional[str]:
+        """공백을 건너뛴 다음 문자 (끝이면 None)"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return None
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise JSONStreamError(f"'{char}'가 필요합니다 (위치 근처: {self.buf[self.pos:self.pos + 20]!r})")
+        self.pos += 1
+
+    def _fill_more(self) -> bool:
+        """값이 버퍼 끝에 걸쳐 더 읽는다. 값이 MAX_VALUE_CHARS를 넘으면 오류"""
+        pending = len(self.buf) - self.pos
+        if pending > MAX_VALUE_CHARS:
+            raise JSONStreamError(f"매물 하나가 너무 크거나 JSON 형식이 잘못되었습니다 (최대 {MAX_VALUE_CHARS}자).")
+        # 남은 만큼 더 읽어 재시도 횟수를 로그 수준으로 줄인다 (64KB씩이면 큰 값은 재파싱이 제곱으로 늘어난다)
+        return self._fill(pending)
+
+    def value(self) -> Any:
+        """다음 JSON 값 하나. 버퍼 끝에 걸친 값은 더 읽어서 다시 파싱"""
+        self.peek()
+        while True:
+            try:
+                obj, end = self._json.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                if self._fill_more():
+                    continue
+                raise JSONStreamError(f"JSON 파싱 오류: {e.msg}") from None
+            # 숫자는 버퍼 끝에서 잘려도("19." / "1e") 앞부분만으로 파싱에 성공하므로, 이어질 수 있으면 더 읽어 확인
+            if not self.eof and (end == len(self.buf) or (_is_number(obj) and self.buf[end] in _NUMBER_CHARS)):
+                self._fill_more()
+                continue
+            self.pos = end
+            return obj
+
+
+def _array_items(reader: _Reader) -> Iterator[Any]:
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.value()
+        char = reader.peek()
+        reader.pos += 1
+        if char == "]":
+            return
+        if char != ",":
+            raise JSONStreamError("배열 항목 사이에는 ','가 필요합니다.")
+
+
+def _object_or_wrapper(reader: _Reader) -> Iterator[Any]:
+    """
+    최상위 '{'. 래퍼 키(items/data/results)의 배열을 만나면 그 항목을 흘려보낸다.
+    래퍼 없이 객체가 끝나고 다음 객체가 이어지면 NDJSON으로 보고 객체를 하나씩 돌려준다.
+    """
+    reader.expect("{")
+    first: dict = {}
+    streamed = False
+    if reader.peek() == "}":
+        reader.pos += 1
+    else:
+        while True:
+            key = reader.value()
+            if not isinstance(key, str):
+                raise JSONStreamError("객체 키는 문자열이어야 합니다.")
+            reader.expect(":")
+            if key in WRAPPER_KEYS and not streamed and reader.peek() == "[":
+                yield from _array_items(reader)
+                streamed = True
+            else:
+                first[key] = reader.value()
+            char = reader.peek()
+            reader.pos += 1
+            if char == "}":
+                break
+            if char != ",":
+                raise JSONStreamError("객체 항목 사이에는 ','가 필요합니다.")
+    if streamed:
+        return
+    if reader.peek() is None and first.keys() & KOREAN_KEY_MAP.keys():
+        # 매물 하나짜리 NDJSON. 매물 키가 하나도 없으면({"rooms": [...]}처럼 래퍼 키를 잘못 쓴 경우 등) 빈 방을 만들지 않게 형식 오류로 본다
+        yield first
+        return
+    if reader.peek() != "{":
+        raise JSONStreamError("리스트 형태의 JSON 또는 items/data/results 키로 리스트를 전달해주세요.")
+
+    # NDJSON: 첫 객체는 위에서 키 단위로 읽었으므로 그대로 내보내고 나머지는 값 단위로 읽는다
+    yield first
+    while reader.peek() is not None:
+        yield reader.value()
+
+
+def iter_json_items(stream, read_size: int = READ_SIZE) -> Iterator[dict]:
+    """
+    바이너리(또는 텍스트) 파일 객체에서 매물 dict를 하나씩 읽는다.
+    형식이 잘못되면 JSONStreamError (일부 항목은 이미 나온 뒤일 수 있다)
+    """
+    reader = _Reader(stream, read_size)
+    first = reader.peek()
+    if first == "[":
+        items = _array_items(reader)
+    elif first == "{":
+        items = _object_or_wrapper(reader)
+    else:
+        raise JSONStreamError("리스트 형태의 JSON 또는 items/data/results 키로 리스트를 전달해주세요.")
+
+    for item in items:
+        if not isinstance(item, dict):
+            raise JSONStreamError("각 매물은 JSON 객체여야 합니다.")
+        yield item
+    if first == "[" and reader.peek() is not None:
+        raise JSONStreamError("배열 뒤에 불필요한 데이터가 있습니다.")
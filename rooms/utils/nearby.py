@@ -0,0 +1,69 @@
+"""
+근처 방 찾기 (k-최근접)
+
+- 모든 방의 위경도를 NumPy 배열로 메모리에 들고 haversine 거리를 한 번에 계산한다
+- 배열은 VersionedSnapshot으로 관리되어 방 데이터가 바뀐 뒤 첫 요청에서 다시 만들어진다
+"""
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .snapshot import VersionedSnapshot
+
+EARTH_RADIUS_M = 6_371_000.0
+
+
+class RoomCoordinates(NamedTuple):
+    ids: np.ndarray      # id 오름차순 정렬 (searchsorted용)
+    lat: np.ndarray      # radian
+    lng: np.ndarray      # radian
+    cos_lat: np.ndarray
+
+
+def _build_coordinates() -> RoomCoordinates:
+    from rooms.models import Room
+
+    rows = list(
+        Room.objects.exclude(latitude=None).exclude(longitude=None)
+        .order_by('id').values_list('id', 'latitude', 'longitude')
+    )
+    data = np.array(rows, dtype=np.float64).reshape(-1, 3)
+    lat = np.radians(data[:, 1])
+    return RoomCoordinates(
+        ids=data[:, 0].astype(np.int64),
+        lat=lat,
+        lng=np.radians(data[:, 2]),
+        cos_lat=np.cos(lat),
+    )
+
+
+coordinates = VersionedSnapshot(_build_coordinates)
+
+
+def room_position(coords: RoomCoordinates, room_id: int) -> Optional[Tuple[float, float]]:
+    """스냅샷에서 방의 (위도, 경도)를 찾는다. 좌표가 없는 방이면 None"""
+    idx = int(np.searchsorted(coords.ids, room_id))
+    if idx >= len(coords.ids) or coords.ids[idx] != room_id:
+        return None
+    return float(np.degrees(coords.lat[idx])), float(np.degrees(coords.lng[idx]))
+
+
+def nearest_rooms(coords: RoomCoordinates, latitude: float, longitude: float, k: int,
+                  exclude_id: Optional[int] = None) -> List[Tuple[int, float]]:
+    """(room_id, 거리 m) 목록을 가까운 순으로 반환"""
+    if not len(coords.ids) or k <= 0:
+        return []
+    lat0, lng0 = np.radians(latitude), np.radians(longitude)
+    a = (np.sin((coords.lat - lat0) / 2) ** 2
+         + np.cos(lat0) * coords.cos_lat * np.sin((coords.lng - lng0) / 2) ** 2)
+    distances = 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+    if exclude_id is not None:
+        distances[coords.ids == exclude_id] = np.inf
+
+    k = min(k, len(distances))
+    nearest = np.argpartition(distances, k - 1)[:k]
+    nearest = nearest[np.argsort(distances[nearest], kind='stable')]
+    return [
+        (int(coords.ids[i]), float(distances[i]))
+        for i in nearest if np.isfinite(distances[i])
+    ]
@@ -0,0 +1,197 @@
+"""
+import_rooms --workers 용 다중 프로세스 임포트
+
+- 메인 프로세스는 파일을 스트리밍으로 읽어 매물ID % workers로 파티션을 나누고, chunk_size개가 모이면 그 파티션 워커의 큐에 넣는다
+  (큐 깊이가 정해져 있어 메인이 워커보다 너무 앞서 읽지 않는다)
+- 워커는 자기 파티션의 chunk를 받은 순서대로 정규화하고 upsert한다(import_chunk). chunk마다 자기 트랜잭션으로 커밋된다.
+  같은 매물ID는 항상 같은 워커가 입력 순서대로 처리하므로 "뒤의 값이 이긴다"가 유지되고, 워커끼리 같은 행을 두고 다투지 않는다
+- 실패한 chunk는 한 번 더 시도하고(락 대기 초과/교착 등), 그래도 실패하면 원본 항목을 NDJSON 파일로 남긴다.
+  나머지 chunk는 이미 커밋되었으므로 그 파일만 import_rooms로 다시 넣으면 된다
+- 지도 클러스터/데이터 버전 갱신은 모든 워커가 끝난 뒤 메인에서 한 번만 한다
+"""
+import json
+import multiprocessing
+import os
+import queue
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .room_importer import IMPORT_CHUNK_SIZE, ImportResult, finalize_import, import_chunk, normalize_item
+
+CHUNK_ATTEMPTS = 2
+RETRY_DELAY_SECONDS = 1.0
+# 워커별로 쌓아 둘 수 있는 chunk 수
+QUEUE_DEPTH = 2
+_POLL_SECONDS = 1.0
+
+
+@dataclass
+class ChunkReport:
+    seq: int
+    worker: int
+    size: int
+    seconds: float
+    # 성공하면 결과(room_ids는 비움), 실패하면 None
+    result: Optional[ImportResult] = None
+    error: str = ""
+    failed_path: Optional[str] = None
+
+
+@dataclass
+class ParallelImportResult:
+    total: ImportResult = field(default_factory=ImportResult)
+    chunks: int = 0
+    failed_chunks: List[ChunkReport] = field(default_factory=list)
+
+    def add(self, report: ChunkReport) -> None:
+        self.chunks += 1
+        if report.result is None:
+            self.failed_chunks.append(report)
+        else:
+            self.total.merge(report.result)
+
+
+def _partition(raw: Dict[str, Any], position: int, workers: int) -> int:
+    try:
+        return int(raw.get("매물ID")) % workers
+    except (TypeError, ValueError):
+        # 매물ID가 없으면 다른 항목과 겹칠 일이 없으니 고르게 나눈다
+        return position % workers
+
+
+def _dump_failed(failed_dir: str, seq: int, raw_items: List[Dict[str, Any]]) -> str:
+    os.makedirs(failed_dir, exist_ok=True)
+    path = os.path.join(failed_dir, f"chunk-{seq:05d}.ndjson")
+    with open(path, "w", encoding="utf-8") as f:
+        for raw in raw_items:
+            f.write(json.dumps(raw, ensure_ascii=False) + "\n")
+    return path
+
+
+def _worker(index: int, tasks, results, failed_dir: str) -> None:
+    import django
+
+    # spawn 시작 방식(macOS 기본)에서는 자식이 Django 설정을 새로 해야 한다. fork면 이미 된 상태라 그대로 지나간다
+    django.setup()
+    from django.db import connections
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        seq, raw_items = task
+        started = time.perf_counter()
+        result, error = None, ""
+        for attempt in range(CHUNK_ATTEMPTS):
+            if attempt:
+                time.sleep(RETRY_DELAY_SECONDS)
+            try:
+                result = import_chunk([normalize_item(raw) for raw in raw_items])
+                break
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+        report = ChunkReport(seq=seq, worker=index, size=len(raw_items), seconds=time.perf_counter() - started)
+        if result is None:
+            report.error = error
+            report.failed_path = _dump_failed(failed_dir, seq, raw_items)
+        else:
+            # 메인은 건수만 쓴다. 큐로 보낼 양을 줄인다
+            result.room_ids, result.id_map = [], {}
+            report.result = result
+        results.put(report)
+    connections.close_all()
+    results.put(None)
+
+
+def import_rooms_parallel(
+    raw_items: Iterable[Dict[str, Any]],
+    workers: int,
+    failed_dir: str,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    on_chunk: Optional[Callable[[ChunkReport], None]] = None,
+) -> ParallelImportResult:
+    """
+    한글 키 원본 iterable을 workers개 프로세스로 나눠 임포트한다. chunk마다 커밋되며 실패한 chunk는 failed_dir에 남는다.
+    raw_items 읽기 중 예외(파일 형식 오류 등)는 이미 넘긴 chunk를 마저 처리한 뒤 그대로 올린다
+    """
+    from django.db import connections
+
+    # 자식이 부모의 DB 연결(소켓)을 물려받으면 서로의 연결을 깨뜨릴 수 있다
+    connections.close_all()
+
+    ctx = multiprocessing.get_context()
+    results = ctx.Queue()
+    task_queues = [ctx.Queue(maxsize=QUEUE_DEPTH) for _ in range(workers)]
+    for task_queue in task_queues:
+        # 워커가 죽어 아무도 안 읽는 큐가 남아도 메인 프로세스가 종료 시 멈추지 않게
+        task_queue.cancel_join_thread()
+    procs = [
+        ctx.Process(target=_worker, args=(index, task_queue, results, failed_dir), daemon=True)
+        for index, task_queue in enumerate(task_queues)
+    ]
+    for proc in procs:
+        proc.start()
+
+    summary = ParallelImportResult()
+    finished = 0
+
+    def collect(block: bool) -> None:
+        nonlocal finished
+        while finished < workers:
+            try:
+                report = results.get(timeout=_POLL_SECONDS) if block else results.get_nowait()
+            except queue.Empty:
+                if not block or not any(proc.is_alive() for proc in procs):
+                    return
+                continue
+            if report is None:
+                finished += 1
+                continue
+            summary.add(report)
+            if on_chunk is not None:
+                on_chunk(report)
+
+    def put(index: int, task) -> None:
+        while True:
+            try:
+                task_queues[index].put(task, timeout=_POLL_SECONDS)
+                return
+            except queue.Full:
+                collect(block=False)
+                if not procs[index].is_alive():
+                    raise RuntimeError(f"임포트 워커 {index}가 비정상 종료했습니다 (exit code {procs[index].exitcode})")
+
+    buffers: List[List[Dict[str, Any]]] = [[] for _ in range(workers)]
+    seq = 0
+
+    def dispatch(index: int) -> None:
+        nonlocal seq
+        seq += 1
+        put(index, (seq, buffers[index]))
+        buffers[index] = []
+        collect(block=False)
+
+    try:
+        for position, raw in enumerate(raw_items):
+            index = _partition(raw, position, workers)
+            buffers[index].append(raw)
+            if len(buffers[index]) >= chunk_size:
+                dispatch(index)
+        for index in range(workers):
+            if buffers[index]:
+                dispatch(index)
+    finally:
+        for index, proc in enumerate(procs):
+            if proc.is_alive():
+                put(index, None)
+        collect(block=True)
+        for proc in procs:
+            proc.join()
+        if summary.total.created or summary.total.updated:
+            finalize_import(summary.total.geohashes)
+
+    crashed = [index for index, proc in enumerate(procs) if proc.exitcode != 0]
+    if crashed:
+        raise RuntimeError(f"임포트 워커 {crashed}가 비정상 종료했습니다. 다시 실행하면 바뀌지 않은 매물은 건너뜁니다")
+    return summary
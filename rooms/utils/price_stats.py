@@ -0,0 +1,138 @@
+"""
+지역/방 타입별 가격 분포
+
+- Room의 (구, 방 타입, 보증금, 월세, ㎡당 월세) 열을 NumPy 배열로 한 번 읽어 시장(구 x 방 타입)별로 정렬해 둔다
+- 시장별 p10/p50/p90과 히스토그램은 스냅샷을 만들 때 함께 계산하고, 방 데이터가 바뀐 뒤 첫 요청에서만 다시 만든다
+- 정렬된 배열을 들고 있으므로 "이 가격이 시장에서 몇 퍼센타일인지"는 이분 탐색으로 바로 구한다
+"""
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .snapshot import VersionedSnapshot
+
+METRICS = ('deposit', 'monthly_fee', 'fee_per_m2')
+PERCENTILES = (10, 50, 90)
+HISTOGRAM_BINS = 10
+# 히스토그램 범위 상한. 소수의 고가 매물 때문에 구간이 뭉개지지 않도록 상위 1%는 마지막 구간에 합친다
+HISTOGRAM_UPPER_PERCENTILE = 99
+
+MarketKey = Tuple[Optional[str], Optional[str]]  # (구, 방 타입). None은 전체
+
+
+class Market(NamedTuple):
+    count: int
+    values: Dict[str, np.ndarray]   # 지표별 정렬된 값 (결측 제외)
+    summary: Dict[str, dict]        # 지표별 분위수/히스토그램
+
+
+class PriceSnapshot(NamedTuple):
+    markets: Dict[MarketKey, Market]
+
+
+def _summarize(values: np.ndarray, rounding: int) -> dict:
+    if not len(values):
+        return {'count': 0, 'min': None, 'max': None, 'p10': None, 'p50': None, 'p90': None, 'histogram': []}
+
+    def rounded(x):
+        return round(float(x), rounding) if rounding else int(round(float(x)))
+
+    p10, p50, p90, upper = np.percentile(values, PERCENTILES + (HISTOGRAM_UPPER_PERCENTILE,))
+    low = values[0]
+    if upper <= low:
+        upper = values[-1]
+    if upper <= low:
+        histogram = [{'min': rounded(low), 'max': rounded(low), 'count': len(values)}]
+    else:
+        edges = np.linspace(low, upper, HISTOGRAM_BINS + 1)
+        counts, _ = np.histogram(np.minimum(values, upper), bins=edges)
+        histogram = [
+            {'min': rounded(edges[i]), 'max': rounded(edges[i + 1]), 'count': int(counts[i])}
+            for i in range(HISTOGRAM_BINS)
+        ]
+    return {
+        'count': len(values),
+        'min': rounded(values[0]),
+        'max': rounded(values[-1]),
+        'p10': rounded(p10),
+        'p50': rounded(p50),
+        'p90': rounded(p90),
+        'histogram': histogram,
+    }
+
+
+def _build_market(columns: Dict[str, np.ndarray], mask: np.ndarray) -> Market:
+    values = {}
+    for metric in METRICS:
+        column = columns[metric][mask]
+        values[metric] = np.sort(column[~np.isnan(column)])
+    summary = {
+        metric: _summarize(values[metric], 1 if metric == 'fee_per_m2' else 0)
+        for metric in METRICS
+    }
+    return Market(count=int(mask.sum()), values=values, summary=summary)
+
+
+def build_snapshot(rows) -> PriceSnapshot:
+    """rows: (region_gu, room_type, deposit, monthly_fee, real_area) 목록"""
+    regions = np.array([r[0] or '' for r in rows], dtype=object)
+    room_types = np.array([r[1] or '' for r in rows], dtype=object)
+    numbers = np.array([r[2:] for r in rows], dtype=np.float64).reshape(-1, 3)  # None -> nan
+    deposit, monthly_fee, area = numbers[:, 0], numbers[:, 1], numbers[:, 2]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fee_per_m2 = np.where(area > 0, monthly_fee / area, np.nan)
+    columns = {'deposit': deposit, 'monthly_fee': monthly_fee, 'fee_per_m2': fee_per_m2}
+
+    region_values = sorted(v for v in set(regions) if v)
+    type_values = sorted(v for v in set(room_types) if v)
+    region_masks = {region: regions == region for region in region_values}
+    type_masks = {room_type: room_types == room_type for room_type in type_values}
+
+    markets = {(None, None): _build_market(columns, np.ones(len(rows), dtype=bool))}
+    for region, region_mask in region_masks.items():
+        markets[(region, None)] = _build_market(columns, region_mask)
+    for room_type, type_mask in type_masks.items():
+        markets[(None, room_type)] = _build_market(columns, type_mask)
+        for region, region_mask in region_masks.items():
+            mask = region_mask & type_mask
+            if mask.any():
+                markets[(region, room_type)] = _build_market(columns, mask)
+    return PriceSnapshot(markets=markets)
+
+
+def _build_from_db() -> PriceSnapshot:
+    from rooms.models import Room
+
+    rows = list(Room.objects.values_list('region_gu', 'room_type', 'deposit', 'monthly_fee', 'real_area').iterator())
+    return build_snapshot(rows)
+
+
+price_snapshot = VersionedSnapshot(_build_from_db)
+
+
+def get_market(snapshot: PriceSnapshot, region: Optional[str], room_type: Optional[str]) -> Market:
+    market = snapshot.markets.get((region, room_type))
+    if market is None:
+        market = _build_market({metric: np.empty(0) for metric in METRICS}, np.empty(0, dtype=bool))
+    return market
+
+
+def percentile_rank(market: Market, metric: str, value: float) -> Optional[float]:
+    """시장 내 value의 퍼센타일 순위 (0~100, 같은 값은 절반씩 센다)"""
+    values = market.values[metric]
+    if not len(values):
+        return None
+    below = np.searchsorted(values, value, side='left')
+    at_or_below = np.searchsorted(values, value, side='right')
+    return round(float((below + at_or_below) / 2 / len(values) * 100), 1)
+
+
+def market_breakdown(snapshot: PriceSnapshot, region: Optional[str], room_type: Optional[str]) -> List[MarketKey]:
+    """선택한 시장 아래의 구 x 방 타입 조합 목록 (개수 많은 순)"""
+    keys = [
+        key for key in snapshot.markets
+        if key[0] is not None and key[1] is not None
+        and (region is None or key[0] == region)
+        and (room_type is None or key[1] == room_type)
+    ]
+    return sorted(keys, key=lambda key: (-snapshot.markets[key].count, key))
@@ -0,0 +1,20 @@
+from typing import Optional, Tuple
+
+_DONG_SUFFIXES = ("동", "가", "읍", "면")
+
+
+def parse_region(address: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    주소에서 (구, 동)을 뽑는다.
+    "중랑구 중화동" -> ("중랑구", "중화동"), "상봉동 브르넨상봉" -> (None, "상봉동"),
+    "서울특별시 중랑구 중화동 123-4" -> ("중랑구", "중화동")
+    """
+    gu = dong = None
+    for token in (address or "").split():
+        if len(token) < 2:
+            continue
+        if gu is None and dong is None and token.endswith("구"):
+            gu = token
+        elif dong is None and token.endswith(_DONG_SUFFIXES):
+            dong = token
+    return gu, dong
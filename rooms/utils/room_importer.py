@@ -0,0 +1,332 @@
+"""
+방 데이터 대량 임포트 엔진 (ImportRoomsView, import_rooms 명령 공용)
+
+- 입력은 한글 키 원본 dict의 iterable. chunk_size개씩 끊어 처리하므로 입력 전체를 메모리에 올릴 필요가 없다
+- chunk마다: external_id로 기존 방의 content_hash(마지막으로 받은 원본 항목의 필드 + 이미지 URL 해시)를 한 번에 읽어 같은 방은 건너뛰고
+  -> 바뀐 기존 방만 전체를 읽어 기존/새 방 모두 bulk_create(update_conflicts) 한 번으로 upsert
+  -> 이미지 목록이 바뀐 방만 한 번에 지우고 한 번에 넣는다 -> 제목/주소가 바뀐 방만 검색 색인 갱신
+- 그래서 거의 그대로인 스냅샷을 다시 넣으면 chunk마다 SELECT 하나로 끝난다.
+  content_hash는 임포트만 채우고 API/관리자 수정(save())과 이미지 변경 시그널이 비우므로, 그 방은 다음 임포트에서 다시 쓴다
+- bulk 경로는 save()/시그널을 거치지 않으므로 계산 컬럼(fill_derived_fields), thumbnail_url, updated_at을 직접 채우고,
+  지도 클러스터와 데이터 버전은 전체가 끝난 뒤 한 번만 갱신한다
+- chunk는 각각 transaction.atomic()으로 감싼다. 바깥 트랜잭션이 있으면 savepoint가 되어 전체가 하나로 묶이고,
+  없으면 chunk 단위로 커밋된다
+"""
+import hashlib
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db import DataError, IntegrityError, transaction
+from django.utils import timezone
+
+IMPORT_CHUNK_SIZE = 1000
+
+KOREAN_KEY_MAP = {
+    "매물ID": "external_id",
+    "제목": "title",
+    "방종류": "room_type",
+    "월세": "monthly_fee",
+    "보증금": "deposit",
+    "관리비": "maintenance_cost",
+    "공급면적": "supply_area",
+    "전용면적": "real_area",
+    "층수": "floor",
+    "계약형태": "contract_type",
+    "주소": "address",
+    "위도": "latitude",
+    "경도": "longitude",
+    "이미지URL": "images",
+}
+
+# 원본에서 오는 Room 컬럼 (images 제외)
+SOURCE_FIELDS = tuple(target for target in KOREAN_KEY_MAP.values() if target not in ("images", "external_id"))
+
+
+def normalize_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """한글 키 원본 -> Room 필드명 dict (모르는 키는 버림, images는 URL 목록)"""
+    norm: Dict[str, Any] = {}
+    for k, v in item.items():
+        if k not in KOREAN_KEY_MAP:
+            continue
+        target = KOREAN_KEY_MAP[k]
+        if target == "images":
+            norm["images"] = v or []
+        else:
+            norm[target] = v
+    return norm
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    updated: int = 0
+    # content_hash가 같아 건드리지 않은 방
+    unchanged: int = 0
+    # isolate_failures=True일 때 저장하지 못하고 건너뛴 항목 수
+    failed: int = 0
+    # 입력 순서대로의 방 id (같은 external_id가 여러 번 오면 같은 id)
+    room_ids: List[int] = field(default_factory=list)
+    # external_id -> 방 id (external_id가 없는 항목은 빠진다)
+    id_map: Dict[int, int] = field(default_factory=dict)
+    # 클러스터 갱신 대상 (이전/이후 geohash)
+    geohashes: Set[Optional[str]] = field(default_factory=set)
+
+    def merge(self, other: "ImportResult") -> None:
+        self.created += other.created
+        self.updated += other.updated
+        self.unchanged += other.unchanged
+        self.failed += other.failed
+        self.room_ids.extend(other.room_ids)
+        self.id_map.update(other.id_map)
+        self.geohashes |= other.geohashes
+
+
+def chunked(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _update_fields() -> List[str]:
+    from rooms.models import Room
+    return [*SOURCE_FIELDS, *Room.DERIVED_FIELDS, "thumbnail_url", "content_hash", "updated_at"]
+
+
+def _conflict_target() -> Dict[str, Any]:
+    """
+    upsert 충돌 대상 인자. MySQL은 대상을 지정할 수 없어(ON DUPLICATE KEY UPDATE) 생략하며,
+    id는 보내지 않으므로 external_id의 unique 인덱스에서만 충돌한다
+    """
+    from django.db import connections
+    from rooms.models import Room
+
+    if connections[Room.objects.db].features.supports_update_conflicts_with_target:
+        return {"unique_fields": ["external_id"]}
+    return {}
+
+
+def _create_without_external_id(rooms: List[Any]) -> None:
+    """
+    external_id가 없는 새 방은 다시 찾을 키가 없다.
+    bulk_create가 pk를 돌려주지 않는 DB(MySQL)에서는 한 건씩 save()로 넣는다 (원본 데이터에서는 드문 경우).
+    import_chunk의 bulk_import() 안에서 불리므로 save()의 시그널은 아무것도 하지 않고, 색인은 chunk 끝에서 한 번만 만든다
+    """
+    from django.db import connections
+    from rooms.models import Room
+
+    if not rooms:
+        return
+    if connections[Room.objects.db].features.can_return_rows_from_bulk_insert:
+        Room.objects.bulk_create(rooms, batch_size=IMPORT_CHUNK_SIZE)
+        return
+    for room in rooms:
+        room.save()
+
+
+def _image_urls(item: Dict[str, Any]) -> List[str]:
+    return [url for url in item.get("images") or [] if url]
+
+
+def content_hash(values: Dict[str, Any], image_urls: List[str]) -> str:
+    """
+    원본 항목(normalize_item 결과)의 SOURCE_FIELDS + 이미지 URL 목록 해시.
+    빠진 키는 기존 값을 유지하고 null은 값을 지우므로 둘을 다르게 센다 ([] / [값])
+    """
+    payload = json.dumps(
+        [[[values[name]] if name in values else [] for name in SOURCE_FIELDS], image_urls],
+        ensure_ascii=False, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def import_chunk(items: List[Dict[str, Any]]) -> ImportResult:
+    """normalize_item을 거친 dict 목록 하나를 처리한다. 쿼리 수는 항목 수와 무관하게 일정"""
+    from rooms.models import Room, RoomImage
+    from rooms.signals import bulk_import
+    from rooms.utils.search_index import index_rooms
+
+    result = ImportResult()
+    now = timezone.now()
+    update_fields = _update_fields()
+
+    # 1) 매물ID별 (id, content_hash)만 읽어 비교한다. 같은 매물ID의 모든 항목이 저장된 해시와 같으면 건드리지 않는다
+    #    (바뀐 게 없는 chunk는 이 SELECT 하나로 끝난다)
+    external_ids = {item["external_id"] for item in items if item.get("external_id") is not None}
+    known = {
+        ext: (pk, digest)
+        for ext, pk, digest in Room.objects.filter(external_id__in=external_ids).values_list("external_id", "id", "content_hash")
+    }
+    changed = {
+        item["external_id"] for item in items
+        if item.get("external_id") is not None
+        and (item["external_id"] not in known or known[item["external_id"]][1] != content_hash(item, _image_urls(item)))
+    }
+    unchanged = external_ids - changed
+
+    # 2) 바뀐 기존 방만 전체를 읽는다 (원본에 빠진 키는 기존 값을 유지해야 하므로)
+    existing = {room.external_id: room for room in Room.objects.filter(external_id__in=changed & known.keys())}
+    old_text = {ext: (room.title, room.address) for ext, room in existing.items()}
+    result.geohashes.update(room.geohash for room in existing.values())
+
+    # external_id 기준으로 합친다 (같은 chunk에 두 번 오면 뒤의 값이 이김).
+    # order는 입력 순서의 (external_id, Room). 바뀌지 않은 방은 Room 없이 id만 돌려준다
+    by_external: Dict[int, Any] = {}
+    images_by_room: Dict[int, List[str]] = {}
+    anonymous: List[Any] = []
+    order: List[Tuple[Optional[int], Any]] = []
+    for item in items:
+        external_id = item.get("external_id")
+        if external_id in unchanged:
+            order.append((external_id, None))
+            continue
+        item = dict(item)
+        urls = _image_urls(item)
+        digest = content_hash(item, urls)
+        item.pop("images", None)
+        if external_id is None:
+            room = Room(**item)
+            anonymous.append(room)
+        else:
+            room = by_external.get(external_id) or existing.get(external_id) or Room(external_id=external_id)
+            for name, value in item.items():
+                setattr(room, name, value)
+            by_external[external_id] = room
+        room.fill_derived_fields()
+        room.thumbnail_url = urls[0] if urls else None
+        # 합친 행이 아니라 받은 항목의 해시를 저장해 1)의 비교와 같은 기준이 되게 한다.
+        # 빠진 키는 기존 값을 유지하므로, 같은 항목이 다시 오면 행도 지금과 같다
+        room.content_hash = digest
+        room.updated_at = now
+        images_by_room[id(room)] = urls
+        order.append((external_id, room))
+
+    keyed = list(by_external.values())
+    to_update = [room for ext, room in by_external.items() if ext in existing]
+    to_create = [room for ext, room in by_external.items() if ext not in existing]
+    unique_rooms = list({id(room): room for _, room in order if room is not None}.values())
+
+    if unique_rooms:
+        # 이미지 삭제/익명 방 save()의 시그널 후처리는 끄고, 색인/썸네일/content_hash/버전은 아래와 finalize_import에서 한 번에 쓴다
+        with transaction.atomic(), bulk_import():
+            # 기존 방의 이미지 URL 목록. 같으면 이미지 행은 그대로 둔다 (필드만 바뀐 경우)
+            old_urls: Dict[int, List[str]] = {room.pk: [] for room in to_update}
+            for room_id, url in (
+                RoomImage.objects.filter(room_id__in=list(old_urls)).order_by("room_id", "ordering", "id").values_list("room_id", "image_url")
+            ):
+                old_urls[room_id].append(url)
+
+            if keyed:
+                # 기존/새 방 모두 INSERT ... ON CONFLICT(external_id) DO UPDATE (MySQL은 ON DUPLICATE KEY UPDATE) 한 문장으로 쓴다.
+                # (bulk_update는 행 x 필드마다 CASE WHEN을 만들어 chunk가 커질수록 SQL 생성 비용이 폭증한다)
+                # id 컬럼은 보내지 않고 external_id 충돌로만 갱신되게 한다
+                existing_ids = {ext: room.pk for ext, room in existing.items()}
+                for room in keyed:
+                    room.pk = None
+                Room.objects.bulk_create(
+                    keyed,
+                    batch_size=IMPORT_CHUNK_SIZE,
+                    update_conflicts=True,
+                    update_fields=update_fields,
+                    **_conflict_target(),
+                )
+                # upsert는 pk를 돌려주지 않으므로 새 방만 external_id로 다시 읽는다
+                if to_create:
+                    existing_ids.update(
+                        Room.objects.filter(external_id__in=[room.external_id for room in to_create])
+                        .values_list("external_id", "id")
+                    )
+                for room in keyed:
+                    room.pk = existing_ids[room.external_id]
+            _create_without_external_id(anonymous)
+
+            # 이미지 교체: 목록이 바뀐 기존 방만 일괄 삭제 + 새 방/바뀐 방 이미지 일괄 삽입.
+            # bulk_import() 안이라 RoomImage post_delete 수신자가 방마다 thumbnail_url/content_hash를 비우지 않는다
+            replaced = [room for room in unique_rooms if old_urls.get(room.id) != images_by_room[id(room)]]
+            RoomImage.objects.filter(room_id__in=[room.id for room in replaced if room.id in old_urls]).delete()
+            RoomImage.objects.bulk_create(
+                [
+                    RoomImage(room_id=room.id, image_url=url, ordering=idx)
+                    for room in replaced
+                    for idx, url in enumerate(images_by_room[id(room)])
+                ],
+                batch_size=IMPORT_CHUNK_SIZE,
+            )
+
+            # 새 방과 제목/주소가 바뀐 방만 재색인
+            index_rooms([
+                room for room in unique_rooms
+                if room.external_id not in old_text or old_text[room.external_id] != (room.title, room.address)
+            ])
+
+    result.created = len(to_create) + len(anonymous)
+    result.updated = len(to_update)
+    result.unchanged = len(unchanged)
+    result.room_ids = [known[ext][0] if room is None else room.id for ext, room in order]
+    result.id_map = {ext: room_id for (ext, _), room_id in zip(order, result.room_ids) if ext is not None}
+    result.geohashes.update(room.geohash for room in unique_rooms)
+    return result
+
+
+# 항목의 값 때문에 나는 오류 (NOT NULL/길이/타입 등). DB 연결/락/미지원 기능 오류(OperationalError 등)는
+# 항목을 바꿔도 똑같이 실패하므로 여기 넣지 않고 그대로 올려 작업을 실패로 끝낸다
+ITEM_ERRORS = (IntegrityError, DataError, ValidationError, ValueError, TypeError)
+
+
+def _import_chunk_isolated(items: List[Dict[str, Any]]) -> ImportResult:
+    """
+    chunk가 항목 값 때문에 실패하면 항목마다 따로 다시 넣어 실패한 항목만 건너뛴다.
+    import_chunk의 쓰기는 atomic 블록이라 실패한 시도는 흔적을 남기지 않는다
+    """
+    try:
+        return import_chunk(items)
+    except ITEM_ERRORS:
+        pass
+    result = ImportResult()
+    for item in items:
+        try:
+            result.merge(import_chunk([item]))
+        except ITEM_ERRORS:
+            result.failed += 1
+    return result
+
+
+def import_rooms(
+    raw_items: Iterable[Dict[str, Any]],
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    on_chunk: Optional[Callable[[ImportResult], None]] = None,
+    finalize: bool = True,
+    isolate_failures: bool = False,
+) -> ImportResult:
+    """
+    한글 키 원본 iterable을 chunk 단위로 임포트한다.
+    on_chunk: chunk가 끝날 때마다 그 chunk의 결과로 호출 (진행률 기록 등)
+    finalize: False면 클러스터/데이터 버전 갱신을 호출한 쪽에 맡긴다 (finalize_import)
+    isolate_failures: True면 값 때문에 저장에 실패한 항목(ITEM_ERRORS)을 건너뛰고 failed로 센다.
+                      False거나 DB 자체 오류면 예외를 그대로 올린다
+    """
+    import_one = _import_chunk_isolated if isolate_failures else import_chunk
+    total = ImportResult()
+    for chunk in chunked(raw_items, chunk_size):
+        result = import_one([normalize_item(raw) for raw in chunk])
+        total.merge(result)
+        if on_chunk is not None:
+            on_chunk(result)
+    # 모두 그대로였으면 캐시를 무효화할 이유가 없다
+    if finalize and (total.created or total.updated):
+        finalize_import(total.geohashes)
+    return total
+
+
+def finalize_import(geohashes: Iterable[Optional[str]]) -> None:
+    """임포트 후처리: 바뀐 셀의 지도 클러스터 재계산 + 데이터 버전 증가 (캐시/스냅샷 무효화)"""
+    from rooms.cache import bump_data_version
+    from rooms.utils.clusters import refresh_clusters
+
+    refresh_clusters(geohashes)
+    bump_data_version()
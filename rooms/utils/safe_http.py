@@ -0,0 +1,120 @@
+"""
+외부(원본 데이터가 준) URL로 나가는 요청의 주소 제한
+
+- 이미지 URL은 인증 없는 임포트 API로 들어오므로, 그대로 요청하면 서버 안쪽 주소(127.0.0.1, 10.x, 169.254.169.254 메타데이터 등)를
+  대신 호출해 주는 셈이 된다 (SSRF). 공인(global) 주소가 아니면 연결하지 않는다
+- 호스트 이름은 실제로 연결할 주소를 검사해야 한다. 미리 한 번 조회해 검사하고 요청은 따로 조회하면
+  그 사이 DNS 응답을 바꾸는 것(DNS rebinding)을 막지 못하므로, 연결에 쓰는 조회 결과 자체를 검사한다
+- 리다이렉트도 hop마다 같은 검사를 거친다
+- aiohttp(image_probe)는 PublicResolver로 조회 결과를, requests(thumbnails)는 public_session으로 연결된 소켓의 주소를 검사한다
+"""
+import ipaddress
+import socket
+from typing import Any, Dict, List
+from urllib.parse import urlsplit
+
+from requests import Session
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+class BlockedAddressError(OSError):
+    """공인 주소가 아닌 곳으로의 요청 (연결 오류로 다루도록 OSError)"""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        # aiohttp/urllib3는 감싼 OSError의 strerror를 메시지에 넣는다
+        self.strerror = message
+
+
+def is_public_address(address: str) -> bool:
+    """공인 유니캐스트 IP인지. 사설/루프백/링크 로컬/예약/CGNAT 대역은 False"""
+    try:
+        ip = ipaddress.ip_address(address.split("%", 1)[0])  # IPv6 zone id 제거
+    except ValueError:
+        return False
+    if ip.version == 6 and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def check_url(url: str) -> None:
+    """http(s)이고 호스트가 있는지, 호스트가 IP 리터럴이면 공인 주소인지 (이름은 연결할 때 검사한다)"""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise BlockedAddressError(f"http(s) URL이 아닙니다: {url[:100]}")
+    try:
+        ipaddress.ip_address(parts.hostname.split("%", 1)[0])
+    except ValueError:
+        return
+    if not is_public_address(parts.hostname):
+        raise BlockedAddressError(f"공인 주소가 아닙니다: {parts.hostname}")
+
+
+class PublicResolver:
+    """
+    aiohttp TCPConnector용 resolver. 조회 결과에 공인 주소가 아닌 것이 하나라도 있으면 연결하지 않는다.
+    (aiohttp는 IP 리터럴 호스트는 resolver를 거치지 않으므로 check_url을 함께 쓴다)
+    """
+
+    def __init__(self):
+        from aiohttp.resolver import DefaultResolver
+
+        self._resolver = DefaultResolver()
+
+    async def resolve(self, host: str, port: int = 0, family: int = socket.AF_INET) -> List[Dict[str, Any]]:
+        hosts = await self._resolver.resolve(host, port, family)
+        for entry in hosts:
+            if not is_public_address(entry["host"]):
+                raise BlockedAddressError(f"공인 주소가 아닙니다: {host} -> {entry['host']}")
+        return hosts
+
+    async def close(self) -> None:
+        await self._resolver.close()
+
+
+class _PublicOnlyConnection:
+    """urllib3 연결이 실제로 붙은 주소(peer)를 검사한다. 요청을 보내기 전, 소켓을 연 직후에 끊는다"""
+
+    def _new_conn(self):
+        sock = super()._new_conn()
+        address = sock.getpeername()[0]
+        if not is_public_address(address):
+            sock.close()
+            raise BlockedAddressError(f"공인 주소가 아닙니다: {self.host} -> {address}")
+        return sock
+
+
+class _PublicHTTPConnection(_PublicOnlyConnection, HTTPConnection):
+    pass
+
+
+class _PublicHTTPSConnection(_PublicOnlyConnection, HTTPSConnection):
+    pass
+
+
+class _PublicHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _PublicHTTPConnection
+
+
+class _PublicHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _PublicHTTPSConnection
+
+
+class PublicOnlyAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': _PublicHTTPConnectionPool, 'https': _PublicHTTPSConnectionPool}
+
+
+def public_session(max_redirects: int = 3) -> Session:
+    """공인 주소에만 연결하는 requests 세션. 리다이렉트도 같은 어댑터로 새로 연결하므로 hop마다 검사된다"""
+    session = Session()
+    # 환경 변수의 프록시를 쓰면 검사하는 주소가 프록시가 된다
+    session.trust_env = False
+    session.max_redirects = max_redirects
+    adapter = PublicOnlyAdapter()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
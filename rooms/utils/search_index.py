@@ -0,0 +1,126 @@
+"""
+방 검색용 문자 bigram 역색인
+
+- 제목/주소를 정규화한 뒤 단어별 2글자 토큰(bigram)으로 쪼개 RoomSearchToken에 저장
+- 검색어의 모든 bigram을 가진 방만 후보로 뽑고, 토큰 가중치 합(relevance)으로 정렬
+- bigram이 모두 있어도 붙어 있지 않을 수 있으므로("강남 ... 남역"은 "강남역"의 bigram을 모두 가짐)
+  후보에서 검색어 전체를 부분 일치로 다시 확인한다. 결과는 기존 icontains 검색과 같고 색인은 범위만 좁힌다
+- 한 글자 검색어처럼 bigram이 나오지 않으면 기존 icontains 검색으로 동작
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.db import transaction
+from django.db.models import Count, OuterRef, Q, QuerySet, Subquery, Sum
+
+TITLE_WEIGHT = 2
+ADDRESS_WEIGHT = 1
+
+_NON_WORD_RE = re.compile(r"[^0-9a-z가-힣]+")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    return _NON_WORD_RE.sub(" ", (text or "").lower()).strip()
+
+
+def _word_bigrams(word: str) -> List[str]:
+    return [word[i:i + 2] for i in range(len(word) - 1)]
+
+
+def text_bigrams(text: Optional[str]) -> Set[str]:
+    grams: Set[str] = set()
+    for word in normalize_text(text).split():
+        grams.update(_word_bigrams(word))
+    return grams
+
+
+def room_tokens(title: Optional[str], address: Optional[str]) -> Dict[str, int]:
+    """(토큰 -> 가중치). 제목과 주소에 모두 있는 토큰은 가중치를 합산한다."""
+    tokens: Dict[str, int] = {}
+    for gram in text_bigrams(title):
+        tokens[gram] = tokens.get(gram, 0) + TITLE_WEIGHT
+    for gram in text_bigrams(address):
+        tokens[gram] = tokens.get(gram, 0) + ADDRESS_WEIGHT
+    return tokens
+
+
+def parse_query(query: str) -> Tuple[Set[str], List[str]]:
+    """검색어를 (bigram 집합, 한 글자 단어 목록)으로 분리"""
+    grams: Set[str] = set()
+    singles: List[str] = []
+    for word in normalize_text(query).split():
+        if len(word) == 1:
+            singles.append(word)
+        else:
+            grams.update(_word_bigrams(word))
+    return grams, singles
+
+
+def index_rooms(rooms: Iterable) -> None:
+    """주어진 방들의 색인을 다시 만든다 (기존 토큰 삭제 후 bulk insert)"""
+    from rooms.cache import bump_text_version
+    from rooms.models import RoomSearchToken
+
+    rooms = list(rooms)
+    if not rooms:
+        return
+    postings = [
+        RoomSearchToken(room_id=room.id, token=token, weight=weight)
+        for room in rooms
+        for token, weight in room_tokens(room.title, room.address).items()
+    ]
+    with transaction.atomic():
+        RoomSearchToken.objects.filter(room_id__in=[room.id for room in rooms]).delete()
+        RoomSearchToken.objects.bulk_create(postings, batch_size=1000)
+        # 제목/주소 기반 스냅샷(자동완성)은 이 버전만 본다
+        bump_text_version()
+
+
+def search_rooms(queryset: QuerySet, query: str) -> Tuple[QuerySet, bool]:
+    """
+    검색어로 queryset을 좁힌다. (queryset, 색인 사용 여부)를 반환하며,
+    색인을 쓴 경우 relevance 어노테이션이 붙어 있다.
+    """
+    grams, _ = parse_query(query)
+    if not grams:
+        return queryset.filter(Q(title__icontains=query) | Q(address__icontains=query)), False
+
+    from rooms.models import RoomSearchToken
+
+    # 색인 테이블 안에서만 집계해 후보 id를 뽑고(Room 컬럼 전체 GROUP BY 방지),
+    # 관련도는 후보 행마다 (room, token) 유니크 인덱스로 합산
+    postings = RoomSearchToken.objects.filter(token__in=grams)
+    candidate_ids = (
+        postings.values('room_id')
+        .annotate(matched=Count('id'))
+        .filter(matched=len(grams))
+        .values('room_id')
+    )
+    relevance = (
+        postings.filter(room_id=OuterRef('pk'))
+        .values('room_id')
+        .annotate(total=Sum('weight'))
+        .values('total')
+    )
+    queryset = queryset.filter(id__in=candidate_ids).annotate(relevance=Subquery(relevance))
+    # 좁혀진 후보에서만 검색어 전체를 부분 일치로 확인 (한 글자 단어도 여기서 걸러진다)
+    queryset = queryset.filter(Q(title__icontains=query) | Q(address__icontains=query))
+    return queryset, True
+
+
+def match_upper_bound(query: str) -> Optional[int]:
+    """
+    검색어에 매칭될 수 있는 방 수의 상한 = 가장 드문 bigram을 가진 방 수.
+    색인만 세므로 실제 검색/COUNT보다 훨씬 싸다. bigram이 없으면 None.
+    """
+    from rooms.models import RoomSearchToken
+
+    grams, _ = parse_query(query)
+    if not grams:
+        return None
+    doc_freq = dict(
+        RoomSearchToken.objects.filter(token__in=grams)
+        .values_list('token')
+        .annotate(n=Count('id'))
+    )
+    return min(doc_freq.get(gram, 0) for gram in grams)
@@ -0,0 +1,43 @@
+"""
+데이터 버전 기반 프로세스 로컬 스냅샷
+
+- 요청마다 RoomDataVersion을 한 번 읽고, 버전이 바뀐 경우에만 builder를 다시 실행한다
+- 임포트/수정/삭제로 버전이 오르면 다음 요청에서 자연스럽게(지연) 재생성된다
+- check_interval(초)을 주면 그 간격 안에서는 버전 조회도 생략한다 (타자마다 호출되는 자동완성 등)
+- version_getter로 다른 버전을 볼 수 있다 (제목/주소만 쓰는 스냅샷은 get_text_version)
+"""
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from rooms.cache import get_data_version
+
+
+class VersionedSnapshot:
+    def __init__(
+        self,
+        builder: Callable[[], Any],
+        check_interval: float = 0,
+        version_getter: Callable[[], int] = get_data_version,
+    ):
+        self._builder = builder
+        self._check_interval = check_interval
+        self._version_getter = version_getter
+        self._checked_at = 0.0
+        self._version: Optional[int] = None
+        self._value: Any = None
+        self._lock = threading.Lock()
+
+    def get(self, version: Optional[int] = None) -> Any:
+        if version is None:
+            now = time.monotonic()
+            if self._version is not None and now - self._checked_at < self._check_interval:
+                return self._value
+            self._checked_at = now
+            version = self._version_getter()
+        if self._version != version:
+            with self._lock:
+                if self._version != version:
+                    self._value = self._builder()
+                    self._version = version
+        return self._value
@@ -0,0 +1,272 @@
+"""
+방 이미지 썸네일 (원본 URL → 고정 너비 WebP/JPEG)
+
+- 너비는 THUMBNAIL_WIDTHS 중 하나, 형식은 webp/jpeg만 만든다 (조합이 정해져 있어 캐시가 잘 맞는다). 원본보다 크게 늘리지는 않는다
+- 디스크 캐시(settings.THUMBNAIL_CACHE_DIR)는 원본 내용 기준이다. 원본은 sha1(원본 바이트).src, 썸네일은 sha1(렌더 버전, 원본 해시, 너비, 형식)
+  이름으로 넣으므로 같은 원본을 쓰는 이미지끼리 공유하고, 다른 너비/형식을 만들 때 원본을 다시 받지 않는다
+- URL -> 원본 해시는 sha1(URL).ref에 받은 시각과 함께 적어 두고 ORIGIN_REVALIDATE_SECONDS가 지나면 원본을 다시 받는다.
+  같은 URL의 원본이 바뀌면 해시가 달라져 새 썸네일(새 ETag)이 만들어지고, 바뀌지 않았으면 있던 썸네일을 그대로 쓴다
+- 읽을 때마다 mtime을 갱신하고, 캐시가 THUMBNAIL_CACHE_MAX_BYTES를 넘으면 mtime이 오래된 파일부터 지운다 (LRU).
+  매번 디렉터리를 훑지 않도록 프로세스마다 쓴 양이 상한의 1/20을 넘을 때만 정리한다
+- 파일은 임시 파일에 쓴 뒤 os.replace로 바꿔 넣어 다른 프로세스(gunicorn 워커)가 반쯤 쓴 파일을 읽지 않는다
+- 원본 URL은 인증 없는 임포트로 들어오므로 공인 주소에만 연결한다 (safe_http, 리다이렉트 hop 포함)
+- 원본 받기는 요청을 처리하는 워커를 붙잡으므로 전체 시간을 ORIGIN_DEADLINE_SECONDS로 끊고,
+  동시에 받는 수를 서버 전체에서 THUMBNAIL_ORIGIN_FETCH_SLOTS개로 제한한다 (넘으면 ThumbnailBusyError -> 503).
+  gunicorn sync 워커는 프로세스마다 요청 하나라 프로세스 안의 세마포어로는 막을 수 없어 캐시 디렉터리의 파일 잠금(flock)을 쓴다
+"""
+import contextlib
+import hashlib
+import os
+import tempfile
+import time
+from io import BytesIO
+from typing import Iterator, Optional, Tuple
+
+from django.conf import settings
+
+THUMBNAIL_WIDTHS = (160, 320, 640, 960)
+DEFAULT_WIDTH = 320
+# fmt 파라미터 -> (Pillow 형식, Content-Type, 저장 옵션)
+THUMBNAIL_FORMATS = {
+    'webp': ('WEBP', 'image/webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'image/jpeg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+# 품질/리사이즈 방식을 바꾸면 올려서 기존 캐시를 버린다
+RENDER_VERSION = 1
+# (연결, 읽기 한 번) 타임아웃과 받기 전체의 상한
+ORIGIN_TIMEOUT_SECONDS = (3, 5)
+ORIGIN_DEADLINE_SECONDS = 8
+ORIGIN_MAX_BYTES = 20 * 1024 * 1024
+ORIGIN_MAX_REDIRECTS = 3
+# URL -> 원본 해시를 믿는 시간. 지나면 원본을 다시 받아 바뀌었는지 본다 (응답의 Cache-Control max-age도 같은 값)
+ORIGIN_REVALIDATE_SECONDS = 24 * 60 * 60
+# 정리할 때 상한의 이 비율까지 줄여 바로 다시 넘치지 않게
+EVICT_TO = 0.9
+
+_written_since_evict = 0
+
+
+class ThumbnailError(Exception):
+    """원본을 받지 못했거나 이미지로 읽을 수 없음"""
+
+
+class ThumbnailBusyError(ThumbnailError):
+    """원본을 받는 요청이 이미 THUMBNAIL_ORIGIN_FETCH_SLOTS개라 지금은 받지 않음 (잠시 뒤 다시 시도)"""
+
+
+def variant_key(origin_digest: str, width: int, fmt: str) -> str:
+    """썸네일 캐시 키이자 ETag. 원본 내용 해시로 만들므로 원본이 바뀌면 키도 바뀐다"""
+    return hashlib.sha1(f"{RENDER_VERSION}\n{origin_digest}\n{width}\n{fmt}".encode('utf-8')).hexdigest()
+
+
+def _ref_key(url: str) -> str:
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+def _cache_path(key: str, suffix: str) -> str:
+    # 한 디렉터리에 파일이 너무 몰리지 않게 앞 두 글자로 나눈다
+    return os.path.join(settings.THUMBNAIL_CACHE_DIR, key[:2], key + suffix)
+
+
+def _cache_read(key: str, suffix: str) -> Optional[bytes]:
+    path = _cache_path(key, suffix)
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        os.utime(path)  # LRU: 최근 사용 표시 (atime은 noatime 마운트에서 갱신되지 않음)
+    except FileNotFoundError:
+        # 없거나, 읽는 사이 다른 프로세스가 지웠다
+        return None
+    return data
+
+
+def _cache_write(key: str, suffix: str, data: bytes) -> None:
+    global _written_since_evict
+
+    path = _cache_path(key, suffix)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    _written_since_evict += len(data)
+    if _written_since_evict > settings.THUMBNAIL_CACHE_MAX_BYTES // 20:
+        _written_since_evict = 0
+        evict()
+
+
+def evict(max_bytes: Optional[int] = None) -> int:
+    """캐시가 max_bytes를 넘으면 오래 안 쓴 파일부터 지운다. 지운 바이트 수"""
+    max_bytes = settings.THUMBNAIL_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    entries = []
+    total = 0
+    try:
+        shards = list(os.scandir(settings.THUMBNAIL_CACHE_DIR))
+    except FileNotFoundError:
+        return 0
+    for shard in shards:
+        if not shard.is_dir():
+            continue
+        for entry in os.scandir(shard.path):
+            if entry.name.endswith('.tmp'):
+                # 다른 프로세스가 쓰는 중인 파일
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+    if total <= max_bytes:
+        return 0
+
+    removed = 0
+    target = total - int(max_bytes * EVICT_TO)
+    for _, size, path in sorted(entries):
+        if removed >= target:
+            break
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            continue
+        removed += size
+    return removed
+
+
+@contextlib.contextmanager
+def _origin_fetch_slot() -> Iterator[None]:
+    """서버 전체에서 동시에 원본을 받는 수를 제한한다. 빈 자리가 없으면 기다리지 않고 ThumbnailBusyError"""
+    try:
+        import fcntl
+    except ImportError:
+        # flock이 없는 환경(Windows 개발 서버)은 제한하지 않는다
+        yield
+        return
+
+    os.makedirs(settings.THUMBNAIL_CACHE_DIR, exist_ok=True)
+    for slot in range(settings.THUMBNAIL_ORIGIN_FETCH_SLOTS):
+        # 캐시 디렉터리 바로 아래 파일은 evict()가 보지 않는다 (샤드 디렉터리만 훑음)
+        fd = os.open(os.path.join(settings.THUMBNAIL_CACHE_DIR, f'.origin-fetch-{slot}.lock'), os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            continue
+        try:
+            yield
+        finally:
+            # 잠금은 fd를 닫으면 풀린다 (프로세스가 죽어도 커널이 푼다)
+            os.close(fd)
+        return
+    raise ThumbnailBusyError("원본 이미지를 받는 요청이 많습니다.")
+
+
+def _fetch_origin(url: str) -> bytes:
+    """
+    원본을 받는다. 오류 메시지에는 원본 서버의 응답(상태 코드 등)이 들어가므로 클라이언트에 그대로 보내지 말고 로그로만 남긴다
+    """
+    import requests
+
+    from .safe_http import BlockedAddressError, check_url, public_session
+
+    try:
+        check_url(url)
+    except BlockedAddressError as e:
+        raise ThumbnailError(str(e)) from None
+    deadline = time.monotonic() + ORIGIN_DEADLINE_SECONDS
+    try:
+        with _origin_fetch_slot(), public_session(ORIGIN_MAX_REDIRECTS) as session, \
+                session.get(url, stream=True, timeout=ORIGIN_TIMEOUT_SECONDS) as response:
+            if response.status_code != 200:
+                raise ThumbnailError(f"원본 이미지 응답 {response.status_code}: {url}")
+            data = bytearray()
+            for chunk in response.iter_content(64 * 1024):
+                data += chunk
+                if len(data) > ORIGIN_MAX_BYTES:
+                    raise ThumbnailError(f"원본 이미지가 {ORIGIN_MAX_BYTES} 바이트보다 큽니다: {url}")
+                if time.monotonic() > deadline:
+                    raise ThumbnailError(f"원본 이미지를 {ORIGIN_DEADLINE_SECONDS}초 안에 받지 못했습니다: {url}")
+    except requests.RequestException as e:
+        raise ThumbnailError(f"원본 이미지를 받지 못했습니다: {url} ({e})") from None
+    return bytes(data)
+
+
+def render_thumbnail(data: bytes, width: int, fmt: str) -> bytes:
+    """원본 바이트를 width 너비(원본이 더 작으면 원본 너비)의 fmt 이미지로"""
+    from PIL import Image, ImageOps
+
+    pil_format, _, options = THUMBNAIL_FORMATS[fmt]
+    try:
+        with Image.open(BytesIO(data)) as image:
+            # EXIF 회전(5~8)이면 돌린 뒤의 너비가 지금의 높이
+            rotated = image.getexif().get(0x0112) in (5, 6, 7, 8)
+            # JPEG는 디코딩할 때부터 1/2~1/8로 줄여 읽는다 (결과가 요청 너비보다 작아지지는 않음)
+            image.draft('RGB', (1, width) if rotated else (width, 1))
+            image = ImageOps.exif_transpose(image)
+            if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+                image = image.convert('RGBA')
+                if pil_format == 'JPEG':
+                    background = Image.new('RGB', image.size, (255, 255, 255))
+                    background.paste(image, mask=image.getchannel('A'))
+                    image = background
+            elif image.mode not in ('RGB', 'L'):
+                image = image.convert('RGB')
+            if image.width > width:
+                height = max(1, round(image.height * width / image.width))
+                image = image.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+            out = BytesIO()
+            image.save(out, pil_format, **options)
+    except (OSError, SyntaxError, ValueError, Image.DecompressionBombError) as e:
+        # UnidentifiedImageError 메시지에는 BytesIO repr이 들어가므로 종류만 남긴다
+        raise ThumbnailError(f"이미지를 읽을 수 없습니다: {type(e).__name__}") from None
+    return out.getvalue()
+
+
+def origin_digest(url: str) -> Optional[str]:
+    """ORIGIN_REVALIDATE_SECONDS 안에 받은 이 URL 원본의 내용 해시. 받은 적이 없거나 오래됐으면 None"""
+    ref = _cache_read(_ref_key(url), '.ref')
+    if ref is None:
+        return None
+    try:
+        fetched_at, digest = ref.decode('ascii').split()
+        fresh = time.time() - float(fetched_at) < ORIGIN_REVALIDATE_SECONDS
+    except ValueError:
+        return None
+    return digest if fresh else None
+
+
+def get_thumbnail(url: str, width: int, fmt: str) -> Tuple[str, bytes]:
+    """
+    (variant_key, 썸네일). 원본 해시가 아직 유효하면 캐시된 썸네일 또는 캐시된 원본으로 만들고,
+    아니면 원본을 다시 받는다. 받은 원본이 전과 같으면 있던 썸네일을 그대로 쓴다
+    """
+    suffix = '.' + fmt
+    digest = origin_digest(url)
+    origin = None
+    if digest is not None:
+        key = variant_key(digest, width, fmt)
+        data = _cache_read(key, suffix)
+        if data is not None:
+            return key, data
+        origin = _cache_read(digest, '.src')
+
+    fetched = origin is None
+    if fetched:
+        origin = _fetch_origin(url)
+        digest = hashlib.sha1(origin).hexdigest()
+    key = variant_key(digest, width, fmt)
+    data = _cache_read(key, suffix) if fetched else None
+    if data is None:
+        data = render_thumbnail(origin, width, fmt)
+        _cache_write(key, suffix, data)
+    if fetched:
+        # 이미지로 읽히는 것을 확인한 원본만 남긴다 (오류 페이지를 캐시해 두지 않게)
+        _cache_write(digest, '.src', origin)
+        _cache_write(_ref_key(url), '.ref', f"{time.time()} {digest}".encode('ascii'))
+    return key, data
@@ -1,20 +1,41 @@
-import json
-from typing import List, Dict, Any
+import logging
 
+from django.core.cache import cache
 from django.db import transaction
-from django.db.models import Q, Count
+from django.db.models import Count, F, Q
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.urls import reverse
 from rest_framework import generics, status
+from rest_framework.negotiation import DefaultContentNegotiation
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from .models import Room, RoomImage, Review
-from .serializers import RoomSerializer, ReviewSerializer, RoomStatsResponseSerializer, RoomSearchResponseSerializer, ImportRoomsResponseSerializer, RoomRatingStatsResponseSerializer, ReviewListItemSerializer
-from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample, OpenApiResponse
+from .models import Room, RoomCluster, RoomImage, RoomImportJob, Review
+from .filters import RoomRangeFilter, compute_facets
+from .fieldsets import FIELDSET_PARAMETERS, FieldsetViewMixin, resolve_fieldset, with_images
+from .pagination import RoomCursorPagination
+from .renderers import CSVRenderer, NDJSONRenderer
+from .cache import conditional_headers, etag_for, etag_matches, get_data_version, get_data_version_state, get_or_compute, is_not_modified, versioned_key
+from .utils.autocomplete import autocomplete_index
+from .utils.export import csv_stream, iter_room_chunks, json_list_stream, ndjson_stream
+from .utils.clusters import cluster_precision_for_zoom, refresh_clusters
+from .utils.geo import cell_range, parse_bbox, viewport_cells
+from .utils.nearby import coordinates, nearest_rooms, room_position
+from .utils.json_stream import JSONStreamError, iter_json_items
+from .utils.room_importer import import_rooms
+from .utils.price_stats import METRICS, PERCENTILES, get_market, market_breakdown, percentile_rank, price_snapshot
+from .utils.search_index import match_upper_bound, normalize_text, search_rooms
+from .utils.thumbnails import DEFAULT_WIDTH, ORIGIN_REVALIDATE_SECONDS, THUMBNAIL_FORMATS, THUMBNAIL_WIDTHS, ThumbnailBusyError, ThumbnailError, get_thumbnail, origin_digest, variant_key
+from .serializers import RoomSerializer, ReviewSerializer, RoomStatsResponseSerializer, RoomPriceStatsResponseSerializer, RoomSearchResponseSerializer, RoomMapResponseSerializer, RoomClusterResponseSerializer, RoomNearbyResponseSerializer, RoomAutocompleteResponseSerializer, RoomBatchRequestSerializer, RoomBatchResponseSerializer, ImportRoomsResponseSerializer, RoomImportJobSerializer, RoomRatingStatsResponseSerializer, ReviewListItemSerializer
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiExample, OpenApiResponse
+from drf_spectacular.types import OpenApiTypes
+
+logger = logging.getLogger(__name__)
 
 @extend_schema(
     tags=['rooms'],
     summary='방 통계 및 검색 옵션',
-    description='방 타입별 통계, 지역별 통계, 검색 옵션을 제공합니다.',
+    description='방 타입별 통계, 지역별 통계, 검색 옵션을 제공합니다. 응답에는 데이터 버전 기반 ETag가 붙으며, If-None-Match가 일치하면 304를 반환합니다.',
     responses={
         200: OpenApiResponse(
             response=RoomStatsResponseSerializer,
@@ -41,7 +62,8 @@ from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExampl
                     status_codes=['200']
                 )
             ]
-        )
+        ),
+        304: OpenApiResponse(description='변경 없음 (If-None-Match 일치)'),
     }
 )
 class RoomStatsView(APIView):
@@ -51,49 +73,162 @@ class RoomStatsView(APIView):
     permission_classes = [AllowAny]
     
     def get(self, request):
+        # 데이터 버전이 같으면 통계도 같으므로 버전으로 ETag/캐시 키를 만든다
+        version = get_data_version()
+        etag = etag_for('room-stats', version)
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=conditional_headers(etag))
+
+        payload = get_or_compute(versioned_key('room-stats', version=version), self._build_stats)
+        return Response(payload, headers=conditional_headers(etag))
+
+    def _build_stats(self):
         # 방 타입별 개수
-        room_type_stats = Room.objects.values('room_type').annotate(
-            count=Count('id')
-        ).order_by('-count')
+        room_type_stats = list(
+            Room.objects.values('room_type').annotate(count=Count('id')).order_by('-count')
+        )
         
         # 전체 방 개수
-        total_rooms = Room.objects.count()
-        
-        # 지역별 방 개수 (구 단위)
-        region_stats = []
-        for room in Room.objects.values('address').distinct():
-            if room['address']:
-                # 주소에서 구 추출 (예: "중랑구 중화동" -> "중랑구")
-                address_parts = room['address'].split()
-                if len(address_parts) > 0:
-                    region = address_parts[0]
-                    region_stats.append(region)
+        total_rooms = sum(item['count'] for item in room_type_stats)
         
-        # 구별 개수 집계
-        from collections import Counter
-        region_counts = Counter(region_stats)
-        region_stats = [{'region': region, 'count': count} for region, count in region_counts.most_common()]
+        # 지역별 방 개수 (구 단위, 저장 시 주소에서 뽑아둔 region_gu로 집계)
+        region_stats = list(
+            Room.objects.exclude(region_gu=None)
+            .values(region=F('region_gu'))
+            .annotate(count=Count('id'))
+            .order_by('-count', 'region')
+        )
         
-        return Response({
+        return {
             'total_rooms': total_rooms,
-            'room_type_stats': list(room_type_stats),
+            'room_type_stats': room_type_stats,
             'region_stats': region_stats,
             'search_options': {
                 'room_types': [item['room_type'] for item in room_type_stats if item['room_type']],
                 'regions': [item['region'] for item in region_stats]
             }
-        })
+        }
+
+
+@extend_schema(
+    tags=['rooms'],
+    summary='가격 분포/퍼센타일',
+    description='구(region)와 방 타입별 보증금, 월세, ㎡당 월세(월세/전용면적)의 p10/p50/p90과 히스토그램을 제공합니다. '
+                'deposit/monthly_fee/fee_per_m2 값을 주면 해당 가격이 선택한 시장에서 몇 퍼센타일인지 함께 반환합니다. '
+                '분포는 방 데이터가 바뀔 때만 다시 계산하며, 응답의 ETag로 304 응답을 받을 수 있습니다.',
+    parameters=[
+        OpenApiParameter(name='region', description='구 (예: 중랑구). 생략하면 전체', required=False, type=str),
+        OpenApiParameter(name='room_type', description='방 타입 (예: 원룸). 생략하면 전체', required=False, type=str),
+        OpenApiParameter(name='deposit', description='퍼센타일을 알고 싶은 보증금', required=False, type=float),
+        OpenApiParameter(name='monthly_fee', description='퍼센타일을 알고 싶은 월세', required=False, type=float),
+        OpenApiParameter(name='fee_per_m2', description='퍼센타일을 알고 싶은 ㎡당 월세', required=False, type=float),
+    ],
+    responses={
+        200: OpenApiResponse(
+            response=RoomPriceStatsResponseSerializer,
+            description='가격 분포',
+            examples=[
+                OpenApiExample(
+                    '가격 분포 예시',
+                    value={
+                        'region': '중랑구',
+                        'room_type': '원룸',
+                        'count': 120,
+                        'metrics': {
+                            'monthly_fee': {
+                                'count': 120, 'min': 250000, 'max': 700000,
+                                'p10': 330000, 'p50': 450000, 'p90': 600000,
+                                'histogram': [{'min': 250000, 'max': 290000, 'count': 4}],
+                                'percentile_rank': 30.4
+                            }
+                        },
+                        'markets': [
+                            {
+                                'region': '중랑구', 'room_type': '원룸', 'count': 120,
+                                'deposit': {'p10': 3000000, 'p50': 5000000, 'p90': 10000000},
+                                'monthly_fee': {'p10': 330000, 'p50': 450000, 'p90': 600000},
+                                'fee_per_m2': {'p10': 17000.0, 'p50': 22500.0, 'p90': 30100.5}
+                            }
+                        ]
+                    },
+                    response_only=True,
+                    status_codes=['200']
+                )
+            ]
+        ),
+        304: OpenApiResponse(description='변경 없음 (If-None-Match 일치)'),
+        400: OpenApiResponse(description='잘못된 가격 값'),
+    }
+)
+class RoomPriceStatsView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        params = request.query_params
+        region = params.get('region') or None
+        room_type = params.get('room_type') or None
+        try:
+            probes = {metric: float(params[metric]) for metric in METRICS if params.get(metric)}
+        except ValueError:
+            return Response({"detail": "가격 값은 숫자여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+        version = get_data_version()
+        etag = etag_for('room-price-stats', version, region, room_type, probes)
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=conditional_headers(etag))
+
+        snapshot = price_snapshot.get(version)
+        market = get_market(snapshot, region, room_type)
+        metrics = {}
+        for metric in METRICS:
+            metrics[metric] = dict(market.summary[metric])
+            if metric in probes:
+                metrics[metric]['percentile_rank'] = percentile_rank(market, metric, probes[metric])
+
+        markets = []
+        for key in market_breakdown(snapshot, region, room_type):
+            summary = snapshot.markets[key].summary
+            markets.append({
+                'region': key[0],
+                'room_type': key[1],
+                'count': snapshot.markets[key].count,
+                **{
+                    metric: {f'p{p}': summary[metric][f'p{p}'] for p in PERCENTILES}
+                    for metric in METRICS
+                },
+            })
+
+        return Response({
+            'region': region,
+            'room_type': room_type,
+            'count': market.count,
+            'metrics': metrics,
+            'markets': markets,
+        }, headers=conditional_headers(etag))
 
 
 @extend_schema(
     tags=['rooms'],
     summary='방 검색',
-    description='지역명, 지하철역, 단지명으로 방을 검색하고 방 타입별로 필터링합니다.',
+    description='지역명, 지하철역, 단지명으로 방을 검색하고 방 타입별로 필터링합니다. 검색어는 제목/주소의 2글자 단위 색인으로 찾고 관련도순(제목 일치 우선)으로 정렬합니다.',
     parameters=[
         OpenApiParameter(name='q', description='검색어', required=False, type=str),
         OpenApiParameter(name='room_type', description='방 타입', required=False, type=str),
         OpenApiParameter(name='page', description='페이지 번호', required=False, type=int, default=1),
         OpenApiParameter(name='page_size', description='페이지 크기', required=False, type=int, default=20),
+        OpenApiParameter(name='deposit_min', description='보증금 최소 (원)', required=False, type=int),
+        OpenApiParameter(name='deposit_max', description='보증금 최대 (원)', required=False, type=int),
+        OpenApiParameter(name='monthly_fee_min', description='월세 최소 (원)', required=False, type=int),
+        OpenApiParameter(name='monthly_fee_max', description='월세 최대 (원)', required=False, type=int),
+        OpenApiParameter(name='maintenance_cost_min', description='관리비 최소 (원)', required=False, type=int),
+        OpenApiParameter(name='maintenance_cost_max', description='관리비 최대 (원)', required=False, type=int),
+        OpenApiParameter(name='real_area_min', description='전용면적 최소 (㎡)', required=False, type=float),
+        OpenApiParameter(name='real_area_max', description='전용면적 최대 (㎡)', required=False, type=float),
+        OpenApiParameter(name='contract_type', description='계약형태 (콤마 구분 복수 선택, 예: 월세,반전세)', required=False, type=str),
+        OpenApiParameter(name='facets', description='true면 방 타입/계약형태/월세 구간별 개수(facets)를 함께 반환', required=False, type=bool),
+        OpenApiParameter(name='count', description='exact(기본) 또는 estimate. estimate는 COUNT 없이 상한 추정치를 반환하고 exact=false로 표시', required=False, type=str),
+        OpenApiParameter(name='cursor', description='커서 페이지네이션. 첫 페이지는 빈 값, 이후 응답의 next/prev 값을 전달 (지정 시 page 무시)', required=False, type=str),
+        *FIELDSET_PARAMETERS,
     ],
     examples=[
         OpenApiExample(
@@ -126,11 +261,12 @@ class RoomStatsView(APIView):
                             }
                         ],
                         'total_count': 1,
+                        'exact': True,
                         'page': 1,
                         'page_size': 20,
                         'search_query': '강남',
                         'room_type': '원룸',
-                        'filters_applied': {'search_query': True, 'room_type': True}
+                        'filters_applied': {'search_query': True, 'room_type': True, 'ranges': {}}
                     },
                     response_only=True,
                     status_codes=['200']
@@ -152,22 +288,72 @@ class RoomSearchView(APIView):
         search_query = request.query_params.get('q', '').strip()  # 검색어
         room_type = request.query_params.get('room_type', '').strip()  # 방 타입
         
-        # 기본 쿼리셋
-        queryset = Room.objects.all().prefetch_related('images')
+        # 기본 쿼리셋 (fields/omit으로 images를 빼면 prefetch도 생략)
+        fieldset = resolve_fieldset(request.query_params, RoomSerializer)
+        serializer_context = {'request': request, 'fieldset': fieldset}
+        queryset = with_images(Room.objects.all(), fieldset)
         
-        # 검색어가 있는 경우: 제목, 주소에서 검색
+        # 검색어가 있는 경우: 제목, 주소의 bigram 색인으로 검색
+        ranked = False
         if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) |  # 제목에서 검색
-                Q(address__icontains=search_query)   # 주소에서 검색
-            )
+            queryset, ranked = search_rooms(queryset, search_query)
         
         # 방 타입 필터링
         if room_type:
             queryset = queryset.filter(room_type=room_type)
+
+        # 가격/면적 범위, 계약형태 필터
+        range_filter = RoomRangeFilter(request.query_params, queryset=queryset)
+        if not range_filter.is_valid():
+            return Response(range_filter.errors, status=status.HTTP_400_BAD_REQUEST)
+        queryset = range_filter.qs
+        range_filters = range_filter.active_filters()
         
-        # 검색 결과 정렬 (최신순)
-        queryset = queryset.order_by('-id')
+        # 검색 결과 정렬 (색인 검색은 관련도순, 그 외 최신순)
+        ordering = ('-relevance', '-id') if ranked else ('-id',)
+        queryset = queryset.order_by(*ordering)
+
+        filters_applied = {
+            'search_query': bool(search_query),
+            'room_type': bool(room_type),
+            'ranges': range_filters,
+        }
+
+        # 전체 개수: (검색어, 필터) 키로 캐시, count=estimate면 COUNT 없이 상한 추정치.
+        # 결과는 검색어 원문의 부분 일치로 거르므로 키도 정규화하지 않은 검색어를 쓴다 ("풀옵션, 원룸" != "풀옵션 원룸")
+        count_params = {
+            'q': search_query,
+            'room_type': room_type,
+            'filters': range_filters,
+        }
+        estimate = request.query_params.get('count') == 'estimate'
+        version = get_data_version()
+        total_count, exact = self._total_count(queryset, count_params, ranked, search_query, estimate, version)
+
+        # 패싯(facets=true): 현재 조건에서의 방 타입/계약형태/월세 구간별 개수, GROUP BY 한 번
+        extra = {}
+        if request.query_params.get('facets') in ('1', 'true'):
+            extra['facets'] = get_or_compute(
+                versioned_key('search-facets', count_params, version=version),
+                lambda: compute_facets(queryset),
+            )
+
+        # 커서 모드: cursor 파라미터가 있으면(첫 페이지는 빈 값) OFFSET 대신 keyset으로 읽음
+        if 'cursor' in request.query_params:
+            paginator = RoomCursorPagination(ordering=ordering)
+            rooms = paginator.paginate_queryset(queryset, request, view=self)
+            return Response({
+                'rooms': RoomSerializer(rooms, many=True, context=serializer_context).data,
+                'total_count': total_count,
+                'exact': exact,
+                'page_size': paginator.page_size_value,
+                'next': paginator.next_cursor,
+                'prev': paginator.prev_cursor,
+                'search_query': search_query,
+                'room_type': room_type,
+                'filters_applied': filters_applied,
+                **extra,
+            })
         
         # 페이지네이션 (선택사항)
         page_size = int(request.query_params.get('page_size', 20))
@@ -177,29 +363,347 @@ class RoomSearchView(APIView):
         end = start + page_size
         
         rooms = queryset[start:end]
-        total_count = queryset.count()
         
         # 시리얼라이징
-        serialized_rooms = RoomSerializer(rooms, many=True).data
+        serialized_rooms = RoomSerializer(rooms, many=True, context=serializer_context).data
         
         return Response({
             'rooms': serialized_rooms,
             'total_count': total_count,
+            'exact': exact,
             'page': page,
             'page_size': page_size,
             'search_query': search_query,
             'room_type': room_type,
-            'filters_applied': {
-                'search_query': bool(search_query),
-                'room_type': bool(room_type)
-            }
+            'filters_applied': filters_applied,
+            **extra,
+        })
+
+    def _total_count(self, queryset, count_params, ranked, search_query, estimate, version):
+        """(개수, 정확한 값 여부). 정확한 값은 데이터 버전 키로 캐시한다."""
+        count_key = versioned_key('search-count', count_params, version=version)
+        if not estimate:
+            return get_or_compute(count_key, queryset.count), True
+
+        cached = cache.get(count_key)
+        if cached is not None:
+            return cached, True
+
+        # 조건별 상한 중 최솟값: 전체 방 수, 방 타입별 방 수, 가장 드문 검색 bigram의 방 수
+        type_counts = get_or_compute(
+            versioned_key('room-type-counts', version=version),
+            lambda: dict(Room.objects.values_list('room_type').annotate(n=Count('id'))),
+        )
+        bounds = [sum(type_counts.values())]
+        if count_params['room_type']:
+            bounds.append(type_counts.get(count_params['room_type'], 0))
+        if ranked:
+            # 상한은 bigram만 보므로 정규화한 검색어로 공유한다
+            bounds.append(get_or_compute(
+                versioned_key('search-bound', normalize_text(search_query), version=version),
+                lambda: match_upper_bound(search_query),
+            ))
+        bound = min(bounds)
+        return bound, bound == 0
+
+
+@extend_schema(
+    tags=['rooms'],
+    summary='지도 영역 내 방 조회',
+    description='지도 뷰포트(bbox) 안의 방을 핀 표시용 최소 필드(id, 위경도, 월세, 썸네일)로 반환합니다. '
+                'geohash 인덱스 범위 스캔으로 조회하며, 결과가 limit을 넘으면 truncated=true입니다.',
+    parameters=[
+        OpenApiParameter(name='bbox', description='min_lng,min_lat,max_lng,max_lat', required=True, type=str),
+        OpenApiParameter(name='zoom', description='지도 줌 레벨', required=False, type=int, default=14),
+        OpenApiParameter(name='limit', description='최대 반환 개수 (최대 2000)', required=False, type=int, default=500),
+    ],
+    responses={
+        200: OpenApiResponse(
+            response=RoomMapResponseSerializer,
+            description='영역 내 방 목록',
+            examples=[
+                OpenApiExample(
+                    '지도 조회 예시',
+                    value={
+                        'zoom': 15,
+                        'count': 1,
+                        'truncated': False,
+                        'rooms': [
+                            {
+                                'id': 1,
+                                'lat': 37.6036059,
+                                'lng': 127.0766452,
+                                'monthly_fee': 400000,
+                                'thumbnail': 'https://img.peterpanz.com/photo/20250723/17851114/68809f91e5e93_thumb.jpg'
+                            }
+                        ]
+                    },
+                    response_only=True,
+                    status_codes=['200']
+                )
+            ]
+        ),
+        400: OpenApiResponse(description='잘못된 지도 범위')
+    }
+)
+class RoomMapView(APIView):
+    """
+    지도 뷰포트 조회 API
+    - bbox를 줌에 맞는 geohash 셀 몇 개로 덮고 셀별 범위 조회 후 정확한 위경도 범위로 거른다
+    """
+    permission_classes = [AllowAny]
+    default_limit = 500
+    max_limit = 2000
+
+    def get(self, request):
+        try:
+            min_lat, min_lng, max_lat, max_lng = parse_bbox(request.query_params.get('bbox', '').strip())
+            zoom = int(request.query_params.get('zoom', 14))
+            limit = min(int(request.query_params.get('limit', self.default_limit)), self.max_limit)
+        except ValueError as e:
+            return Response({"detail": f"잘못된 지도 범위: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        cells, _ = viewport_cells(min_lat, min_lng, max_lat, max_lng, zoom)
+        cell_filter = Q()
+        for cell in cells:
+            cell_filter |= Q(geohash__range=cell_range(cell))
+
+        rows = list(
+            Room.objects
+            .filter(cell_filter, latitude__range=(min_lat, max_lat), longitude__range=(min_lng, max_lng))
+            .order_by('-id')
+            .values_list('id', 'latitude', 'longitude', 'monthly_fee', 'thumbnail_url')[:max(limit, 0) + 1]
+        )
+        truncated = len(rows) > limit
+        rooms = [
+            {'id': room_id, 'lat': lat, 'lng': lng, 'monthly_fee': monthly_fee, 'thumbnail': thumb}
+            for room_id, lat, lng, monthly_fee, thumb in rows[:limit]
+        ]
+        return Response({'zoom': zoom, 'count': len(rooms), 'truncated': truncated, 'rooms': rooms})
+
+
+@extend_schema(
+    tags=['rooms'],
+    summary='지도 클러스터 조회',
+    description='줌 단계별로 미리 집계된 클러스터(셀별 방 개수, 중심점, 월세 최소/중앙값)를 반환합니다. '
+                '낮은 줌에서 개별 핀 대신 사용하며, 집계는 방 임포트/수정 시 바뀐 셀만 갱신됩니다.',
+    parameters=[
+        OpenApiParameter(name='bbox', description='min_lng,min_lat,max_lng,max_lat', required=True, type=str),
+        OpenApiParameter(name='zoom', description='지도 줌 레벨', required=False, type=int, default=10),
+    ],
+    responses={
+        200: OpenApiResponse(
+            response=RoomClusterResponseSerializer,
+            description='클러스터 목록',
+            examples=[
+                OpenApiExample(
+                    '클러스터 예시',
+                    value={
+                        'zoom': 12,
+                        'precision': 5,
+                        'clusters': [
+                            {
+                                'cell': 'wydmg',
+                                'count': 120,
+                                'lat': 37.6012,
+                                'lng': 127.0801,
+                                'min_monthly_fee': 250000,
+                                'median_monthly_fee': 450000
+                            }
+                        ]
+                    },
+                    response_only=True,
+                    status_codes=['200']
+                )
+            ]
+        ),
+        400: OpenApiResponse(description='잘못된 지도 범위')
+    }
+)
+class RoomClusterView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        try:
+            min_lat, min_lng, max_lat, max_lng = parse_bbox(request.query_params.get('bbox', '').strip())
+            zoom = int(request.query_params.get('zoom', 10))
+        except ValueError as e:
+            return Response({"detail": f"잘못된 지도 범위: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        precision = cluster_precision_for_zoom(zoom)
+        cells, _ = viewport_cells(min_lat, min_lng, max_lat, max_lng, min(zoom, 14))
+        cell_filter = Q()
+        for cell in cells:
+            cell_filter |= Q(cell__range=cell_range(cell[:precision]))
+
+        clusters = (
+            RoomCluster.objects
+            .filter(cell_filter, precision=precision,
+                    latitude__range=(min_lat, max_lat), longitude__range=(min_lng, max_lng))
+            .order_by('-count')
+            .values_list('cell', 'count', 'latitude', 'longitude', 'min_monthly_fee', 'median_monthly_fee')
+        )
+        return Response({
+            'zoom': zoom,
+            'precision': precision,
+            'clusters': [
+                {'cell': cell, 'count': count, 'lat': lat, 'lng': lng,
+                 'min_monthly_fee': min_fee, 'median_monthly_fee': median_fee}
+                for cell, count, lat, lng, min_fee, median_fee in clusters
+            ],
+        })
+
+
+@extend_schema(
+    tags=['rooms'],
+    summary='근처 방 조회',
+    description='지정한 위치(또는 room_id의 위치)에서 가까운 방 k개를 거리(m)와 함께 반환합니다. '
+                '거리는 메모리에 올려둔 좌표 배열로 계산하며, room_id를 주면 해당 방은 결과에서 제외합니다.',
+    parameters=[
+        OpenApiParameter(name='lat', description='위도 (room_id가 없으면 필수)', required=False, type=float),
+        OpenApiParameter(name='lng', description='경도 (room_id가 없으면 필수)', required=False, type=float),
+        OpenApiParameter(name='room_id', description='기준 방 ID ("이 방 근처 다른 매물")', required=False, type=int),
+        OpenApiParameter(name='k', description='반환 개수 (최대 50)', required=False, type=int, default=10),
+    ],
+    responses={
+        200: OpenApiResponse(
+            response=RoomNearbyResponseSerializer,
+            description='가까운 방 목록',
+            examples=[
+                OpenApiExample(
+                    '근처 방 예시',
+                    value={
+                        'count': 1,
+                        'rooms': [
+                            {
+                                'id': 2,
+                                'title': '중랑역 도보4분 투룸+베란다',
+                                'room_type': '투룸',
+                                'deposit': 10000000,
+                                'monthly_fee': 400000,
+                                'lat': 37.5960195787548,
+                                'lng': 127.073516315517,
+                                'thumbnail': 'https://img.peterpanz.com/photo/...',
+                                'distance_m': 874.3
+                            }
+                        ]
+                    },
+                    response_only=True,
+                    status_codes=['200']
+                )
+            ]
+        ),
+        400: OpenApiResponse(description='잘못된 좌표'),
+        404: OpenApiResponse(description='기준 방의 좌표를 찾을 수 없습니다'),
+    }
+)
+class RoomNearbyView(APIView):
+    permission_classes = [AllowAny]
+    default_k = 10
+    max_k = 50
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            k = max(1, min(int(params.get('k', self.default_k)), self.max_k))
+            room_id = int(params['room_id']) if params.get('room_id') else None
+            if room_id is None:
+                lat, lng = float(params['lat']), float(params['lng'])
+                if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+                    raise ValueError("좌표 범위를 벗어났습니다.")
+        except KeyError:
+            return Response({"detail": "lat, lng 또는 room_id가 필요합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        except ValueError as e:
+            return Response({"detail": f"잘못된 좌표: {e}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        coords = coordinates.get()
+        if room_id is not None:
+            position = room_position(coords, room_id)
+            if position is None:
+                return Response({"detail": "기준 방의 좌표를 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+            lat, lng = position
+
+        nearest = nearest_rooms(coords, lat, lng, k, exclude_id=room_id)
+        rooms_by_id = {
+            row['id']: row
+            for row in Room.objects.filter(id__in=[rid for rid, _ in nearest])
+            .values('id', 'title', 'room_type', 'deposit', 'monthly_fee', 'latitude', 'longitude', 'thumbnail_url')
+        }
+        rooms = []
+        for rid, distance in nearest:
+            row = rooms_by_id.get(rid)
+            if row is None:  # 스냅샷 이후 삭제된 방
+                continue
+            rooms.append({
+                'id': rid,
+                'title': row['title'],
+                'room_type': row['room_type'],
+                'deposit': row['deposit'],
+                'monthly_fee': row['monthly_fee'],
+                'lat': row['latitude'],
+                'lng': row['longitude'],
+                'thumbnail': row['thumbnail_url'],
+                'distance_m': round(distance, 1),
+            })
+        return Response({'count': len(rooms), 'rooms': rooms})
+
+
+@extend_schema(
+    tags=['rooms'],
+    summary='검색어 자동완성',
+    description='입력한 앞부분(prefix)으로 시작하는 구/동/단지명과 지하철역명을 해당 방 개수순으로 제안합니다. '
+                '메모리 색인에서 조회하며 방 데이터가 바뀌면 색인을 다시 만듭니다.',
+    parameters=[
+        OpenApiParameter(name='prefix', description='입력 중인 검색어', required=True, type=str),
+        OpenApiParameter(name='limit', description='최대 제안 개수 (최대 20)', required=False, type=int, default=10),
+    ],
+    responses={
+        200: OpenApiResponse(
+            response=RoomAutocompleteResponseSerializer,
+            description='자동완성 제안',
+            examples=[
+                OpenApiExample(
+                    '자동완성 예시',
+                    value={
+                        'prefix': '중',
+                        'suggestions': [
+                            {'text': '중랑구', 'kind': 'gu', 'count': 190},
+                            {'text': '중화동', 'kind': 'dong', 'count': 53},
+                            {'text': '중화역', 'kind': 'station', 'count': 31}
+                        ]
+                    },
+                    response_only=True,
+                    status_codes=['200']
+                )
+            ]
+        )
+    }
+)
+class RoomAutocompleteView(APIView):
+    permission_classes = [AllowAny]
+    default_limit = 10
+    max_limit = 20
+
+    def get(self, request):
+        prefix = request.query_params.get('prefix', '').strip()
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', self.default_limit)), self.max_limit))
+        except ValueError:
+            limit = self.default_limit
+
+        suggestions = autocomplete_index.get().lookup(prefix, limit) if prefix else []
+        return Response({
+            'prefix': prefix,
+            'suggestions': [s._asdict() for s in suggestions],
         })
 
 
 @extend_schema(
     tags=['rooms'],
     summary='방 목록 조회 및 생성',
-    description='모든 방 목록을 조회하거나 새로운 방을 생성합니다.',
+    description='방 목록을 최신순 커서 페이지네이션으로 조회하거나 새로운 방을 생성합니다. 다음/이전 페이지는 응답의 next/prev 값을 cursor 파라미터로 전달합니다. '
+                '조회 시 fields/omit/expand로 응답 필드를 줄일 수 있으며, images를 빼면 이미지 조회 쿼리도 생략합니다.',
+    parameters=[*FIELDSET_PARAMETERS],
     request={
         'application/json': {
             'type': 'object',
@@ -282,34 +786,262 @@ class RoomSearchView(APIView):
         400: '잘못된 요청 데이터'
     }
 )
-class RoomListCreateView(generics.ListCreateAPIView):
-    queryset = Room.objects.all().prefetch_related('images')
+class RoomListCreateView(FieldsetViewMixin, generics.ListCreateAPIView):
+    queryset = Room.objects.all()
+    pagination_class = RoomCursorPagination
     serializer_class = RoomSerializer
     permission_classes = [AllowAny]
 
+    def list(self, request, *args, **kwargs):
+        # 목록은 데이터 버전이 같으면 (같은 쿼리 파라미터에 대해) 내용도 같다
+        version, last_modified = get_data_version_state()
+        etag = etag_for('room-list', version, request.query_params.urlencode())
+        headers = conditional_headers(etag, last_modified)
+        if is_not_modified(request, etag, last_modified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response = super().list(request, *args, **kwargs)
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    def perform_create(self, serializer):
+        room = serializer.save()
+        refresh_clusters([room.geohash])
+
+
+_BATCH_RESPONSES = {
+    200: OpenApiResponse(
+        response=RoomBatchResponseSerializer,
+        description='요청 순서대로의 방 목록과 없는 ID 목록',
+        examples=[
+            OpenApiExample(
+                '일괄 조회 예시',
+                value={'rooms': [{'id': 3, 'title': '...', 'images': []}, {'id': 1, 'title': '...', 'images': []}], 'missing': [999]},
+                response_only=True,
+                status_codes=['200']
+            )
+        ]
+    ),
+    400: OpenApiResponse(description='잘못된 ids'),
+}
+
+
+@extend_schema_view(
+    get=extend_schema(
+        tags=['rooms'],
+        summary='방 일괄 조회',
+        description='여러 방을 한 번에 조회합니다 (비교 화면 등). 방과 이미지를 쿼리 2번으로 읽고 요청한 순서대로 반환하며, '
+                    '없는 ID는 실패 대신 missing에 담습니다. 중복 ID는 한 번만 반환합니다.',
+        parameters=[
+            OpenApiParameter(name='ids', description='방 ID 목록 (콤마 구분, 최대 100개)', required=True, type=str),
+            *FIELDSET_PARAMETERS,
+        ],
+        responses=_BATCH_RESPONSES,
+    ),
+    post=extend_schema(
+        tags=['rooms'],
+        summary='방 일괄 조회 (긴 ID 목록)',
+        description='GET과 같지만 ID 목록을 본문 {"ids": [...]}로 받습니다. 최대 1000개까지 조회할 수 있습니다.',
+        parameters=FIELDSET_PARAMETERS,
+        request=RoomBatchRequestSerializer,
+        responses=_BATCH_RESPONSES,
+    ),
+)
+class RoomBatchView(APIView):
+    permission_classes = [AllowAny]
+    # GET은 ID가 쿼리스트링에 들어가므로 URL 길이에 맞춰 작게, POST는 긴 목록용
+    max_ids = 100
+    max_post_ids = 1000
+
+    def get(self, request):
+        try:
+            ids = [int(part) for part in request.query_params.get('ids', '').split(',') if part.strip()]
+        except ValueError:
+            return Response({"ids": "ID는 정수여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        return self._batch(request, ids, self.max_ids)
+
+    def post(self, request):
+        serializer = RoomBatchRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return self._batch(request, serializer.validated_data['ids'], self.max_post_ids)
+
+    def _batch(self, request, ids, max_ids):
+        ids = list(dict.fromkeys(ids))  # 순서를 유지한 채 중복 제거
+        if not ids:
+            return Response({"ids": "ids가 필요합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > max_ids:
+            return Response({"ids": f"한 번에 최대 {max_ids}개까지 조회할 수 있습니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+        fieldset = resolve_fieldset(request.query_params, RoomSerializer)
+        rooms_by_id = {room.id: room for room in with_images(Room.objects.filter(id__in=ids), fieldset)}
+        rooms = [rooms_by_id[room_id] for room_id in ids if room_id in rooms_by_id]
+        return Response({
+            'rooms': RoomSerializer(rooms, many=True, context={'request': request, 'fieldset': fieldset}).data,
+            'missing': [room_id for room_id in ids if room_id not in rooms_by_id],
+        })
+
+
+@extend_schema(
+    tags=['rooms'],
+    summary='방 데이터 내보내기',
+    description='전체 방 데이터를 NDJSON(한 줄에 방 하나, 목록 API와 같은 필드) 또는 CSV로 스트리밍합니다. '
+                '서버는 1000건씩 읽어 바로 내보내므로 데이터 크기와 관계없이 메모리를 일정하게 사용합니다. '
+                'CSV의 image_urls 열은 이미지 URL을 순서대로 "|"로 이어 붙인 값입니다.',
+    parameters=[
+        OpenApiParameter(name='format', description='ndjson 또는 csv', required=True, type=str, enum=['ndjson', 'csv']),
+    ],
+    responses={
+        (200, 'application/x-ndjson'): OpenApiResponse(response=OpenApiTypes.STR, description='방 한 줄씩 (JSON)'),
+        (200, 'text/csv'): OpenApiResponse(response=OpenApiTypes.STR, description='헤더 + 방 한 줄씩 (CSV)'),
+        404: OpenApiResponse(description='지원하지 않는 format'),
+    }
+)
+class RoomExportView(APIView):
+    permission_classes = [AllowAny]
+    renderer_classes = [NDJSONRenderer, CSVRenderer]
+
+    def get(self, request):
+        renderer = request.accepted_renderer
+        if renderer.format == 'csv':
+            stream, filename = csv_stream(iter_room_chunks()), 'rooms.csv'
+        else:
+            stream, filename = ndjson_stream(iter_room_chunks()), 'rooms.ndjson'
+        response = StreamingHttpResponse(stream, content_type=f'{renderer.media_type}; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
 
 @extend_schema(
     tags=['rooms'],
     summary='방 상세 조회, 수정, 삭제',
-    description='특정 방의 상세 정보를 조회, 수정, 삭제합니다.',
+    description='특정 방의 상세 정보를 조회, 수정, 삭제합니다. 조회 시 fields/omit/expand로 응답 필드를 줄일 수 있습니다.',
     parameters=[
         OpenApiParameter(name='pk', description='방 ID', required=True, type=int),
+        *FIELDSET_PARAMETERS,
     ],
     responses={
         200: RoomSerializer,
         404: '방을 찾을 수 없습니다',
     }
 )
-class RoomDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Room.objects.all().prefetch_related('images')
+class RoomDetailView(FieldsetViewMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = Room.objects.all()
     serializer_class = RoomSerializer
     permission_classes = [AllowAny]
 
+    def retrieve(self, request, *args, **kwargs):
+        # updated_at 한 컬럼만 읽어 304 여부를 먼저 판단 (직렬화/이미지 조회 생략)
+        updated_at = Room.objects.filter(pk=kwargs['pk']).values_list('updated_at', flat=True).first()
+        if updated_at is None:
+            return super().retrieve(request, *args, **kwargs)
+        etag = etag_for(f"room-{kwargs['pk']}", int(updated_at.timestamp() * 1_000_000), request.query_params.urlencode())
+        headers = conditional_headers(etag, updated_at)
+        if is_not_modified(request, etag, updated_at):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response = super().retrieve(request, *args, **kwargs)
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    def perform_update(self, serializer):
+        old_geohash = serializer.instance.geohash
+        room = serializer.save()
+        refresh_clusters([old_geohash, room.geohash])
+
+    def perform_destroy(self, instance):
+        geohash = instance.geohash
+        instance.delete()
+        refresh_clusters([geohash])
+
+
+class _FirstRendererNegotiation(DefaultContentNegotiation):
+    """이미지 응답은 렌더러를 거치지 않으므로 Accept(image/* 등)와 관계없이 JSON 렌더러(에러 응답용)를 고른다"""
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+@extend_schema(
+    tags=['rooms'],
+    summary='방 이미지 썸네일',
+    description='원본 이미지를 고정 너비의 WebP/JPEG로 줄여 돌려줍니다. 원본은 한 번만 받아 서버 디스크에 캐시하며, '
+                '원본은 하루가 지나면 다시 받아 바뀌었는지 확인하며, ETag는 원본 내용 해시로 만들어 원본이 바뀌면 달라집니다. '
+                '응답은 하루 동안 캐시할 수 있고 이후 ETag로 재검증합니다.',
+    parameters=[
+        OpenApiParameter(name='pk', description='이미지 ID (RoomImage)', required=True, type=int),
+        OpenApiParameter(
+            name='w', description=f'너비(px). 생략하면 {DEFAULT_WIDTH}. 원본이 더 작으면 원본 너비',
+            required=False, type=int, enum=list(THUMBNAIL_WIDTHS),
+        ),
+        OpenApiParameter(name='fmt', description='이미지 형식 (기본 webp)', required=False, type=str, enum=list(THUMBNAIL_FORMATS)),
+    ],
+    responses={
+        (200, 'image/webp'): OpenApiResponse(response=OpenApiTypes.BINARY, description='WebP 썸네일'),
+        (200, 'image/jpeg'): OpenApiResponse(response=OpenApiTypes.BINARY, description='JPEG 썸네일'),
+        304: OpenApiResponse(description='변경 없음 (If-None-Match 일치)'),
+        400: OpenApiResponse(description='지원하지 않는 w/fmt'),
+        404: OpenApiResponse(description='이미지를 찾을 수 없습니다'),
+        502: OpenApiResponse(description='원본 이미지를 받지 못했거나 읽을 수 없음'),
+        503: OpenApiResponse(description='원본을 받는 요청이 많아 지금은 만들 수 없음 (Retry-After 뒤 다시 요청)'),
+    }
+)
+class RoomImageThumbnailView(APIView):
+    permission_classes = [AllowAny]
+    content_negotiation_class = _FirstRendererNegotiation
+    # 주소(이미지 id)는 그대로인데 원본이 바뀔 수 있으므로 원본을 다시 확인하는 주기만큼만 캐시하게 한다
+    cache_control = f'public, max-age={ORIGIN_REVALIDATE_SECONDS}'
+
+    def get(self, request, pk):
+        try:
+            width = int(request.query_params.get('w', DEFAULT_WIDTH))
+        except ValueError:
+            width = None
+        if width not in THUMBNAIL_WIDTHS:
+            return Response({"detail": f"w는 {', '.join(map(str, THUMBNAIL_WIDTHS))} 중 하나여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+        fmt = request.query_params.get('fmt', 'webp')
+        if fmt not in THUMBNAIL_FORMATS:
+            return Response({"detail": f"fmt는 {', '.join(THUMBNAIL_FORMATS)} 중 하나여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+        url = RoomImage.objects.filter(pk=pk).values_list('image_url', flat=True).first()
+        if not url:
+            return Response({"detail": "이미지를 찾을 수 없습니다."}, status=status.HTTP_404_NOT_FOUND)
+        # 원본 해시가 아직 유효하면 원본/썸네일을 읽지 않고 304를 판단한다
+        digest = origin_digest(url)
+        if digest is not None:
+            headers = {'ETag': f'"{variant_key(digest, width, fmt)}"', 'Cache-Control': self.cache_control}
+            if etag_matches(request, headers['ETag']):
+                return HttpResponseNotModified(headers=headers)
+        try:
+            key, data = get_thumbnail(url, width, fmt)
+        except ThumbnailBusyError:
+            return Response(
+                {"detail": "잠시 후 다시 시도해 주세요."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={'Retry-After': '1'},
+            )
+        except ThumbnailError as e:
+            # 원본 서버의 응답/주소는 로그에만 남긴다 (클라이언트에게 내부 요청 결과를 보여 주지 않게)
+            logger.warning("Thumbnail for image %s failed: %s", pk, e)
+            return Response({"detail": "원본 이미지를 가져오지 못했습니다."}, status=status.HTTP_502_BAD_GATEWAY)
+        headers = {'ETag': f'"{key}"', 'Cache-Control': self.cache_control}
+        if etag_matches(request, headers['ETag']):
+            return HttpResponseNotModified(headers=headers)
+        return HttpResponse(data, content_type=THUMBNAIL_FORMATS[fmt][1], headers=headers)
+
 
 @extend_schema(
     tags=['rooms'],
     summary='방 데이터 대량 임포트',
-    description='JSON 파일이나 데이터를 통해 방 정보를 대량으로 임포트합니다. real-estate.json의 한글 키를 그대로 지원합니다.',
+    description='JSON 파일이나 데이터를 통해 방 정보를 대량으로 임포트합니다. real-estate.json의 한글 키를 그대로 지원합니다. '
+                '입력은 매물 단위로 스트리밍 파싱하므로 파일 크기와 무관하게 메모리 사용량이 일정합니다 (배열, items/data/results 래퍼, NDJSON). '
+                '파일 업로드(multipart)는 임포트 작업으로 저장하고 202를 돌려주며, 요청 본문은 요청 안에서 바로 처리해 201을 돌려줍니다. '
+                '요청 본문 임포트의 응답 크기는 response 파라미터로 고릅니다.',
+    parameters=[
+        OpenApiParameter(
+            name='response', required=False, type=str, enum=['summary', 'ids', 'full'],
+            description='summary: 건수만 / ids: 건수 + 매물ID→방 id / full: 건수 + 방 전체(스트리밍). '
+                        '생략하면 100건 이하는 full, 넘으면 ids',
+        ),
+    ],
     request={
         'multipart/form-data': {
             'type': 'object',
@@ -317,7 +1049,7 @@ class RoomDetailView(generics.RetrieveUpdateDestroyAPIView):
                 'file': {
                     'type': 'string',
                     'format': 'binary',
-                    'description': 'real-estate.json 형식의 JSON 파일 업로드'
+                    'description': 'real-estate.json 형식의 JSON 파일 업로드 (배열, items/data/results 래퍼, NDJSON). 백그라운드 작업으로 처리되어 202를 돌려준다'
                 }
             }
         },
@@ -368,107 +1100,109 @@ class RoomDetailView(generics.RetrieveUpdateDestroyAPIView):
                     '이미지URL': ['https://img.peterpanz.com/photo/20250723/17851114/68809f91e5e93_thumb.jpg']
                 }
             ]
+        },
+        'application/x-ndjson': {
+            'type': 'string',
+            'description': '한 줄에 매물 객체 하나 (키는 application/json 항목과 동일)'
         }
     },
     responses={
         201: OpenApiResponse(
             response=ImportRoomsResponseSerializer,
-            description='임포트 결과',
+            description='임포트 결과 (response=summary면 건수만, ids면 ids, full이면 rooms가 함께 온다)',
             examples=[
                 OpenApiExample(
-                    '임포트 성공 예시',
-                    value={'created': 10, 'updated': 5, 'rooms': []},
+                    '임포트 성공 예시 (response=ids)',
+                    value={'created': 10, 'updated': 5, 'unchanged': 985, 'ids': {'17851114': 1, '17851115': 2}},
+                    response_only=True,
+                    status_codes=['201']
+                ),
+                OpenApiExample(
+                    '임포트 성공 예시 (response=full)',
+                    value={'created': 10, 'updated': 5, 'unchanged': 985, 'rooms': []},
                     response_only=True,
                     status_codes=['201']
                 )
             ]
         ),
+        202: OpenApiResponse(
+            response=RoomImportJobSerializer,
+            description='파일 업로드: 임포트 작업 생성 (Location 헤더의 작업 조회 API로 진행 상황 확인)',
+        ),
         400: OpenApiResponse(description='입력 파싱 오류')
     }
 )
 class ImportRoomsView(APIView):
     permission_classes = [AllowAny]
+    response_modes = ('summary', 'ids', 'full')
+    # response를 지정하지 않았을 때 full(방 전체)로 돌려주는 최대 건수. 넘으면 ids
+    full_response_limit = 100
 
-    KOREAN_KEY_MAP = {
-        "매물ID": "external_id",
-        "제목": "title",
-        "방종류": "room_type",
-        "월세": "monthly_fee",
-        "보증금": "deposit",
-        "관리비": "maintenance_cost",
-        "공급면적": "supply_area",
-        "전용면적": "real_area",
-        "층수": "floor",
-        "계약형태": "contract_type",
-        "주소": "address",
-        "위도": "latitude",
-        "경도": "longitude",
-        "이미지URL": "images",
-    }
+    def _enqueue_upload(self, request):
+        """
+        파일 업로드는 파일만 저장하고 임포트 작업을 만든 뒤 바로 202로 끝낸다.
+        실제 임포트는 process_import_jobs 워커가 chunk 단위로 커밋하며 처리한다 (gunicorn 타임아웃/워커 점유 방지)
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"detail": "입력 파싱 오류: file 필드로 JSON 파일을 업로드해주세요."}, status=status.HTTP_400_BAD_REQUEST)
+        job = RoomImportJob()
+        job.source.save(upload.name, upload)
+        return Response(
+            RoomImportJobSerializer(job).data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={'Location': reverse('room-import-job', args=[job.pk])},
+        )
 
-    def _normalize_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
-        norm = {}
-        for k, v in item.items():
-            if k not in self.KOREAN_KEY_MAP:
-                continue
-            target = self.KOREAN_KEY_MAP[k]
-            if target == "images":
-                norm["images"] = v or []
-            else:
-                norm[target] = v
-        return norm
-
-    def _load_payload(self, request) -> List[Dict[str, Any]]:
-        if 'file' in request.FILES:
-            data = json.loads(request.FILES['file'].read().decode('utf-8'))
-        else:
-            data = request.data
-        if isinstance(data, list):
-            return data
-        if isinstance(data, dict):
-            for key in ("items", "data", "results"):
-                if key in data and isinstance(data[key], list):
-                    return data[key]
-        raise ValueError("리스트 형태의 JSON 또는 items/data/results 키로 리스트를 전달해주세요.")
+    def post(self, request, *args, **kwargs):
+        if request.content_type.startswith('multipart/'):
+            return self._enqueue_upload(request)
+        return self._import_body(request)
 
     @transaction.atomic
-    def post(self, request, *args, **kwargs):
+    def _import_body(self, request):
+        # 요청 본문(배열/래퍼 객체/NDJSON)은 요청 안에서 바로 처리한다. request.data는 본문 전체를 파싱하므로 쓰지 않고
+        # 매물 단위로 읽어 chunk 단위 bulk upsert (rooms.utils.room_importer).
+        # 요청 전체가 하나의 트랜잭션이라 중간에 형식 오류가 나면 앞 chunk까지 모두 되돌린다
+        mode = request.query_params.get('response')
+        if mode is not None and mode not in self.response_modes:
+            return Response(
+                {"detail": f"response는 {'/'.join(self.response_modes)} 중 하나여야 합니다."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if request.stream is None:
+            return Response({"detail": "입력 파싱 오류: 요청 본문이 비어 있습니다."}, status=status.HTTP_400_BAD_REQUEST)
         try:
-            raw_items = self._load_payload(request)
-        except Exception as e:
+            result = import_rooms(iter_json_items(request.stream))
+        except JSONStreamError as e:
+            transaction.set_rollback(True)
             return Response({"detail": f"입력 파싱 오류: {e}"}, status=status.HTTP_400_BAD_REQUEST)
 
-        created, updated = 0, 0
-        room_ids = []
-
-        for raw in raw_items:
-            item = self._normalize_item(raw)
-            images = item.pop("images", [])
-            external_id = item.get("external_id", None)
-
-            if external_id is not None:
-                room, is_created = Room.objects.update_or_create(
-                    external_id=external_id, defaults=item
-                )
-            else:
-                room = Room.objects.create(**item)
-                is_created = True
-
-            RoomImage.objects.filter(room=room).delete()
-            for idx, url in enumerate(images):
-                if url:
-                    RoomImage.objects.create(room=room, image_url=url, ordering=idx)
+        if mode is None:
+            mode = 'full' if len(result.room_ids) <= self.full_response_limit else 'ids'
+        counts = {"created": result.created, "updated": result.updated, "unchanged": result.unchanged}
+        if mode == 'summary':
+            return Response(counts, status=status.HTTP_201_CREATED)
+        if mode == 'ids':
+            return Response({**counts, "ids": result.id_map}, status=status.HTTP_201_CREATED)
+        # full: 방 목록은 커밋 뒤 chunk 단위로 읽고 직렬화하며 흘려보낸다 (응답 전체를 메모리에 만들지 않음)
+        return StreamingHttpResponse(
+            json_list_stream(counts, 'rooms', iter_room_chunks(ids=result.room_ids)),
+            status=status.HTTP_201_CREATED,
+            content_type='application/json'
+        )
 
-            created += 1 if is_created else 0
-            updated += 0 if is_created else 1
-            room_ids.append(room.id)
 
-        qs = Room.objects.filter(id__in=room_ids).prefetch_related('images')
-        serialized = RoomSerializer(qs, many=True).data
-        return Response(
-            {"created": created, "updated": updated, "rooms": serialized},
-            status=status.HTTP_201_CREATED
-        )
+@extend_schema(
+    tags=['rooms'],
+    summary='방 임포트 작업 조회',
+    description='파일 업로드로 만든 임포트 작업의 상태와 진행 건수(processed/created/updated/failed)를 조회합니다.',
+    responses={200: RoomImportJobSerializer, 404: OpenApiResponse(description='작업 없음')},
+)
+class RoomImportJobDetailView(generics.RetrieveAPIView):
+    permission_classes = [AllowAny]
+    queryset = RoomImportJob.objects.all()
+    serializer_class = RoomImportJobSerializer
 
 
 @extend_schema(